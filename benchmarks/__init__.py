@@ -0,0 +1 @@
+# Local benchmarking helpers: a stub LLM server and load/micro benchmarks.
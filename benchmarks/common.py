@@ -0,0 +1,126 @@
+"""Shared helpers for the benchmarks: percentiles, report files and run comparison."""
+from typing import Any, Dict, List, Optional
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+
+def percentile(ordered: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(math.ceil(len(ordered) * pct / 100), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+def summarize(samples: List[float], scale: float = 1000.0, digits: int = 3) -> Dict[str, Optional[float]]:
+    """
+    Summarize timing samples (in seconds).
+
+    Args:
+        samples: Durations in seconds
+        scale: Multiplier for the reported values (1000 gives milliseconds)
+        digits: Rounding for the reported values
+
+    Returns:
+        mean, min, p50, p95, p99 and max
+    """
+    ordered = sorted(samples)
+
+    def fmt(value: Optional[float]) -> Optional[float]:
+        return round(value * scale, digits) if value is not None else None
+
+    return {
+        "mean": fmt(sum(ordered) / len(ordered)) if ordered else None,
+        "min": fmt(ordered[0]) if ordered else None,
+        "p50": fmt(percentile(ordered, 50)),
+        "p95": fmt(percentile(ordered, 95)),
+        "p99": fmt(percentile(ordered, 99)),
+        "max": fmt(ordered[-1]) if ordered else None,
+    }
+
+def git_revision() -> Optional[str]:
+    """The current commit (with a -dirty suffix for uncommitted changes), if in a git checkout."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata(**settings) -> Dict[str, Any]:
+    """Describe the environment and settings of a benchmark run."""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": settings,
+    }
+
+def write_report(report: Dict[str, Any], path: Optional[str]):
+    """Write a report as stable, diff-friendly JSON (sorted keys, one value per line)."""
+    if not path:
+        return
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {path}")
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], metrics: List[str]) -> List[Dict[str, Any]]:
+    """
+    Compare the results of two runs, row by row.
+
+    Args:
+        baseline: An earlier report
+        current: The new report
+        metrics: Dotted paths into each result (e.g. "latency_ms.p95")
+
+    Returns:
+        One row per result and metric with both values and the relative change
+    """
+    rows = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            before, after = _lookup(previous, metric), _lookup(result, metric)
+            change = (after - before) / before * 100 if before and after is not None else None
+            rows.append({"name": name, "metric": metric, "baseline": before, "current": after, "change_pct": change})
+    return rows
+
+def _lookup(data: Dict[str, Any], path: str) -> Optional[float]:
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data if isinstance(data, (int, float)) else None
+
+def print_table(headers: List[str], rows: List[List[Any]]):
+    """Print rows as a fixed-width text table."""
+    cells = [[_cell(value) for value in row] for row in rows]
+    widths = [max(len(h), *(len(row[i]) for row in cells)) if cells else len(h) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in cells:
+        print("  ".join(value.ljust(w) for value, w in zip(row, widths)))
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "—"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+def print_comparison(rows: List[Dict[str, Any]]):
+    print_table(
+        ["name", "metric", "baseline", "current", "change"],
+        [[r["name"], r["metric"], r["baseline"], r["current"],
+          f"{r['change_pct']:+.1f}%" if r["change_pct"] is not None else None] for r in rows]
+    )
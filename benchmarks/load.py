@@ -0,0 +1,260 @@
+"""
+End-to-end load benchmark for the web app.
+
+Starts the stub LLM server (benchmarks/stub_llm.py) and the FastHTML app from
+main.py pointed at it, then drives each scenario with a fixed number of
+concurrent clients for a fixed time: the static pages (/, /tools and every
+/tools/{id}) and every registered tool's /process route. Reports
+requests/sec and p50/p95/p99 latency per scenario and writes them as JSON
+that later runs can be compared against.
+
+Run:
+    python -m benchmarks.load --concurrency 16 --duration 10 --output bench.json
+    python -m benchmarks.load --output new.json --compare bench.json
+
+Use --app-url to benchmark an app that is already running (nothing is started).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import ExitStack, contextmanager
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from .common import compare_reports, load_report, print_comparison, print_table, run_metadata, summarize, write_report
+
+# Shown by the results page when a tool returned an error with a 200 status
+ERROR_MARKERS = ("Processing Error", "Unexpected Error")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(url: str, timeout: float = 30.0):
+    """Poll a URL until it answers, or raise if it doesn't within `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+@contextmanager
+def background_process(args: List[str], ready_url: str, env: Optional[Dict[str, str]] = None):
+    """Run a command for the duration of the block, once ready_url answers."""
+    # A file rather than a pipe, so a chatty process never blocks on a full buffer
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(args, env={**os.environ, **(env or {})}, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            try:
+                wait_until_ready(ready_url)
+            except RuntimeError:
+                process.terminate()
+                process.wait()
+                log.seek(0)
+                raise RuntimeError(f"{' '.join(args)} failed to start:\n{log.read().decode()[-2000:]}")
+            yield process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+def form_inputs(fields: Dict[str, Dict[str, Any]], n: int, unique: bool) -> Dict[str, str]:
+    """
+    Build a valid form submission for a tool.
+
+    Select fields take their first option; free-text fields get a topic that
+    is unique per request when `unique` is set, so every request misses the
+    result cache.
+    """
+    inputs = {}
+    for name, field in fields.items():
+        options = field.get("options")
+        if options:
+            inputs[name] = str(options[0]["value"] if isinstance(options[0], dict) else options[0])
+        else:
+            inputs[name] = f"benchmark topic {n}" if unique else "benchmark topic"
+    return inputs
+
+def build_scenarios(unique_inputs: bool, only: Optional[List[str]] = None) -> List[Tuple[str, str, str, Any]]:
+    """
+    List the (name, method, path, body factory) scenarios to run.
+
+    Static pages come first, then one /process scenario per registered tool.
+    """
+    from tools import get_all_tools
+
+    tools = get_all_tools()
+    scenarios = [("GET /", "GET", "/", None), ("GET /tools", "GET", "/tools", None)]
+    scenarios += [(f"GET /tools/{t.id}", "GET", f"/tools/{t.id}", None) for t in tools]
+    for tool in tools:
+        fields = tool.input_form_fields
+        scenarios.append((
+            f"POST /tools/{tool.id}/process", "POST", f"/tools/{tool.id}/process",
+            lambda n, fields=fields: form_inputs(fields, n, unique_inputs)
+        ))
+    if only:
+        scenarios = [s for s in scenarios if any(pattern in s[0] for pattern in only)]
+    return scenarios
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    body,
+    concurrency: int,
+    duration: float,
+    warmup: float
+) -> Dict[str, Any]:
+    """
+    Drive one route with `concurrency` clients for `warmup` + `duration` seconds.
+
+    Only requests that start after the warm-up are measured.
+    """
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    started = time.perf_counter()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    async def worker():
+        nonlocal errors
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                return
+            try:
+                response = await client.request(method, path, data=body(next(counter)) if body else None)
+                status = str(response.status_code)
+                failed = response.status_code >= 400 or (method == "POST" and any(m in response.text for m in ERROR_MARKERS))
+            except httpx.HTTPError as e:
+                status, failed = type(e).__name__, True
+            elapsed = time.perf_counter() - sent
+            if sent < measure_from:
+                continue
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+            errors += failed
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - measure_from
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / len(latencies), 4) if latencies else None,
+        "statuses": statuses,
+        "rps": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "latency_ms": summarize(latencies),
+    }
+
+async def run_benchmark(app_url: str, scenarios, concurrency: int, duration: float, warmup: float, timeout: float) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=timeout) as client:
+        for name, method, path, body in scenarios:
+            print(f"Running {name} ...", flush=True)
+            results[name] = await run_scenario(client, method, path, body, concurrency, duration, warmup)
+    return results
+
+def print_results(results: Dict[str, Any]):
+    print_table(
+        ["scenario", "requests", "rps", "p50 ms", "p95 ms", "p99 ms", "errors"],
+        [[name, r["requests"], r["rps"], r["latency_ms"]["p50"], r["latency_ms"]["p95"], r["latency_ms"]["p99"], r["errors"]]
+         for name, r in results.items()]
+    )
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="End-to-end load benchmark against a local stub LLM.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument("--only", action="append", metavar="TEXT", help="Only run scenarios whose name contains TEXT (repeatable)")
+    parser.add_argument("--repeat-inputs", action="store_true",
+                        help="Send the same inputs every time (measures the result cache instead of generation)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against an earlier JSON report")
+    parser.add_argument("--app-url", help="Benchmark an already running app instead of starting one")
+    parser.add_argument("--stub-url", help="Use an already running stub LLM (base URL ending in /v1)")
+    parser.add_argument("--ttfb-ms", type=float, default=300.0, help="Stub median time to first byte")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Stub output throughput")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub share of failing requests")
+    parser.add_argument("--seed", type=int, default=1, help="Stub random seed")
+    return parser
+
+@contextmanager
+def local_app(args: argparse.Namespace):
+    """Start the stub (unless --stub-url) and the app, yielding the app's URL."""
+    with ExitStack() as stack:
+        stub_url = args.stub_url
+        if not stub_url:
+            stub_port = free_port()
+            stub_url = f"http://127.0.0.1:{stub_port}/v1"
+            stack.enter_context(background_process([
+                sys.executable, "-m", "benchmarks.stub_llm", "--port", str(stub_port),
+                "--ttfb-ms", str(args.ttfb_ms), "--tokens-per-second", str(args.tokens_per_second),
+                "--error-rate", str(args.error_rate), "--seed", str(args.seed),
+            ], f"{stub_url}/models"))
+
+        app_port = free_port()
+        env = {
+            "OPENROUTER_BASE_URL": stub_url,
+            "OPENROUTER_API_KEY": "stub",
+            "DEFAULT_MODEL": os.getenv("DEFAULT_MODEL") or "stub/model",
+            # The stub stands in for every tier, including the script tool's "premium"
+            "MODEL_QUALITY_TIERS": os.getenv("MODEL_QUALITY_TIERS") or "stub/model=premium",
+        }
+        stack.enter_context(background_process(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning"],
+            f"http://127.0.0.1:{app_port}/", env
+        ))
+        yield f"http://127.0.0.1:{app_port}"
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    # Importing the tools turns on INFO logging, which would log every benchmark request
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    scenarios = build_scenarios(unique_inputs=not args.repeat_inputs, only=args.only)
+    settings = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "warmup": args.warmup,
+        "repeat_inputs": args.repeat_inputs,
+    }
+
+    if args.app_url:
+        results = asyncio.run(run_benchmark(args.app_url, scenarios, args.concurrency, args.duration, args.warmup, args.timeout))
+        settings["app_url"] = args.app_url
+    else:
+        with local_app(args) as app_url:
+            results = asyncio.run(run_benchmark(app_url, scenarios, args.concurrency, args.duration, args.warmup, args.timeout))
+        settings.update(stub_url=args.stub_url, ttfb_ms=args.ttfb_ms, tokens_per_second=args.tokens_per_second,
+                        error_rate=args.error_rate, seed=args.seed)
+
+    print()
+    print_results(results)
+    report = {"benchmark": "load", "meta": run_metadata(**settings), "results": results}
+    write_report(report, args.output)
+
+    if args.compare:
+        print()
+        print_comparison(compare_reports(load_report(args.compare), report, ["rps", "latency_ms.p50", "latency_ms.p95", "latency_ms.p99"]))
+
+if __name__ == "__main__":
+    main()
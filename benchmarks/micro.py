@@ -0,0 +1,265 @@
+"""
+Micro-benchmarks for the post-LLM response pipeline.
+
+Every generation request runs the same stages once the model has answered:
+extracting the raw content, cleaning it, validating it into the response
+model (including the model validators in tools/implementations/models.py),
+formatting the display lines and rendering the results page (alone and
+inside the site layout). Building the JSON prompt and the request key run
+before the model is called; dumping the model to JSON data only happens when
+the result is cached. This measures time and memory per stage on synthetic
+small, typical and pathological payloads (e.g. a 300-section outline or a
+50 KB script) for every tool.
+
+Run:
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.micro --payload large --stage validate --compare micro.json
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+import argparse
+import json
+import logging
+import re
+import time
+import tracemalloc
+
+from pydantic import BaseModel
+
+from .common import compare_reports, load_report, print_comparison, print_table, run_metadata, summarize, write_report
+
+PAYLOAD_SIZES = ["small", "typical", "large"]
+
+def _words(n: int, seed: int = 0) -> str:
+    vocabulary = ["content", "strategy", "growth", "audience", "video", "guide", "simple", "proven", "results", "mistakes"]
+    return " ".join(vocabulary[(seed + i) % len(vocabulary)] for i in range(n))
+
+def _section(n: int, points: int, subsections: int) -> Dict[str, Any]:
+    return {
+        "title": f"Section {n}: {_words(5, n)}",
+        "points": [_words(14, n + i) for i in range(points)],
+        "subsections": [
+            {"title": f"Subsection {n}.{i}", "points": [_words(10, i + j) for j in range(3)]}
+            for i in range(subsections)
+        ],
+    }
+
+def _script(size_bytes: int) -> str:
+    paragraphs = []
+    while sum(len(p) + 2 for p in paragraphs) < size_bytes:
+        n = len(paragraphs)
+        paragraphs.append(f"## Part {n}\n\n{_words(60, n)}" if n % 5 == 0 else _words(60, n))
+    return "\n\n".join(paragraphs)
+
+# Tool id -> response model name and a payload builder per size
+PAYLOADS: Dict[str, Tuple[str, Dict[str, Callable[[], Dict[str, Any]]]]] = {
+    "ai-title-generator": ("GeneratedTitles", {
+        "small": lambda: {"titles": [_words(8, i) for i in range(3)]},
+        "typical": lambda: {"titles": [_words(10, i) for i in range(10)]},
+        "large": lambda: {"titles": [_words(10, i) for i in range(2000)]},
+    }),
+    "social-media-post-generator": ("SocialPostList", {
+        "small": lambda: {"posts": [{"platform": "Twitter", "content": _words(30, i)} for i in range(2)]},
+        "typical": lambda: {"posts": [{"platform": "LinkedIn", "content": _words(80, i)} for i in range(10)]},
+        "large": lambda: {"posts": [{"platform": "LinkedIn", "content": _words(200, i)} for i in range(500)]},
+    }),
+    "youtube-thumbnail-ideas-generator": ("ThumbnailIdeas", {
+        "small": lambda: {"ideas": [{"background": _words(6), "main_image": _words(8), "text": "STOP"}]},
+        "typical": lambda: {"ideas": [
+            {"background": _words(10, i), "main_image": _words(12, i), "text": _words(3, i), "additional_elements": _words(8, i)}
+            for i in range(5)
+        ]},
+        "large": lambda: {"ideas": [
+            {"background": _words(10, i), "main_image": _words(12, i), "text": _words(3, i), "additional_elements": _words(8, i)}
+            for i in range(500)
+        ]},
+    }),
+    "blog-outline-generator": ("BlogOutline", {
+        "small": lambda: {"main_sections": [_section(i, 3, 0) for i in range(3)]},
+        "typical": lambda: {
+            "introduction": _section(0, 3, 0),
+            "main_sections": [_section(i, 4, 1) for i in range(1, 8)],
+            "conclusion": _section(99, 3, 0),
+        },
+        "large": lambda: {
+            "introduction": _section(0, 3, 0),
+            "main_sections": [_section(i, 5, 2) for i in range(1, 301)],
+            "conclusion": _section(999, 3, 0),
+        },
+    }),
+    "youtube-script-generator": ("YoutubeScriptOutput", {
+        "small": lambda: {"script": _script(1_000), "hooks": [_words(10, i) for i in range(3)]},
+        "typical": lambda: {
+            "script": _script(10_000),
+            "hooks": [_words(12, i) for i in range(12)],
+            "input_bias": [_words(12, i) for i in range(5)],
+            "open_loop_questions": [_words(10, i) for i in range(10)],
+        },
+        "large": lambda: {
+            "script": _script(50_000),
+            "hooks": [_words(12, i) for i in range(12)],
+            "input_bias": [_words(12, i) for i in range(5)],
+            "open_loop_questions": [_words(10, i) for i in range(10)],
+        },
+    }),
+}
+
+def llm_output(payload: Dict[str, Any]) -> str:
+    """Render a payload the way models usually answer: pretty-printed JSON in a code fence."""
+    return f"```json\n{json.dumps(payload, indent=2)}\n```"
+
+def chatty_llm_output(payload: Dict[str, Any]) -> str:
+    """The same payload wrapped in prose before and after the code fence."""
+    return f"Sure! Here is the result you asked for:\n\n{llm_output(payload)}\n\nLet me know if you want any changes."
+
+def legacy_clean_llm_output(text: str) -> str:
+    """The regex-based cleaner _clean_llm_output used before the single-pass extractor, for comparison."""
+    cleaned = re.sub(r'^```[a-zA-Z]*\s*', '', text.strip(), flags=re.MULTILINE)
+    cleaned = re.sub(r'\s*```$', '', cleaned.strip(), flags=re.MULTILINE)
+    return cleaned.strip()
+
+class TextResponse:
+    """Stand-in for an Agno RunResponse carrying raw text (streaming or unparsed output)."""
+
+    def __init__(self, content: str):
+        self.content = content
+
+def stages_for(tool, response_model: Type[BaseModel], payload: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    """Build the stage callables for one tool and payload, with inputs prepared up front."""
+    from agno.agent import Agent
+    from fasthtml.common import to_xml
+    from components.page_layout import page_layout
+    from pages.tool_pages.results import create_results_page
+
+    raw = llm_output(payload)
+    chatty = chatty_llm_output(payload)
+    cleaned = tool._clean_llm_output(raw)
+    validated = response_model.model_validate_json(cleaned)
+    inputs = {"topic": "benchmark"}
+    result = tool._process_response(TextResponse(raw), inputs)
+
+    return {
+        "extract_raw_content/text": lambda: tool._extract_raw_content(TextResponse(raw)),
+        "extract_raw_content/model": lambda: tool._extract_raw_content(TextResponse(validated)),
+        "clean_llm_output": lambda: tool._clean_llm_output(raw),
+        "clean_llm_output/legacy_regex": lambda: legacy_clean_llm_output(raw),
+        "clean_llm_output/prose": lambda: tool._clean_llm_output(chatty),
+        "validate": lambda: response_model.model_validate_json(cleaned),
+        # What the agent did on every run before the prompt was precompiled (tools/core/response_models.py)
+        "json_prompt/per_run": lambda: Agent(response_model=response_model).get_json_output_prompt(),
+        "request_key": lambda: tool.request_key(inputs),
+        # Paid once per result, on the cache write
+        "model_dump": lambda: validated.model_dump(mode="json"),
+        "format_structured_titles": lambda: tool._format_structured_titles(validated),
+        "process_response/text": lambda: tool._process_response(TextResponse(raw), inputs),
+        "process_response/model": lambda: tool._process_response(TextResponse(validated), inputs),
+        "render_results": lambda: to_xml(create_results_page(tool.id, tool, result)),
+        # The whole response: results inside the site layout (head, header, footer)
+        "render_results_page": lambda: to_xml(page_layout(
+            title=f"{tool.name} Results - Bit Tools",
+            content=create_results_page(tool.id, tool, result),
+            current_page=f"/tools/{tool.id}",
+        )),
+    }
+
+def measure(fn: Callable[[], Any], min_time: float, repeat: int) -> Dict[str, Any]:
+    """
+    Time a callable and measure its memory use.
+
+    The number of calls per timing sample is calibrated so one sample takes
+    about min_time / repeat seconds. Memory is measured on a separate call
+    under tracemalloc, so tracing overhead does not distort the timings.
+
+    Returns:
+        Per-call time summary in microseconds, peak memory during a call and
+        the size of what it returned (both in KB)
+    """
+    fn()  # warm up (imports, caches)
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / repeat / 2 or loops >= 1_000_000:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - started) / loops)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "loops": loops,
+        "time_us": summarize(samples, scale=1_000_000, digits=2),
+        "peak_alloc_kb": round((peak - before) / 1024, 2),
+        "result_kb": round((after - before) / 1024, 2),
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the post-LLM response pipeline.")
+    parser.add_argument("--tool", action="append", metavar="ID", help="Only these tool ids (repeatable)")
+    parser.add_argument("--payload", action="append", choices=PAYLOAD_SIZES, help="Only these payload sizes (repeatable)")
+    parser.add_argument("--stage", action="append", metavar="TEXT", help="Only stages whose name contains TEXT (repeatable)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Approximate seconds spent timing each stage")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing samples per stage")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against an earlier JSON report")
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+
+    from tools import get_tool_by_id
+    from tools.implementations import models
+
+    # The pipeline logs every step at INFO; that would be most of what gets measured
+    logging.disable(logging.WARNING)
+
+    results = {}
+    for tool_id, (model_name, builders) in PAYLOADS.items():
+        if args.tool and tool_id not in args.tool:
+            continue
+        tool = get_tool_by_id(tool_id)
+        response_model = getattr(models, model_name)
+        for size in args.payload or PAYLOAD_SIZES:
+            payload = builders[size]()
+            payload_kb = round(len(llm_output(payload)) / 1024, 1)
+            for stage, fn in stages_for(tool, response_model, payload).items():
+                if args.stage and not any(pattern in stage for pattern in args.stage):
+                    continue
+                name = f"{tool_id}/{size}/{stage}"
+                print(f"Measuring {name} ...", flush=True)
+                results[name] = {"payload_kb": payload_kb, **measure(fn, args.min_time, args.repeat)}
+
+    print()
+    print_table(
+        ["benchmark", "payload KB", "p50 us", "min us", "peak KB", "result KB"],
+        [[name, r["payload_kb"], r["time_us"]["p50"], r["time_us"]["min"], r["peak_alloc_kb"], r["result_kb"]]
+         for name, r in results.items()]
+    )
+    report = {
+        "benchmark": "micro",
+        "meta": run_metadata(min_time=args.min_time, repeat=args.repeat),
+        "results": results,
+    }
+    write_report(report, args.output)
+
+    if args.compare:
+        print()
+        print_comparison(compare_reports(load_report(args.compare), report, ["time_us.p50", "peak_alloc_kb"]))
+
+if __name__ == "__main__":
+    main()
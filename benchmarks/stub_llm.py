@@ -0,0 +1,362 @@
+"""
+OpenAI/OpenRouter-compatible stub LLM server for local benchmarks.
+
+Answers /v1/chat/completions with canned structured responses for every
+response model in tools/implementations/models.py (picked from the JSON
+fields Agno lists in the system prompt), or plain text for tools without
+one. Streaming, time to first byte, tokens/sec, error rates and truncation
+are all configurable, so production-like load can be reproduced without
+API credits or network.
+
+Run:
+    python -m benchmarks.stub_llm --port 8001 --ttfb-ms 400 --tokens-per-second 80
+
+then point the app at it:
+    OPENROUTER_BASE_URL=http://127.0.0.1:8001/v1 OPENROUTER_API_KEY=stub python main.py
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+
+from pydantic import BaseModel
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+import uvicorn
+
+from tools.implementations.models import (
+    BlogOutline,
+    GeneratedTitles,
+    SocialPostList,
+    ThumbnailIdeas,
+    YoutubeScriptOutput,
+)
+
+# Characters per token, matching the app's own estimate
+CHARS_PER_TOKEN = 4
+
+ERROR_TYPES = {
+    429: "rate_limit_exceeded",
+    500: "server_error",
+    502: "bad_gateway",
+    503: "service_unavailable",
+}
+
+def _sentence(topic: str, n: int) -> str:
+    return f"Point {n} about {topic}: what it is, why it matters and how to apply it in practice."
+
+def _canned_payloads() -> Dict[Type[BaseModel], Dict[str, Any]]:
+    """Realistically sized payloads, matching what the prompts ask for."""
+    topic = "the topic"
+    return {
+        GeneratedTitles: {
+            "titles": [f"{n} Surprising Truths About {topic.title()} Nobody Tells You (#{n})" for n in range(1, 11)],
+        },
+        SocialPostList: {
+            "posts": [
+                {"platform": platform, "content": " ".join(_sentence(topic, i) for i in range(1, 5)) + " #tips #growth"}
+                for platform in ["Twitter", "LinkedIn", "Facebook", "Instagram", "Threads"] * 2
+            ],
+        },
+        ThumbnailIdeas: {
+            "ideas": [
+                {
+                    "background": f"Bold gradient background, variant {n}, high contrast colours",
+                    "main_image": f"Close-up of a surprised face next to a symbol of {topic}",
+                    "text": f"STOP DOING THIS #{n}",
+                    "additional_elements": "Red arrow, glowing outline, small logo in the corner",
+                }
+                for n in range(1, 6)
+            ],
+        },
+        BlogOutline: {
+            "introduction": {"title": "Introduction", "points": [_sentence(topic, i) for i in range(1, 4)]},
+            "main_sections": [
+                {
+                    "title": f"Section {n}: A Key Aspect of {topic.title()}",
+                    "points": [_sentence(topic, i) for i in range(1, 5)],
+                    "subsections": [{"title": f"Deep dive {n}.1", "points": [_sentence(topic, 1), _sentence(topic, 2)]}],
+                }
+                for n in range(1, 7)
+            ],
+            "conclusion": {"title": "Conclusion", "points": [_sentence(topic, i) for i in range(1, 4)]},
+        },
+        YoutubeScriptOutput: {
+            "script": "\n\n".join(
+                f"## Part {n}\n\n" + " ".join(_sentence(topic, i) for i in range(1, 12)) for n in range(1, 9)
+            ),
+            "hooks": [f"Hook {n}: what if everything you knew about {topic} was wrong?" for n in range(1, 13)],
+            "input_bias": [f"After {n * 10} hours researching {topic}, here is what I found." for n in range(1, 6)],
+            "open_loop_questions": [f"Question {n}: why does {topic} fail for most people?" for n in range(1, 11)],
+        },
+    }
+
+def _build_responses() -> List[Tuple[Type[BaseModel], set, str]]:
+    """Validate each canned payload against its model and serialize it once."""
+    responses = []
+    for model, payload in _canned_payloads().items():
+        model.model_validate(payload)
+        responses.append((model, set(model.model_fields), json.dumps(payload, indent=2)))
+    return responses
+
+CANNED_RESPONSES = _build_responses()
+
+PLAIN_TEXT_RESPONSE = "\n".join(_sentence("the text", i) for i in range(1, 9))
+
+def canned_content(messages: List[Dict[str, Any]]) -> Tuple[str, str]:
+    """
+    Pick the canned reply for a chat request.
+
+    Agno lists the response model's fields in the system prompt inside
+    <json_fields>; the model whose field names match best is used.
+
+    Returns:
+        (response model name or "text", content)
+    """
+    system = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") in ("system", "developer"))
+    match = re.search(r"<json_fields>\s*(.*?)\s*</json_fields>", system, re.DOTALL)
+    if match:
+        try:
+            fields = set(json.loads(match.group(1))) - {"$defs"}
+        except json.JSONDecodeError:
+            fields = set()
+        best = max(CANNED_RESPONSES, key=lambda r: len(r[1] & fields) - len(r[1] ^ fields))
+        if best[1] & fields:
+            return best[0].__name__, best[2]
+    return "text", PLAIN_TEXT_RESPONSE
+
+class LatencyProfile:
+    """How one model behaves: time to first byte, throughput, errors and truncation."""
+
+    def __init__(
+        self,
+        ttfb_ms: float = 300.0,
+        ttfb_jitter: float = 0.3,
+        tokens_per_second: float = 100.0,
+        error_rate: float = 0.0,
+        error_statuses: Optional[List[int]] = None,
+        truncate_rate: float = 0.0
+    ):
+        """
+        Initialize the profile.
+
+        Args:
+            ttfb_ms: Median time to first byte in milliseconds
+            ttfb_jitter: Sigma of the log-normal TTFB distribution (0 for a fixed TTFB)
+            tokens_per_second: Output throughput once the first byte is sent (0 for instant)
+            error_rate: Share of requests that fail with one of error_statuses
+            error_statuses: HTTP statuses to fail with (default 429 and 503)
+            truncate_rate: Share of requests cut short with finish_reason "length"
+        """
+        self.ttfb_ms = ttfb_ms
+        self.ttfb_jitter = ttfb_jitter
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [429, 503]
+        self.truncate_rate = truncate_rate
+
+    def sample_ttfb(self) -> float:
+        """Seconds before the first byte (log-normal around the median)."""
+        seconds = self.ttfb_ms / 1000
+        if self.ttfb_jitter > 0:
+            seconds *= random.lognormvariate(0, self.ttfb_jitter)
+        return seconds
+
+    def token_delay(self, tokens: int) -> float:
+        """Seconds needed to produce `tokens` output tokens."""
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def with_overrides(self, **overrides) -> "LatencyProfile":
+        values = {**vars(self), **{k: v for k, v in overrides.items() if v is not None}}
+        return LatencyProfile(**values)
+
+def parse_model_profile(spec: str, default: LatencyProfile) -> Tuple[str, LatencyProfile]:
+    """
+    Parse a per-model profile from "model=ttfb_ms:tokens_per_second[:error_rate[:truncate_rate]]".
+
+    Empty positions keep the default, e.g. "openai/gpt-4o=800::0.1".
+    """
+    model, _, values = spec.partition("=")
+    keys = ["ttfb_ms", "tokens_per_second", "error_rate", "truncate_rate"]
+    parts = values.split(":") if values else []
+    if not model or len(parts) > len(keys):
+        raise argparse.ArgumentTypeError(f"Invalid model profile '{spec}'")
+    overrides = {key: float(part) for key, part in zip(keys, parts) if part}
+    return model.strip(), default.with_overrides(**overrides)
+
+class StubLLM:
+    """The stub server state: per-model profiles and request counters."""
+
+    def __init__(self, default_profile: LatencyProfile, model_profiles: Optional[Dict[str, LatencyProfile]] = None, chunk_tokens: int = 4):
+        """
+        Initialize the stub.
+
+        Args:
+            default_profile: Behaviour for models without their own profile
+            model_profiles: Model name -> profile
+            chunk_tokens: Tokens sent per streamed chunk
+        """
+        self.default_profile = default_profile
+        self.model_profiles = model_profiles or {}
+        self.chunk_tokens = max(chunk_tokens, 1)
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def profile_for(self, model: str) -> LatencyProfile:
+        return self.model_profiles.get(model, self.default_profile)
+
+    def _count(self, model: str, key: str):
+        counters = self.counters.setdefault(model, {"requests": 0, "streamed": 0, "errors": 0, "truncated": 0})
+        counters[key] += 1
+
+    def _plan(self, body: Dict[str, Any], profile: LatencyProfile) -> Tuple[str, List[str], str]:
+        """Choose the reply and split it into tokens, cutting it at max_tokens or at random."""
+        response_model, content = canned_content(body.get("messages", []))
+        tokens = [content[i:i + CHARS_PER_TOKEN] for i in range(0, len(content), CHARS_PER_TOKEN)]
+        finish_reason = "stop"
+        limit = body.get("max_tokens") or body.get("max_completion_tokens")
+        if random.random() < profile.truncate_rate:
+            limit = min(limit or len(tokens), int(len(tokens) * random.uniform(0.3, 0.9)))
+        if limit and len(tokens) > limit:
+            tokens = tokens[:limit]
+            finish_reason = "length"
+        return response_model, tokens, finish_reason
+
+    def _error(self, status: int) -> JSONResponse:
+        headers = {"Retry-After": "1"} if status == 429 else None
+        return JSONResponse(
+            {"error": {"message": f"Stub error ({status})", "type": ERROR_TYPES.get(status, "error"), "code": status}},
+            status_code=status,
+            headers=headers
+        )
+
+    async def chat_completions(self, request: Request):
+        body = await request.json()
+        model = body.get("model", "stub")
+        profile = self.profile_for(model)
+        self._count(model, "requests")
+
+        if random.random() < profile.error_rate:
+            self._count(model, "errors")
+            await asyncio.sleep(profile.sample_ttfb())
+            return self._error(random.choice(profile.error_statuses))
+
+        response_model, tokens, finish_reason = self._plan(body, profile)
+        if finish_reason == "length":
+            self._count(model, "truncated")
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+        usage = {
+            "prompt_tokens": sum(len(str(m.get("content") or "")) for m in body.get("messages", [])) // CHARS_PER_TOKEN,
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        headers = {"X-Stub-Response-Model": response_model}
+
+        if body.get("stream"):
+            self._count(model, "streamed")
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                self._stream(completion_id, model, profile, tokens, finish_reason, usage if include_usage else None),
+                media_type="text/event-stream",
+                headers=headers
+            )
+
+        await asyncio.sleep(profile.sample_ttfb() + profile.token_delay(len(tokens)))
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish_reason,
+            }],
+            "usage": usage,
+        }, headers=headers)
+
+    async def _stream(self, completion_id: str, model: str, profile: LatencyProfile, tokens: List[str], finish_reason: str, usage: Optional[Dict[str, int]]):
+        def event(**fields) -> str:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model, **fields}
+            return f"data: {json.dumps(payload)}\n\n"
+
+        def delta(content: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return event(choices=[{"index": 0, "delta": content, "finish_reason": finish}])
+
+        await asyncio.sleep(profile.sample_ttfb())
+        yield delta({"role": "assistant", "content": ""})
+        for i in range(0, len(tokens), self.chunk_tokens):
+            batch = tokens[i:i + self.chunk_tokens]
+            await asyncio.sleep(profile.token_delay(len(batch)))
+            yield delta({"content": "".join(batch)})
+        yield delta({}, finish_reason)
+        if usage is not None:
+            yield event(choices=[], usage=usage)
+        yield "data: [DONE]\n\n"
+
+    async def list_models(self, request: Request):
+        models = sorted(set(self.model_profiles) | {"stub"})
+        return JSONResponse({"object": "list", "data": [{"id": m, "object": "model", "owned_by": "stub"} for m in models]})
+
+    async def stats(self, request: Request):
+        return JSONResponse(self.counters)
+
+    async def reset(self, request: Request):
+        self.counters.clear()
+        return JSONResponse({"ok": True})
+
+def create_app(stub: StubLLM) -> Starlette:
+    """Build the ASGI app serving the OpenAI-compatible routes (under /v1 and /api/v1)."""
+    routes = []
+    for prefix in ("/v1", "/api/v1"):
+        routes += [
+            Route(f"{prefix}/chat/completions", stub.chat_completions, methods=["POST"]),
+            Route(f"{prefix}/models", stub.list_models, methods=["GET"]),
+        ]
+    routes += [
+        Route("/stats", stub.stats, methods=["GET"]),
+        Route("/reset", stub.reset, methods=["POST"]),
+    ]
+    return Starlette(routes=routes)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="OpenAI/OpenRouter-compatible stub LLM server for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttfb-ms", type=float, default=300.0, help="Median time to first byte (ms)")
+    parser.add_argument("--ttfb-jitter", type=float, default=0.3, help="Sigma of the log-normal TTFB distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="Output throughput (0 for instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument("--error-statuses", default="429,503", help="Comma-separated HTTP statuses to fail with")
+    parser.add_argument("--truncate-rate", type=float, default=0.0, help="Share of requests cut short (finish_reason=length)")
+    parser.add_argument("--chunk-tokens", type=int, default=4, help="Tokens per streamed chunk")
+    parser.add_argument("--model", action="append", default=[], metavar="SPEC",
+                        help="Per-model profile: model=ttfb_ms:tokens_per_second[:error_rate[:truncate_rate]] (repeatable)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    return parser
+
+def stub_from_args(args: argparse.Namespace) -> StubLLM:
+    default = LatencyProfile(
+        ttfb_ms=args.ttfb_ms,
+        ttfb_jitter=args.ttfb_jitter,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_statuses=[int(s) for s in args.error_statuses.split(",") if s.strip()],
+        truncate_rate=args.truncate_rate
+    )
+    profiles = dict(parse_model_profile(spec, default) for spec in args.model)
+    return StubLLM(default, profiles, chunk_tokens=args.chunk_tokens)
+
+def main(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    if args.seed is not None:
+        random.seed(args.seed)
+    uvicorn.run(create_app(stub_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -5,36 +5,46 @@ from fasthtml.common import *
 from fasthtml.components import NotStr
 # ---------------------
 
+# --- Navigation Items ---
+NAV_ITEMS = [
+    ("Home", "/"),
+    ("Tools", "/tools"),
+    ("About", "/about"),
+    ("Contact", "/contact")
+]
+
+def active_nav_path(current_page):
+    """
+    Return the path of the navigation item highlighted for a page ("" if none).
+
+    Tool pages (/tools/...) highlight "Tools". The header only depends on this,
+    so it is what the layout caches rendered headers by.
+    """
+    for _, path in NAV_ITEMS:
+        if current_page == path or (path == "/tools" and current_page.startswith("/tools/")):
+            return path
+    return ""
+
 def header(current_page="/"):
     """
     Creates a consistent header with navigation menu on the right (desktop)
     and a working mobile menu toggle using NotStr for the SVG icon.
     """
-    # --- Define Navigation Items (remains the same) ---
-    nav_items = [
-        ("Home", "/"),
-        ("Tools", "/tools"),
-        ("About", "/about"),
-        ("Contact", "/contact")
-    ]
+    active_path = active_nav_path(current_page)
 
-    # --- Create Desktop Navigation Links (remains the same) ---
+    # --- Create Desktop Navigation Links ---
     desktop_nav_links = []
-    for title, path in nav_items:
-        is_current = current_page == path or (
-            path == "/tools" and current_page.startswith("/tools/")
-        )
+    for title, path in NAV_ITEMS:
+        is_current = path == active_path
         link_class = "text-white hover:text-gray-200 px-3 py-2 rounded-md text-sm font-medium transition-colors"
         if is_current:
             link_class += " bg-blue-700"
         desktop_nav_links.append(A(title, href=path, cls=link_class))
 
-    # --- Create Mobile Navigation Links (remains the same) ---
+    # --- Create Mobile Navigation Links ---
     mobile_nav_links = []
-    for title, path in nav_items:
-        is_current = current_page == path or (
-             path == "/tools" and current_page.startswith("/tools/")
-        )
+    for title, path in NAV_ITEMS:
+        is_current = path == active_path
         link_class = "block rounded-md px-3 py-2 text-base font-medium"
         if is_current:
             link_class += " bg-blue-700 text-white"
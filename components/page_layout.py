@@ -1,9 +1,44 @@
 # components/page_layout.py
 
+from functools import lru_cache
 from fasthtml.common import *
-from .header import header
+from fasthtml.components import NotStr
+from .header import header, active_nav_path
 from .footer import footer
 
+def head_content():
+    """The <head> elements shared by every page (everything but the title)."""
+    return (
+        Meta(charset="UTF-8"),
+        Meta(name="viewport", content="width=device-width, initial-scale=1.0"),
+        Link(rel="icon", href="/static/images/favicon.svg", type="image/svg+xml"),
+        Script(src="https://cdn.tailwindcss.com"),
+        Script(defer=True, **{"data-domain": "bit-tools.com", "src": "https://an.bitdoze.com/js/script.js"}),
+        # --- INCLUDE SITE-WIDE JS ---
+        Script(src="/static/js/site.js", defer=True), # Use defer to load after HTML parsing
+        # --- INCLUDE TOOL-SPECIFIC JS (if needed on results pages) ---
+        # This should be added by the result page components/handlers now
+        # Script(src="/static/js/tool-results.js", defer=True), # Removed from here
+        # --- Optional: Zero-MD for markdown ---
+        # Script(type="module", src="https://cdn.jsdelivr.net/npm/zero-md@3?register"),
+    )
+
+# --- Pre-serialized layout fragments ---
+# The head, header and footer only depend on the highlighted nav item, so each
+# variant is rendered to HTML once and reused; per request only the title and
+# the page content are built and serialized.
+@lru_cache(maxsize=None)
+def _head_fragment():
+    return NotStr("".join(to_xml(element) for element in head_content()))
+
+@lru_cache(maxsize=None)
+def _header_fragment(active_path):
+    return NotStr(to_xml(header(active_path)))
+
+@lru_cache(maxsize=None)
+def _footer_fragment():
+    return NotStr(to_xml(footer()))
+
 def page_layout(title, content, current_page="/"):
     """
     Creates a consistent page layout with header and footer.
@@ -19,31 +54,21 @@ def page_layout(title, content, current_page="/"):
     return Html(
         Head(
             Title(title),
-            Meta(charset="UTF-8"),
-            Meta(name="viewport", content="width=device-width, initial-scale=1.0"),
-            Link(rel="icon", href="/static/images/favicon.svg", type="image/svg+xml"),
-            Script(src="https://cdn.tailwindcss.com"),
-            Script(defer=True, **{"data-domain": "bit-tools.com", "src": "https://an.bitdoze.com/js/script.js"}),
-            # --- INCLUDE SITE-WIDE JS ---
-            Script(src="/static/js/site.js", defer=True), # Use defer to load after HTML parsing
-            # --- INCLUDE TOOL-SPECIFIC JS (if needed on results pages) ---
-            # This should be added by the result page components/handlers now
-            # Script(src="/static/js/tool-results.js", defer=True), # Removed from here
-            # --- Optional: Zero-MD for markdown ---
-            # Script(type="module", src="https://cdn.jsdelivr.net/npm/zero-md@3?register"),
+            _head_fragment(),
         ),
         Body(
             Div(
-                header(current_page), # Pass current_page to header
+                _header_fragment(active_nav_path(current_page)), # Header for the current page's nav item
                 Main(
                     Div(
                         content,
+                        id="page-content", # Swapped in place by streamed tool results
                         cls="container mx-auto px-4 py-8"
                     ),
                     cls="flex-grow"
                 ),
-                footer(),
+                _footer_fragment(),
                 cls="flex flex-col min-h-screen bg-gray-50"
             )
         )
-    )
\ No newline at end of file
+    )
@@ -6,10 +6,122 @@ load_dotenv()
 
 # OpenRouter API configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Point at a local stub (python -m benchmarks.stub_llm) to run without real API calls
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+# Shared HTTP connection pool for upstream OpenRouter traffic
+OPENROUTER_MAX_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "100"))
+OPENROUTER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENROUTER_KEEPALIVE_EXPIRY = float(os.getenv("OPENROUTER_KEEPALIVE_EXPIRY", "60"))
+# HTTP/2 needs the optional 'h2' package (pip install h2); falls back to HTTP/1.1 without it
+OPENROUTER_HTTP2 = os.getenv("OPENROUTER_HTTP2", "true").lower() == "true"
 
 # Default model to use
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL")
 
 # Application settings
-DEBUG = True
\ No newline at end of file
+DEBUG = True
+
+# Expose the /admin/* diagnostics routes (defaults to on in debug mode)
+ADMIN_ENABLED = os.getenv("ADMIN_ENABLED", str(DEBUG)).lower() == "true"
+
+# Stream tool output to the browser over Server-Sent Events (plain form POST is the fallback)
+STREAMING_ENABLED = os.getenv("STREAMING_ENABLED", "true").lower() == "true"
+
+# Agent pool: idle agents kept per (model, response model, system prompt)
+AGENT_POOL_MAX_IDLE = int(os.getenv("AGENT_POOL_MAX_IDLE", "8"))
+
+# Generation result cache: in-memory LRU with TTL, plus an optional SQLite tier
+GENERATION_CACHE_ENABLED = os.getenv("GENERATION_CACHE_ENABLED", "true").lower() == "true"
+GENERATION_CACHE_MAX_ENTRIES = int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", "512"))
+GENERATION_CACHE_TTL = float(os.getenv("GENERATION_CACHE_TTL", "3600"))
+# Path to a SQLite file for results that survive restarts (empty disables the disk tier)
+GENERATION_CACHE_DB = os.getenv("GENERATION_CACHE_DB", "")
+
+# Results pages render only the active tab and load the others on click (HTML fragments),
+# from results kept in memory for RESULT_STORE_TTL seconds. The store is per process:
+# only enable this with a single worker, since a tab click that reaches another worker
+# (or comes after a restart) finds the result expired
+LAZY_RESULT_TABS = os.getenv("LAZY_RESULT_TABS", "false").lower() == "true"
+RESULT_STORE_MAX_ENTRIES = int(os.getenv("RESULT_STORE_MAX_ENTRIES", "256"))
+RESULT_STORE_TTL = float(os.getenv("RESULT_STORE_TTL", "1800"))
+
+# Coalesce concurrent identical submissions onto one upstream call
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# Admission control for upstream LLM calls (0 = unlimited)
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "32"))
+ADMISSION_MAX_IN_FLIGHT_PER_TOOL = int(os.getenv("ADMISSION_MAX_IN_FLIGHT_PER_TOOL", "8"))
+# Requests over the caps wait in a bounded queue; a full queue or a timeout returns 503 (0 = no limit)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+
+# Default seconds a tool request may run before it is stopped (tools can override; 0 = no limit)
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "120"))
+
+# Retries for rate-limited / failed upstream calls (exponential backoff with full jitter)
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+
+# Hedged requests: duplicate a call that is slower than the recent HEDGE_PERCENTILE latency
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+# Samples needed before hedging starts, and the earliest a hedge may fire (seconds)
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "1.0"))
+# Optional model for hedged requests (empty = same model as the original request)
+HEDGE_FALLBACK_MODEL = os.getenv("HEDGE_FALLBACK_MODEL", "")
+
+# Model routing: comma-separated candidate models for tools that don't list their own
+# (defaults to DEFAULT_MODEL), and each model's quality tier as "model=tier" pairs
+ROUTER_CANDIDATE_MODELS = [m.strip() for m in os.getenv("ROUTER_CANDIDATE_MODELS", "").split(",") if m.strip()]
+# Tiers of common OpenRouter models; MODEL_QUALITY_TIERS adds to or overrides them,
+# and models listed in neither are "standard"
+DEFAULT_MODEL_QUALITY_TIERS = {
+    "anthropic/claude-3.7-sonnet": "premium",
+    "anthropic/claude-3.5-sonnet": "premium",
+    "openai/gpt-4o": "premium",
+    "google/gemini-2.0-flash-001": "standard",
+    "deepseek/deepseek-chat": "standard",
+    "meta-llama/llama-3.3-70b-instruct": "standard",
+    "openai/gpt-4o-mini": "basic",
+    "google/gemini-2.0-flash-lite-001": "basic",
+}
+MODEL_QUALITY_TIERS = {
+    **DEFAULT_MODEL_QUALITY_TIERS,
+    **dict(
+        (model.strip(), tier.strip()) for model, tier in (
+            pair.split("=", 1) for pair in os.getenv("MODEL_QUALITY_TIERS", "").split(",") if "=" in pair
+        )
+    ),
+}
+ROUTER_EWMA_ALPHA = float(os.getenv("ROUTER_EWMA_ALPHA", "0.2"))
+# Models whose error rate is above this are skipped until ROUTER_UNHEALTHY_COOLDOWN seconds pass
+ROUTER_MAX_ERROR_RATE = float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.5"))
+ROUTER_UNHEALTHY_COOLDOWN = float(os.getenv("ROUTER_UNHEALTHY_COOLDOWN", "30"))
+# Share of calls sent to a random healthy candidate so every model stays measured
+ROUTER_EXPLORE_RATE = float(os.getenv("ROUTER_EXPLORE_RATE", "0.05"))
+
+# Output token budgets: derived per tool from its response model unless set explicitly
+OUTPUT_BUDGET_MAX_TOKENS = int(os.getenv("OUTPUT_BUDGET_MAX_TOKENS", "32000"))
+OUTPUT_BUDGET_MIN_TOKENS = int(os.getenv("OUTPUT_BUDGET_MIN_TOKENS", "1024"))
+# Assumed size of list fields / text fields the tool doesn't describe
+OUTPUT_BUDGET_DEFAULT_LIST_ITEMS = int(os.getenv("OUTPUT_BUDGET_DEFAULT_LIST_ITEMS", "5"))
+OUTPUT_BUDGET_DEFAULT_TEXT_TOKENS = int(os.getenv("OUTPUT_BUDGET_DEFAULT_TEXT_TOKENS", "60"))
+# Tokens allowed for the YouTube script text (a 15-20 minute script runs about 4000)
+OUTPUT_BUDGET_SCRIPT_TOKENS = int(os.getenv("OUTPUT_BUDGET_SCRIPT_TOKENS", "6000"))
+
+# Response compression: gzip, and brotli when the optional brotli package is installed
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# Responses (and static files) smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Comma-separated content types that are compressed (event streams never are)
+COMPRESSION_CONTENT_TYPES = [t.strip() for t in os.getenv(
+    "COMPRESSION_CONTENT_TYPES",
+    "text/html,text/plain,text/css,text/javascript,application/javascript,application/json,image/svg+xml",
+).split(",") if t.strip()]
+# Levels for dynamic responses; files under static/ are precompressed once at the highest levels
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
@@ -1,4 +1,7 @@
 # main.py
+import asyncio
+import json
+import logging
 from fasthtml.common import *
 # Import Starlette's Response types if needed for redirects etc.
 # from starlette.responses import RedirectResponse (example)
@@ -8,46 +11,77 @@ from pages.home import home as home_page
 from pages.about import about as about_page
 from pages.contact import contact as contact_page
 from pages.tools import tools as tools_page
-from pages.tool_pages import tool_page, tool_results_page
+from pages.tool_pages import tool_page, tool_results_page, create_results_tab, create_stream_item
+from pages.admin_routing import admin_routing
+from pages.prerender import PrerenderedPages
+from pages.compression import CompressionMiddleware, PrecompressedStatic, ResponseCompressor
 
 # Import the tools registry
 from tools import get_all_tools, get_tool_by_id
+from tools.core import collect_stats, register_stats, result_store
+from tools.core.router import model_router
+from tools.core.http_client import close_http_client
+from tools.errors import ErrorCode
+from config import ADMIN_ENABLED, COMPRESSION_ENABLED
 
 # Import the page layout component
 from components.page_layout import page_layout
 
+logger = logging.getLogger(__name__)
+
+# --- Pages that only depend on the code and the tool registry ---
+def build_static_pages():
+    """Build every page that is pre-rendered, as {path: full page}."""
+    pages = {
+        "/": page_layout(title="Home - Bit Tools", content=home_page(), current_page="/"),
+        "/about": page_layout(title="About Us - Bit Tools", content=about_page(), current_page="/about"),
+        "/contact": page_layout(title="Contact Us - Bit Tools", content=contact_page(), current_page="/contact"),
+        "/tools": page_layout(title="AI Tools - Bit Tools", content=tools_page(), current_page="/tools"),
+    }
+    for tool in get_all_tools():
+        path = f"/tools/{tool.id}"
+        pages[path] = page_layout(title=f"{tool.name} - Bit Tools", content=tool_page(tool.id), current_page=path)
+    return pages
+
+# Refuse to start with tools that no configured model can serve, warn about unmet tiers
+model_router.check()
+
+# Rendered to bytes at startup, and again whenever a tool is registered
+prerendered = PrerenderedPages(build_static_pages)
+register_stats("prerendered_pages", prerendered.stats)
+
+# gzip/brotli for dynamic HTML, and static files compressed once at startup
+compressor = ResponseCompressor()
+static_assets = PrecompressedStatic()
+register_stats("compression", compressor.stats)
+register_stats("static_precompressed", static_assets.stats)
+middleware = [Middleware(CompressionMiddleware, compressor=compressor, static=static_assets)] if COMPRESSION_ENABLED else []
+
 # --- CHANGE HERE: Use fast_app() ---
 # It sets up defaults including static file serving from a 'static' directory
 # It also provides 'rt' for routing.
 # Enable debug mode for better error messages during development
-app, rt = fast_app(debug=True)
+app, rt = fast_app(
+    debug=True,
+    middleware=middleware,
+    on_startup=[prerendered.refresh] + ([static_assets.build] if COMPRESSION_ENABLED else []),
+    on_shutdown=[close_http_client],
+)
 # --- END CHANGE ---
 
 # --- CHANGE HERE: Use @rt decorator ---
 @rt("/")
-def get_home(): # Changed function name slightly to avoid potential conflicts if reusing 'home'
+def get_home(request): # Changed function name slightly to avoid potential conflicts if reusing 'home'
     """Handler for the home page route."""
-    return page_layout(
-        title="Home - Bit Tools",
-        content=home_page(),
-        current_page="/"
-    )
+    return prerendered.response(request, "/")
 
 @rt("/about")
-def get_about(): # Changed function name
-    return page_layout(
-        title="About Us - Bit Tools",
-        content=about_page(),
-        current_page="/about"
-    )
+def get_about(request): # Changed function name
+    return prerendered.response(request, "/about")
 
 @rt("/contact")
-def get_contact(): # Changed function name
-    return page_layout(
-        title="Contact Us - Bit Tools",
-        content=contact_page(),
-        current_page="/contact"
-    )
+def get_contact(request): # Changed function name
+    return prerendered.response(request, "/contact")
 
 @rt("/submit-contact")
 def post_submit_contact(name: str, email: str, message: str): # Changed function name and decorator
@@ -68,16 +102,17 @@ def post_submit_contact(name: str, email: str, message: str): # Changed function
     )
 
 @rt("/tools")
-def get_tools(): # Changed function name
-    return page_layout(
-        title="AI Tools - Bit Tools",
-        content=tools_page(),
-        current_page="/tools"
-    )
+def get_tools(request): # Changed function name
+    return prerendered.response(request, "/tools")
 
 # --- CHANGE HERE: Routing with path parameters ---
 @rt("/tools/{tool_id}")
-def get_tool_page_handler(tool_id: str): # Changed function name
+def get_tool_page_handler(tool_id: str, request): # Changed function name
+    page = prerendered.response(request, f"/tools/{tool_id}")
+    if page is not None:
+        return page
+
+    # Only unknown tools get here; every registered tool's page is pre-rendered
     tool = get_tool_by_id(tool_id)
     if not tool:
         error_content = Div(
@@ -134,62 +169,213 @@ async def post_process_tool(tool_id: str, request): # Changed function name
         form_data = await request.form()
         # Convert form_data (which is MultiDict-like) to a plain dict
         inputs = {key: form_data.get(key) for key in form_data.keys()}
-        results = await tool.process(inputs)
-
-        # --- Check for errors returned by the tool's process method ---
-        if isinstance(results, dict) and "error" in results:
-             error_message = results.get("error", "An unknown processing error occurred.")
-             # Log the detailed error if available
-             if "validation_errors" in results:
-                 print(f"Validation Errors: {results['validation_errors']}") # Log to console
-             elif "details" in results:
-                 print(f"Error Details: {results['details']}") # Log to console
-
-             error_content = Div(
-                 H1("Processing Error", cls="text-2xl font-bold mb-4"),
-                 P(f"An error occurred: {error_message}", cls="mb-4"),
-                 A("Try Again", href=f"/tools/{tool_id}", cls="inline-block px-4 py-2 bg-blue-500 text-white rounded hover:bg-blue-600"),
-                 cls="container mx-auto max-w-md bg-white p-6 rounded-lg shadow-md text-center"
-             )
-             # Consider returning a 400 or 500 status code depending on error type
-             return page_layout(
-                 title="Error - Bit Tools",
-                 content=error_content,
-                 current_page=f"/tools/{tool_id}"
-             )
-        # --- End Error Check ---
-
-
-        # Proceed to results page if no error dictionary from process()
-        return page_layout(
-            title=f"{tool.name} Results - Bit Tools",
-            content=tool_results_page(tool_id, results), # Pass results dict
+        # Stop generating (and free the upstream slot) if the user goes away
+        results = await cancel_on_disconnect(request, tool.process(inputs))
+        if results is None:
+            return Response(status_code=499)
+
+        title, content = results_page_content(tool, tool_id, results)
+        page = page_layout(
+            title=title,
+            content=content,
             current_page=f"/tools/{tool_id}"
         )
+        status_code, headers = error_status(results)
+        if status_code:
+            return HTMLResponse(to_xml(page), status_code=status_code, headers=headers)
+        return page
     except Exception as e:
-        # Catch unexpected errors during processing or rendering results
-        import traceback
-        print("------ UNEXPECTED ERROR ------")
-        traceback.print_exc() # Print full traceback to console
-        print("-----------------------------")
-
-        error_content = Div(
-            H1("Unexpected Error", cls="text-2xl font-bold mb-4"),
-            P(f"An unexpected error occurred: {str(e)}", cls="mb-4"),
-            P("Please check the console logs for more details.", cls="text-sm text-gray-500 mb-4"),
-            A("Try Again", href=f"/tools/{tool_id}", cls="inline-block px-4 py-2 bg-blue-500 text-white rounded hover:bg-blue-600"),
-            cls="container mx-auto max-w-md bg-white p-6 rounded-lg shadow-md text-center"
-        )
-
         # Return 500 Internal Server Error
         # from starlette.responses import HTMLResponse
         # return HTMLResponse(page_layout(...), status_code=500)
         return page_layout(
             title="Error - Bit Tools",
-            content=error_content,
+            content=unexpected_error_content(tool_id, e),
             current_page=f"/tools/{tool_id}"
         )
 
+# --- Lazily loaded tabs of a results page (HTML fragments, see tool-results.js) ---
+@rt("/tools/{tool_id}/results/{result_id}/{tab_id}")
+def get_results_tab(tool_id: str, result_id: str, tab_id: str):
+    """Render one tab of a results page from the result stored when the page was shown."""
+    tool = get_tool_by_id(tool_id)
+    results = result_store.get(tool_id, result_id) if tool else None
+    if results is None:
+        # Replaces the tab's placeholder, so keep its ID
+        return HTMLResponse(to_xml(Div(
+            P("These results have expired. Generate them again to see this view.", cls="text-gray-500"),
+            id=f"{tab_id}-view",
+            cls="mb-6"
+        )))
+
+    view = create_results_tab(tool_id, tool, results, tab_id)
+    if view is None:
+        return Response("Unknown results tab.", status_code=404)
+    # A bare fragment (FastHTML would wrap a plain fetch's response in a full page)
+    return HTMLResponse(to_xml(view))
+
+# Tool error codes that get a specific HTTP status instead of a 200 error page
+ERROR_STATUS_CODES = {
+    ErrorCode.OVERLOADED.value: 503,
+    ErrorCode.TIMEOUT.value: 504,
+    ErrorCode.RATE_LIMIT.value: 503,
+    ErrorCode.API_ERROR.value: 502,
+}
+
+async def cancel_on_disconnect(request, coro):
+    """
+    Await a coroutine, cancelling it as soon as the client disconnects.
+
+    Returns the coroutine's result, or None if the client went away first.
+    """
+    async def wait_for_disconnect():
+        # The body has already been read, so the next message is the disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+
+    work = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if work in done:
+        return work.result()
+    work.cancel()
+    logger.info(f"Client disconnected; cancelled processing for {request.url.path}")
+    return None
+
+def error_status(results):
+    """Return (status_code, headers) for an error result, or (None, {}) to use the default."""
+    if not isinstance(results, dict):
+        return None, {}
+    status_code = ERROR_STATUS_CODES.get(results.get("error_code"))
+    headers = {}
+    retry_after = results.get("details", {}).get("retry_after")
+    if status_code and retry_after is not None:
+        headers["Retry-After"] = str(retry_after)
+    return status_code, headers
+
+def results_page_content(tool, tool_id, results):
+    """Build the (title, content) for a tool's results, or for the error it returned."""
+    # --- Check for errors returned by the tool's process method ---
+    if isinstance(results, dict) and "error" in results:
+         error_message = results.get("error", "An unknown processing error occurred.")
+         # Log the detailed error if available
+         if "validation_errors" in results:
+             print(f"Validation Errors: {results['validation_errors']}") # Log to console
+         elif "details" in results:
+             print(f"Error Details: {results['details']}") # Log to console
+
+         error_content = Div(
+             H1("Processing Error", cls="text-2xl font-bold mb-4"),
+             P(f"An error occurred: {error_message}", cls="mb-4"),
+             A("Try Again", href=f"/tools/{tool_id}", cls="inline-block px-4 py-2 bg-blue-500 text-white rounded hover:bg-blue-600"),
+             cls="container mx-auto max-w-md bg-white p-6 rounded-lg shadow-md text-center"
+         )
+         # Consider returning a 400 or 500 status code depending on error type
+         return "Error - Bit Tools", error_content
+    # --- End Error Check ---
+
+    # Proceed to results page if no error dictionary from process()
+    return f"{tool.name} Results - Bit Tools", tool_results_page(tool_id, results) # Pass results dict
+
+def unexpected_error_content(tool_id, e):
+    """Log an unexpected processing/rendering error and build its error content."""
+    import traceback
+    print("------ UNEXPECTED ERROR ------")
+    traceback.print_exc() # Print full traceback to console
+    print("-----------------------------")
+
+    return Div(
+        H1("Unexpected Error", cls="text-2xl font-bold mb-4"),
+        P(f"An unexpected error occurred: {str(e)}", cls="mb-4"),
+        P("Please check the console logs for more details.", cls="text-sm text-gray-500 mb-4"),
+        A("Try Again", href=f"/tools/{tool_id}", cls="inline-block px-4 py-2 bg-blue-500 text-white rounded hover:bg-blue-600"),
+        cls="container mx-auto max-w-md bg-white p-6 rounded-lg shadow-md text-center"
+    )
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON-encoded payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+# --- Streaming variant of tool processing (Server-Sent Events) ---
+# The tool page's JS posts the form here and shows tokens, then rendered list
+# items, as they arrive; the final "done" event carries the rendered results. A
+# failure ends the stream with an "error" event instead, carrying the error code
+# and the status and Retry-After the POST route would have sent. The plain POST
+# route above stays as the fallback when streaming is unavailable.
+@rt("/tools/{tool_id}/stream")
+async def post_stream_tool(tool_id: str, request):
+    """Handler for streamed tool form submission."""
+    tool = get_tool_by_id(tool_id)
+    if not tool or not tool.supports_streaming:
+        return Response("Streaming is not available for this tool.", status_code=404)
+
+    form_data = await request.form()
+    inputs = {key: form_data.get(key) for key in form_data.keys()}
+
+    async def event_stream():
+        try:
+            async for event, payload in tool.stream(inputs):
+                if event == "token":
+                    yield sse_event("token", payload)
+                elif event == "item":
+                    fragment = create_stream_item(tool, payload["field"], payload["index"], payload["item"])
+                    if fragment is not None:
+                        yield sse_event("item", {"html": to_xml(fragment)})
+                elif event == "result":
+                    title, content = results_page_content(tool, tool_id, payload)
+                    if isinstance(payload, dict) and "error" in payload:
+                        # The stream is already a 200, so the status the POST route would send travels in the event
+                        status_code, _ = error_status(payload)
+                        yield sse_event("error", {
+                            "code": payload.get("error_code"),
+                            "status": status_code,
+                            "retry_after": payload.get("details", {}).get("retry_after"),
+                            "message": payload["error"],
+                            "title": title,
+                            "html": to_xml(content),
+                        })
+                    else:
+                        yield sse_event("done", {"title": title, "html": to_xml(content)})
+        except Exception as e:
+            yield sse_event("error", {
+                "code": ErrorCode.INTERNAL_ERROR.value,
+                "status": 500,
+                "retry_after": None,
+                "message": str(e),
+                "title": "Error - Bit Tools",
+                "html": to_xml(unexpected_error_content(tool_id, e)),
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# --- Admin diagnostics ---
+if ADMIN_ENABLED:
+    @rt("/admin/metrics")
+    def get_admin_metrics():
+        """Return counters from the tool subsystems (agent pool, caches, ...)."""
+        return JSONResponse(collect_stats())
+
+    @rt("/admin/routing")
+    def get_admin_routing():
+        """Show the model router's current decisions per tool and per model."""
+        return page_layout(
+            title="Model Routing - Bit Tools",
+            content=admin_routing(),
+            current_page="/admin/routing"
+        )
+
 # --- Run the application ---
 if __name__ == "__main__":
     # Use the serve() function which works with the app created by fast_app()
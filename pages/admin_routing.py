@@ -0,0 +1,62 @@
+from fasthtml.common import *
+from tools.core.router import model_router
+
+def _fmt(value, suffix=""):
+    """Format an optional number for display."""
+    if value is None:
+        return "—"
+    return f"{value}{suffix}"
+
+def _table(headers, rows):
+    """Create a simple striped table."""
+    return Table(
+        Thead(Tr(*[Th(h, cls="px-3 py-2 text-left text-xs font-semibold text-gray-600 uppercase") for h in headers])),
+        Tbody(*[
+            Tr(*[Td(cell, cls="px-3 py-2 text-sm text-gray-800 align-top") for cell in row],
+               cls="odd:bg-white even:bg-gray-50")
+            for row in rows
+        ]),
+        cls="min-w-full divide-y divide-gray-200"
+    )
+
+def admin_routing():
+    """Generate the admin view of the model router's current decisions."""
+    tool_rows = []
+    for entry in model_router.routing_table():
+        last = entry["last_choice"]
+        tool_rows.append([
+            entry["tool"],
+            entry["quality_tier"],
+            Ol(*[Li(model) for model in entry["ranked"]], cls="list-decimal list-inside"),
+            f"{last['model']} ({last['reason']})" if last else "—",
+        ])
+
+    model_rows = []
+    for model, stats in model_router.model_table().items():
+        model_rows.append([
+            model,
+            stats["tier"],
+            Span("healthy", cls="text-green-700") if stats["healthy"] else Span("unhealthy", cls="text-red-700"),
+            _fmt(stats["ewma_latency"], "s"),
+            _fmt(stats["error_rate"]),
+            _fmt(stats["tokens_per_second"]),
+            f"{stats['successes']} / {stats['errors']}",
+        ])
+
+    return Div(
+        H1("Model Routing", cls="text-3xl font-bold text-gray-800 mb-2"),
+        P("Live routing decisions per tool. Models are ranked healthy first, then by EWMA tokens/sec.",
+          cls="text-gray-600 mb-8"),
+        Div(
+            H2("Tools", cls="text-xl font-bold text-gray-800 mb-4"),
+            Div(_table(["Tool", "Quality tier", "Ranked candidates", "Last choice"], tool_rows), cls="overflow-x-auto"),
+            cls="bg-white p-6 rounded-lg shadow-md mb-8"
+        ),
+        Div(
+            H2("Models", cls="text-xl font-bold text-gray-800 mb-4"),
+            Div(_table(["Model", "Tier", "Status", "EWMA latency", "Error rate", "Tokens/sec", "OK / errors"], model_rows),
+                cls="overflow-x-auto"),
+            cls="bg-white p-6 rounded-lg shadow-md"
+        ),
+        cls="max-w-6xl mx-auto"
+    )
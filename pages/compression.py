@@ -0,0 +1,466 @@
+# pages/compression.py
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import gzip
+import hashlib
+import logging
+import mimetypes
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from config import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CONTENT_TYPES,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+from .prerender import etag_matches
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Supported encodings in order of preference, and the file suffix of their static variants
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+def choose_encoding(accept_encoding: Optional[str], available: Sequence[str] = ENCODINGS) -> Optional[str]:
+    """
+    Pick the encoding to send from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: The request's Accept-Encoding header
+        available: Encodings that can be sent, most preferred first
+
+    Returns:
+        The available encoding with the highest q-value (ties go to the
+        server's preference), or None if the response should be sent as is
+    """
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Compress a whole body.
+
+    Args:
+        data: The bytes to compress
+        encoding: "gzip" or "br"
+        best: Use the highest level (for files compressed once), instead of the configured one
+
+    Returns:
+        The compressed bytes (identical for identical input)
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class _StreamEncoder:
+    """Compresses a streamed body chunk by chunk, flushing so each chunk reaches the browser right away."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self._brotli = encoding == "br"
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli:
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli:
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+class ResponseCompressor:
+    """
+    Which dynamic responses get compressed, and how much that saved.
+
+    A response is compressed when the browser accepts an encoding, its content
+    type is in the allowlist, it is not encoded already, and it is at least
+    min_size bytes (streamed responses are compressed whatever their size).
+    A strong ETag names exact bytes, so bodies that carry one (the
+    pre-rendered pages) are compressed once per encoding and then reused.
+    """
+
+    def __init__(
+        self,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        content_types: Iterable[str] = COMPRESSION_CONTENT_TYPES,
+        max_cached: int = 128,
+    ):
+        """
+        Args:
+            min_size: Smallest body worth compressing, in bytes
+            content_types: Content types (without parameters) that are compressed
+            max_cached: Compressed bodies kept by (ETag, encoding)
+        """
+        self.min_size = min_size
+        self.content_types = frozenset(t.lower() for t in content_types)
+        self.max_cached = max_cached
+        self._cached: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.cache_hits = 0
+        self.compressed: Dict[str, int] = {encoding: 0 for encoding in ENCODINGS}
+        self.streamed = 0
+        self.skipped_small = 0
+        self.skipped_type = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def compressible(self, status: int, headers: Headers) -> bool:
+        """Check a response's status and headers (not its size) against the rules."""
+        if status < 200 or status in (204, 304):
+            return False
+        if not self.compressible_headers(headers):
+            if "content-encoding" not in headers and "no-transform" not in headers.get("cache-control", "").lower():
+                self.skipped_type += 1
+            return False
+        return True
+
+    def compressible_headers(self, headers: Headers) -> bool:
+        """Check the header rules alone: not encoded already, transforms allowed, an allowlisted type."""
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", "").lower():
+            return False
+        content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return content_type in self.content_types
+
+    def compress_body(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """
+        Compress a whole response body.
+
+        Args:
+            body: The response body
+            encoding: The encoding to use
+            etag: The response's ETag; a strong one lets the result be reused
+
+        Returns:
+            The compressed body
+        """
+        if not etag or etag.startswith("W/"):
+            return compress(body, encoding)
+        key = (etag, encoding)
+        data = self._cached.get(key)
+        if data is not None:
+            self._cached.move_to_end(key)
+            self.cache_hits += 1
+            return data
+        data = compress(body, encoding)
+        self._cached[key] = data
+        while len(self._cached) > self.max_cached:
+            self._cached.popitem(last=False)
+        return data
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many responses were compressed (per encoding) or skipped, and the bytes saved."""
+        return {
+            "encodings": list(ENCODINGS),
+            "compressed": dict(self.compressed),
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cached),
+            "streamed": self.streamed,
+            "skipped_small": self.skipped_small,
+            "skipped_type": self.skipped_type,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "min_size": self.min_size,
+        }
+
+class _CompressingSend:
+    """The ASGI send of one response, compressing the body once its headers show it should be."""
+
+    def __init__(self, compressor: ResponseCompressor, encoding: str, send):
+        self._compressor = compressor
+        self._encoding = encoding
+        self._send = send
+        self._start = None
+        self._encoder: Optional[_StreamEncoder] = None
+        self._passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether the response is compressed
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._encoder is not None:
+            data = self._encoder.chunk(body)
+            if not more_body:
+                data += self._encoder.finish()
+            self._compressor.bytes_in += len(body)
+            self._compressor.bytes_out += len(data)
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        # First body chunk: decide
+        start = self._start
+        headers = MutableHeaders(raw=list(start.get("headers", [])))
+        compressible = self._compressor.compressible(start["status"], headers)
+        if compressible and not more_body and len(body) < self._compressor.min_size:
+            self._compressor.skipped_small += 1
+            compressible = False
+        if not compressible:
+            self._passthrough = True
+            etag = headers.get("etag")
+            if start["status"] == 304 and etag and not etag.startswith("W/") and self._compressor.compressible_headers(headers):
+                # A 304 must carry the validator of the compressed 200 it stands for
+                headers["ETag"] = f"W/{etag}"
+                start = {**start, "headers": headers.raw}
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self._encoding
+        # Pages that vary by encoding anyway (pre-rendered ones) already say so
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from the ones the strong ETag names
+            headers["ETag"] = f"W/{etag}"
+        self._compressor.compressed[self._encoding] += 1
+        if more_body:
+            self._compressor.streamed += 1
+            self._encoder = _StreamEncoder(self._encoding)
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            data = self._encoder.chunk(body)
+        else:
+            data = self._compressor.compress_body(body, self._encoding, etag)
+            headers["Content-Length"] = str(len(data))
+        self._compressor.bytes_in += len(body)
+        self._compressor.bytes_out += len(data)
+        await self._send({**start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+@dataclass(frozen=True, slots=True)
+class StaticVariant:
+    """One compressed copy of a static file."""
+    body: bytes
+    etag: str
+
+@dataclass(frozen=True, slots=True)
+class StaticAsset:
+    """A static file and its compressed copies, as of the file's modification time."""
+    path: Path
+    mtime_ns: int
+    content_type: str
+    variants: Dict[str, StaticVariant]
+
+class PrecompressedStatic:
+    """
+    Compressed copies of the files under static/, made once.
+
+    At startup every file whose type is in the allowlist and that is at least
+    min_size bytes gets a .br/.gz variant: read from disk when a current one
+    was written at build time (`python -m pages.compression`), otherwise
+    compressed at the highest level in memory. Requests pick a variant by
+    Accept-Encoding; a file that changed on disk is compressed again on its
+    next request, in the threadpool so the event loop keeps serving. Everything
+    else is left to the normal static route.
+    """
+
+    def __init__(
+        self,
+        directory: str = "static",
+        url_prefix: str = "/static/",
+        min_size: int = COMPRESSION_MIN_SIZE,
+        content_types: Iterable[str] = COMPRESSION_CONTENT_TYPES,
+    ):
+        """
+        Args:
+            directory: The static files directory
+            url_prefix: The URL path the directory is served under
+            min_size: Smallest file worth compressing, in bytes
+            content_types: Content types that are compressed
+        """
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix
+        self.min_size = min_size
+        self.content_types = frozenset(t.lower() for t in content_types)
+        self._assets: Dict[str, StaticAsset] = {}
+        self.from_disk = 0
+        self.compressed = 0
+        self.hits: Dict[str, int] = {encoding: 0 for encoding in ENCODINGS}
+        self.not_modified = 0
+
+    def build(self):
+        """Load or compress the variants of every eligible file under the directory."""
+        assets = {}
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or path.suffix in SUFFIXES.values():
+                continue
+            asset = self._load(path)
+            if asset is not None:
+                assets[self._url(path)] = asset
+        self._assets = assets
+        logger.info(
+            f"Precompressed {len(assets)} static files as {'/'.join(ENCODINGS)} "
+            f"({self.from_disk} variants from disk, {self.compressed} compressed)"
+        )
+
+    def write(self) -> int:
+        """Write every variant next to its file (for build time), returning how many were written."""
+        self.build()
+        written = 0
+        for asset in self._assets.values():
+            for encoding, variant in asset.variants.items():
+                variant_path = self._variant_path(asset.path, encoding)
+                if not variant_path.is_file() or variant_path.read_bytes() != variant.body:
+                    variant_path.write_bytes(variant.body)
+                    written += 1
+        return written
+
+    def _url(self, path: Path) -> str:
+        return self.url_prefix + path.relative_to(self.directory).as_posix()
+
+    @staticmethod
+    def _variant_path(path: Path, encoding: str) -> Path:
+        return path.with_name(path.name + SUFFIXES[encoding])
+
+    def _load(self, path: Path) -> Optional[StaticAsset]:
+        stat = path.stat()
+        content_type = mimetypes.guess_type(path.name)[0]
+        if content_type not in self.content_types or stat.st_size < self.min_size:
+            return None
+        source = path.read_bytes()
+        variants = {}
+        for encoding in ENCODINGS:
+            variant_path = self._variant_path(path, encoding)
+            if variant_path.is_file() and variant_path.stat().st_mtime_ns >= stat.st_mtime_ns:
+                body = variant_path.read_bytes()
+                self.from_disk += 1
+            else:
+                body = compress(source, encoding, best=True)
+                self.compressed += 1
+            # Only worth sending if it is actually smaller
+            if len(body) < len(source):
+                variants[encoding] = StaticVariant(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        if not variants:
+            return None
+        return StaticAsset(path=path, mtime_ns=stat.st_mtime_ns, content_type=content_type, variants=variants)
+
+    async def response(self, path: str, headers: Headers) -> Optional[Response]:
+        """
+        Build the response for a static file from its compressed variants.
+
+        Args:
+            path: The request's URL path
+            headers: The request headers (Accept-Encoding, If-None-Match)
+
+        Returns:
+            A 200 with the best accepted variant, a 304 if the browser's copy is
+            current, or None if the file has no variant the browser accepts
+        """
+        asset = self._assets.get(path)
+        if asset is None:
+            return None
+        try:
+            mtime_ns = asset.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            del self._assets[path]
+            return None
+        if mtime_ns != asset.mtime_ns:
+            # Highest-level compression takes long enough to stall other requests
+            asset = await run_in_threadpool(self._load, asset.path)
+            if asset is None:
+                del self._assets[path]
+                return None
+            self._assets[path] = asset
+        encoding = choose_encoding(headers.get("accept-encoding"), tuple(asset.variants))
+        if encoding is None:
+            return None
+        variant = asset.variants[encoding]
+        response_headers = {"Content-Encoding": encoding, "Vary": "Accept-Encoding", "ETag": variant.etag}
+        if etag_matches(headers.get("if-none-match"), variant.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=response_headers)
+        self.hits[encoding] += 1
+        return Response(variant.body, media_type=asset.content_type, headers=response_headers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the precompressed files and how often each encoding was served."""
+        return {
+            "files": len(self._assets),
+            "from_disk": self.from_disk,
+            "compressed": self.compressed,
+            "hits": dict(self.hits),
+            "not_modified": self.not_modified,
+            "bytes": {
+                encoding: sum(len(a.variants[encoding].body) for a in self._assets.values() if encoding in a.variants)
+                for encoding in ENCODINGS
+            },
+        }
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses.
+
+    Static files with precompressed variants are answered here directly; all
+    other responses go through the app and are compressed on the fly when the
+    ResponseCompressor's rules allow it.
+    """
+
+    def __init__(self, app, compressor: ResponseCompressor, static: Optional[PrecompressedStatic] = None):
+        """
+        Args:
+            app: The wrapped ASGI app
+            compressor: Rules and counters for dynamic responses
+            static: Precompressed static files, if any
+        """
+        self.app = app
+        self.compressor = compressor
+        self.static = static
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if self.static is not None and scope["method"] in ("GET", "HEAD"):
+            response = await self.static.response(scope["path"], headers)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        encoding = choose_encoding(headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self.compressor, encoding, send))
+
+if __name__ == "__main__":
+    # Build step: write the .br/.gz variants next to the static files
+    logging.basicConfig(level=logging.INFO)
+    print(f"Wrote {PrecompressedStatic().write()} compressed static files")
@@ -0,0 +1,121 @@
+# pages/prerender.py
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import logging
+import threading
+import time
+
+from fasthtml.common import to_xml
+from starlette.responses import Response
+
+from tools.core import registry
+
+logger = logging.getLogger(__name__)
+
+# Browsers may keep a page but must check it is still current before reusing it;
+# the ETag turns that check into an empty 304 response
+CACHE_CONTROL = "no-cache"
+
+@dataclass(frozen=True, slots=True)
+class RenderedPage:
+    """A page serialized to the exact bytes sent to the browser."""
+    body: bytes
+    # Strong validator: the same ETag always means the same bytes
+    etag: str
+
+def render_page(page: Any) -> RenderedPage:
+    """Serialize a page the way FastHTML would and compute its ETag."""
+    body = to_xml(page).encode("utf-8")
+    return RenderedPage(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+class PrerenderedPages:
+    """
+    Pages that only depend on the code and the tool registry, rendered to bytes once.
+
+    The page set is rebuilt whenever the registry's version changes (a tool was
+    registered), so a new tool shows up on /, /tools and its own page without a
+    restart. Everything else is served from the stored bytes, with an ETag so
+    returning browsers get a 304 instead of the page.
+    """
+
+    def __init__(self, pages: Callable[[], Dict[str, Any]]):
+        """
+        Args:
+            pages: Builds the current pages as {path: full page}
+        """
+        self._pages = pages
+        self._rendered: Dict[str, RenderedPage] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.render_ms = 0.0
+        self.hits = 0
+        self.not_modified = 0
+
+    def refresh(self):
+        """Render every page again if the registry changed since the last render."""
+        if self._version == registry.version:
+            return
+        with self._lock:
+            version = registry.version
+            if self._version == version:
+                return
+            started = time.perf_counter()
+            rendered = {path: render_page(page) for path, page in self._pages().items()}
+            self.render_ms = round((time.perf_counter() - started) * 1000, 3)
+            self.renders += 1
+            # Swapped in one assignment, so readers never see a half-built set
+            self._rendered = rendered
+            self._version = version
+            logger.info(f"Pre-rendered {len(rendered)} pages in {self.render_ms} ms (registry version {version})")
+
+    def get(self, path: str) -> Optional[RenderedPage]:
+        """Return the rendered page for a path, or None if it is not pre-rendered."""
+        self.refresh()
+        return self._rendered.get(path)
+
+    def response(self, request, path: str) -> Optional[Response]:
+        """
+        Build the response for a pre-rendered page.
+
+        Args:
+            request: The incoming request (for its If-None-Match header)
+            path: The page's path
+
+        Returns:
+            A 200 response with the page, a 304 if the browser's copy is current,
+            or None if the path is not pre-rendered
+        """
+        page = self.get(path)
+        if page is None:
+            return None
+        # Sent compressed or not depending on Accept-Encoding, 304s included
+        headers = {"ETag": page.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if etag_matches(request.headers.get("if-none-match"), page.etag):
+            self.not_modified += 1
+            # The type lets the compression middleware give the 304 the same
+            # (weak) ETag as the compressed 200
+            return Response(status_code=304, headers={**headers, "Content-Type": "text/html; charset=utf-8"})
+        self.hits += 1
+        return Response(page.body, media_type="text/html; charset=utf-8", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how often the pages were rendered and how often they were served from memory."""
+        return {
+            "pages": len(self._rendered),
+            "registry_version": self._version,
+            "renders": self.renders,
+            "last_render_ms": self.render_ms,
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "bytes": sum(len(page.body) for page in self._rendered.values()),
+        }
@@ -1,7 +1,7 @@
 from fasthtml.common import *
 from tools import get_tool_by_id
 from .tool_page import tool_page
-from .results import create_results_page
+from .results import create_results_page, create_results_tab, create_stream_item
 
 def tool_results_page(tool_id, results):
     """
@@ -6,33 +6,45 @@ from .outline_results import OutlineResultsHandler
 from .standard_results import StandardResultsHandler
 from .youtube_script_results import YoutubeScriptResultsHandler
 from .thumbnail_results import ThumbnailResultsHandler # Import the new handler
+from tools.core.results import TransformationResult
+from tools.implementations.models import BlogOutline, ThumbnailIdeas, YoutubeScriptOutput
+
+# Handlers for structured generation results, by response model; anything else is shown as a list
+STRUCTURED_HANDLERS = {
+    ThumbnailIdeas: ThumbnailResultsHandler,
+    BlogOutline: OutlineResultsHandler,
+    YoutubeScriptOutput: YoutubeScriptResultsHandler,
+}
+
+def get_results_handler_class(results):
+    """Return the results handler class for a tool result."""
+    if isinstance(results, TransformationResult):
+        return TransformationResultsHandler
+    # Unstructured fallbacks (structured is None) get the standard list view
+    return STRUCTURED_HANDLERS.get(type(results.structured), StandardResultsHandler)
 
 def create_results_page(tool_id, tool, results):
     """
-    Create a results page based on the tool type and results.
+    Create a results page based on the type of results.
     Routes to the appropriate handler.
     """
-    # Determine the type of results and use the appropriate handler
-    if "transformed_text" in results:
-        handler_class = TransformationResultsHandler
-    elif "thumbnail" in tool_id.lower() and ("thumbnail_ideas" in results or "ideas" in results):
-         handler_class = ThumbnailResultsHandler # Route to new handler
-    elif "outline" in tool_id.lower(): # Check for outline structure if needed
-        # Check if results contain keys specific to the BlogOutline model
-        if "introduction" in results and "main_sections" in results and "conclusion" in results:
-             handler_class = OutlineResultsHandler
-        else: # Fallback for potentially unstructured outlines
-             handler_class = StandardResultsHandler
-    elif "youtube-script" in tool_id.lower():
-        # Check if results contain keys specific to YoutubeScriptOutput
-        if "script" in results and "hooks" in results:
-             handler_class = YoutubeScriptResultsHandler
-        else: # Fallback for potentially unstructured scripts
-             handler_class = StandardResultsHandler
-    else:
-        # Default handler for titles, social posts, etc.
-        handler_class = StandardResultsHandler
-
     # Instantiate and render
-    handler = handler_class(tool_id, tool, results)
-    return handler.render()
\ No newline at end of file
+    handler = get_results_handler_class(results)(tool_id, tool, results)
+    return handler.render()
+
+def create_results_tab(tool_id, tool, results, tab_id):
+    """
+    Render one tab of a results page (loaded on demand by lazy tabs).
+    Returns None if the results page has no such tab.
+    """
+    handler = get_results_handler_class(results)(tool_id, tool, results)
+    return handler.render_tab(tab_id)
+
+def create_stream_item(tool, field, index, item):
+    """
+    Render a single list item streamed before the full results are ready.
+    Uses the handler the results page will use (by the tool's response model);
+    returns None for tools whose results are not shown item by item.
+    """
+    handler_class = STRUCTURED_HANDLERS.get(tool.response_model, StandardResultsHandler)
+    return handler_class.create_stream_item(index, item)
@@ -1,12 +1,18 @@
 from fasthtml.common import *
 import json
 import logging
+from config import LAZY_RESULT_TABS
+from tools.core.result_store import result_store
+from .components import create_tab_navigation, create_tab_placeholder, create_results_data
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 class BaseResultsHandler:
     """Base class for handling tool results."""
+
+    # Tabs whose views copy text built from the results data (None = every tab)
+    results_data_tabs = None
     
     def __init__(self, tool_id, tool, results):
         """
@@ -15,21 +21,120 @@ class BaseResultsHandler:
         Args:
             tool_id: The ID of the tool
             tool: The tool instance
-            results: The results from the tool processing
+            results: The ToolResult from the tool processing
         """
         self.tool_id = tool_id
         self.tool = tool
         self.results = results
-        self.metadata = results.get("metadata", {})
-        
-        # Process titles if present
-        self.titles = results.get("titles", [])
-        if isinstance(self.titles, str):
-            self.titles = self.titles.split('\n')
+        self.metadata = results.metadata
+        # The validated response model, for structured generation results
+        self.structured = getattr(results, "structured", None)
         
-        # Filter out empty titles
-        self.titles = [title for title in self.titles if title.strip()]
+        # Display lines of generation results, without the empty ones
+        self.titles = [title for title in getattr(results, "lines", ()) if title.strip()]
+        # Render only the active tab; the others are fetched when first opened
+        self.lazy_tabs = LAZY_RESULT_TABS
+        self.active_tab_id = None
+
+    @staticmethod
+    def create_stream_item(index, item):
+        """
+        Render one list item streamed before the full results are ready.
+
+        The default shows nothing until the results are complete, for results
+        that only make sense once the whole structure is known (outlines, scripts).
+        """
+        return None
+
+    def get_results_data(self):
+        """
+        Return the result as JSON data for the copy buttons (see create_results_data).
+
+        The default is the display lines, copied one per item or all together.
+        """
+        return {"kind": "lines", "lines": self.titles}
+
+    def uses_results_data(self, tab_id):
+        """Whether a tab's view copies text built from the results data."""
+        return self.results_data_tabs is None or tab_id in self.results_data_tabs
+
+    def create_results_data(self):
+        """
+        Create the JSON block the page's copy buttons build their text from.
+
+        With lazy tabs, a page whose active tab copies nothing gets an empty
+        block; the first tab fragment that needs the data fills it in.
+        """
+        if self.lazy_tabs and self.get_tab_views() and not self.uses_results_data(self.active_tab_id):
+            return create_results_data(None)
+        return create_results_data(self.get_results_data())
+
+    def get_tab_views(self):
+        """
+        Return the page's tabs as {tab id: method creating the tab's view}, in tab order.
+
+        Tabbed handlers override this; pages without tabs return an empty dict.
+        """
+        return {}
+
+    def create_views(self):
+        """
+        Create the views of every tab.
+
+        With lazy tabs only the active tab's view is rendered; the others are
+        placeholders that load their view from the stored result when opened.
+        """
+        return Div(*[
+            create_view() if tab_id == self.active_tab_id or not self.lazy_tabs else create_tab_placeholder(tab_id)
+            for tab_id, create_view in self.get_tab_views().items()
+        ])
+
+    def render_tab(self, tab_id):
+        """
+        Render a single tab's view, as the active tab (the fragment a lazy tab loads).
+
+        Returns:
+            The view, or None if the page has no such tab
+        """
+        create_view = self.get_tab_views().get(tab_id)
+        if create_view is None:
+            return None
+        # The page was rendered with the handler's default tab active
+        page_has_data = self.uses_results_data(self.active_tab_id)
+        self.active_tab_id = tab_id
+        view = create_view()
+        if self.lazy_tabs and not page_has_data and self.uses_results_data(tab_id):
+            return view, create_results_data(self.get_results_data())
+        return view
+
+    def build_tab_navigation(self, tabs_config):
+        """
+        Create the tab navigation from the handler's tab configs.
+
+        With lazy tabs the result is kept in the result store, and every tab but
+        the active one loads its view from /tools/<tool>/results/<id>/<tab>.
+        """
+        if not self.lazy_tabs:
+            return create_tab_navigation(tabs_config)
+
+        result_id = result_store.put(self.tool_id, self.results)
+        return create_tab_navigation([
+            tab if tab["selected"] else {**tab, "url": f"/tools/{self.tool_id}/results/{result_id}/{tab['id']}"}
+            for tab in tabs_config
+        ])
     
+    def create_warnings_section(self):
+        """Create a notice for results that came back incomplete (e.g. truncated output)."""
+        warnings = self.results.warnings
+        if not warnings:
+            return Div()
+
+        return Div(
+            *[P(warning, cls="mb-1 last:mb-0") for warning in warnings],
+            cls="mb-6 p-4 bg-yellow-50 border border-yellow-300 text-yellow-800 rounded",
+            role="alert"
+        )
+
     def create_metadata_section(self):
         """Create the metadata section of the results page."""
         if not self.metadata:
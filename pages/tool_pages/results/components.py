@@ -1,13 +1,15 @@
 # pages/tool_pages/results/components.py
 from fasthtml.common import *
 from fasthtml.components import NotStr
+import json
 
 def create_tab_navigation(tabs):
     """
     Create tab navigation UI.
 
     Args:
-        tabs: List of tab dictionaries with id, label, and selected keys
+        tabs: List of tab dictionaries with id, label, and selected keys, plus an
+            optional url the tab's view is loaded from on the first click
 
     Returns:
         Component representing the tab navigation
@@ -21,14 +23,51 @@ def create_tab_navigation(tabs):
                 # Using inline onclick which calls the function in tool-results.js
                 onclick=f"switchTab('{tab['id']}')",
                 # Dynamically set classes based on 'selected' status
-                cls=f"px-4 py-2 rounded-t {'bg-white text-blue-600 font-bold' if tab['selected'] else 'bg-gray-200 text-gray-700'}"
+                cls=f"px-4 py-2 rounded-t {'bg-white text-blue-600 font-bold' if tab['selected'] else 'bg-gray-200 text-gray-700'}",
+                # Lazy tabs replace their placeholder view with the fragment at url (see tool-results.js)
+                **({"data-tab-url": tab["url"]} if tab.get("url") else {})
             )
             for tab in tabs
         ],
         cls="flex border-b border-gray-300 mb-4" # Added border-b for visual separation
     )
 
-def create_copy_button(text_id, button_id=None, status_id=None):
+def create_tab_placeholder(tab_id):
+    """
+    Create the empty view of a tab that is loaded on demand.
+
+    Args:
+        tab_id: The tab's ID (the view gets the usual '<tab_id>-view' ID)
+
+    Returns:
+        A hidden placeholder, replaced by the real view when the tab is first opened
+    """
+    return Div(
+        P("Loading...", cls="text-gray-500"),
+        id=f"{tab_id}-view",
+        cls="mb-6 hidden"
+    )
+
+def copy_text_attrs(text, index=None, source=None):
+    """
+    Data attributes telling tool-results.js which text to build from the results data.
+
+    Args:
+        text: Which text to build (e.g. "all" or "item"; see COPY_TEXT_BUILDERS in tool-results.js)
+        index: Index of the item, for per-item texts
+        source: Name of the list the item comes from, when the data has several
+
+    Returns:
+        A dict of data-copy-* attributes
+    """
+    attrs = {'data-copy-text': text}
+    if index is not None:
+        attrs['data-copy-index'] = str(index)
+    if source is not None:
+        attrs['data-copy-source'] = source
+    return attrs
+
+def create_copy_button(text_id=None, button_id=None, status_id=None, copy_text=None):
     """
     Create a copy button with status indicator, relying on external JS.
 
@@ -36,11 +75,12 @@ def create_copy_button(text_id, button_id=None, status_id=None):
         text_id: ID of the element containing the text to copy (or the text itself if simple)
         button_id: Optional ID for the copy button (usually not needed)
         status_id: Optional ID for the status message element (usually not needed)
+        copy_text: Instead of text_id, the copy_text_attrs() of the text to build from the results data
 
     Returns:
         Component representing the copy button and status
     """
-    # Button uses data-copy-target to link to the text source
+    # Button uses data-copy-target (or data-copy-text) to link to the text source
     # JS will find the status element as the next sibling
     return Div(
         Button(
@@ -48,13 +88,34 @@ def create_copy_button(text_id, button_id=None, status_id=None):
             type="button",
             # Use class for JS targeting
             cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-1 px-3 rounded text-sm mr-2",
-            **{'data-copy-target': text_id} # Crucial data attribute for JS
+            **(copy_text or {'data-copy-target': text_id}) # Crucial data attribute for JS
         ),
         # Status element immediately follows the button
         P("", cls="copy-status text-green-600 inline-block text-sm"),
         cls="mt-2 flex items-center"
     )
 
+def create_results_data(data):
+    """
+    Embed the result once, as JSON, for the copy buttons.
+
+    tool-results.js builds every copied text (per item, copy-all, ...) from this
+    instead of the page carrying hidden copies of the content.
+
+    Args:
+        data: JSON-serializable result data, with a "kind" naming its text builders,
+            or None for an empty block that a lazily loaded tab fills in later (its
+            fragment carries a full block that replaces the page's empty one)
+
+    Returns:
+        A JSON script block with the ID 'results-data'
+    """
+    if data is None:
+        return Script(type="application/json", id="results-data")
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    # Keep "</script>" in the content from ending the block early
+    return Script(NotStr(payload.replace("<", "\\u003c")), type="application/json", id="results-data")
+
 def create_loading_overlay():
     """
     Create a loading overlay.
@@ -4,65 +4,70 @@ from fasthtml.components import NotStr
 import json
 import re # Import re
 from .base_results import BaseResultsHandler
-from .components import create_tab_navigation, create_copy_button, create_markdown_viewer, create_tab_switching_script
+from .components import copy_text_attrs, create_markdown_viewer, create_tab_switching_script
 
 class OutlineResultsHandler(BaseResultsHandler):
     """Handler for structured or unstructured blog outline tool results."""
 
+    # Only these views copy text built from the results data (the markdown view copies its own textarea)
+    results_data_tabs = {"card", "copy"}
+
     def __init__(self, tool_id, tool, results):
         """Initialize the outline results handler."""
         super().__init__(tool_id, tool, results)
         self.active_tab_id = "list" # Default active tab
 
         # Check if we have structured outline data
-        if "introduction" in results and "main_sections" in results and "conclusion" in results:
-            # Process the structured outline data
-            self.outline_lines = self._process_structured_outline(results)
+        if self.structured is not None:
+            # Process the validated BlogOutline model
+            self.outline_lines = self._process_structured_outline(self.structured)
         else:
             # Use 'titles' from base class (which is prepared by the factory)
             self.outline_lines = self.titles
 
         # Generate markdown from the potentially structured lines
         self.markdown_text = self._generate_markdown_from_lines(self.outline_lines)
-        # Text for copy-all is just the raw lines joined
-        self.all_content_text = "\n".join(self.outline_lines)
 
-    def _process_structured_outline(self, results):
-        """Process structured outline data into a list of formatted lines."""
+    def get_results_data(self):
+        """Return the outline lines; the outline and raw-text copies are these joined."""
+        return {"kind": "lines", "lines": self.outline_lines}
+
+    def _process_structured_outline(self, outline):
+        """Process a BlogOutline model into a list of formatted lines."""
         lines = []
 
         # Process introduction
-        if results.get("introduction"):
-            intro = results["introduction"]
-            lines.append(f"# {intro.get('title', 'Introduction')}")
-            for point in intro.get("points", []):
+        if outline.introduction:
+            intro = outline.introduction
+            lines.append(f"# {intro.title or 'Introduction'}")
+            for point in intro.points:
                 lines.append(f"- {point}")
             lines.append("") # Add a blank line for spacing
 
         # Process main sections
-        if results.get("main_sections"):
+        if outline.main_sections:
             lines.append("# Main Sections")
             lines.append("") # Add a blank line for spacing
 
-            for section in results["main_sections"]:
-                lines.append(f"## {section.get('title', 'Untitled Section')}")
-                for point in section.get("points", []):
+            for section in outline.main_sections:
+                lines.append(f"## {section.title or 'Untitled Section'}")
+                for point in section.points:
                     lines.append(f"- {point}")
 
                 # Process subsections if any
-                for subsection in section.get("subsections", []):
-                    lines.append(f"### {subsection.get('title', 'Untitled Subsection')}")
-                    for point in subsection.get("points", []):
+                for subsection in section.subsections:
+                    lines.append(f"### {subsection.title or 'Untitled Subsection'}")
+                    for point in subsection.points:
                         lines.append(f"- {point}")
                     lines.append("") # Add a blank line for spacing
 
                 lines.append("") # Add a blank line for spacing
 
         # Process conclusion
-        if results.get("conclusion"):
-            conclusion = results["conclusion"]
-            lines.append(f"# {conclusion.get('title', 'Conclusion')}")
-            for point in conclusion.get("points", []):
+        if outline.conclusion:
+            conclusion = outline.conclusion
+            lines.append(f"# {conclusion.title or 'Conclusion'}")
+            for point in conclusion.points:
                 lines.append(f"- {point}")
 
         return lines
@@ -143,11 +148,9 @@ class OutlineResultsHandler(BaseResultsHandler):
                 Button(
                     "Copy Outline", type="button",
                     cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mt-3 mr-2",
-                    **{'data-copy-target': 'card-copy-source', 'data-copy-type': 'element'}
+                    **copy_text_attrs("all")
                 ),
-                P("", cls="copy-status text-green-600 inline-block"),
-                # Hidden source for the card copy button
-                Div("\n".join(self.outline_lines), id='card-copy-source', cls='hidden')
+                P("", cls="copy-status text-green-600 inline-block")
             ),
             id=view_id,
             cls=classes
@@ -196,31 +199,33 @@ class OutlineResultsHandler(BaseResultsHandler):
 
         return Div(
             H3("Raw Outline Text", cls="text-lg font-semibold mb-3"),
+            # Raw lines joined, filled in by tool-results.js from the results data
             Textarea(
-                self.all_content_text, # Use raw lines joined
+                "",
                 id="copy-all-content-textarea", # Unique ID
                 rows=15,
                 readonly=True,
-                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50"
+                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50",
+                **copy_text_attrs("all")
             ),
              Button(
                 "Copy Raw Text", type="button",
                 cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mt-2 mr-2",
-                **{'data-copy-target': 'copy-all-content-textarea', 'data-copy-type': 'textarea'} # Target the textarea
+                **copy_text_attrs("all")
             ),
             P("", cls="copy-status text-green-600 inline-block"),
             id=view_id,
             cls=classes
         )
 
-    def create_views(self):
-        """Create all views for the outline results."""
-        return Div(
-            self.create_list_view(),
-            self.create_card_view(),
-            self.create_markdown_view(),
-            self.create_copy_all_view()
-        )
+    def get_tab_views(self):
+        """Map each tab of the outline results to its view."""
+        return {
+            "list": self.create_list_view,
+            "card": self.create_card_view,
+            "markdown": self.create_markdown_view,
+            "copy": self.create_copy_all_view,
+        }
 
     def create_tabs(self):
         """Create tabs for the outline results."""
@@ -230,7 +235,7 @@ class OutlineResultsHandler(BaseResultsHandler):
             {"id": "markdown", "label": "Markdown", "selected": self.active_tab_id == "markdown"},
             {"id": "copy", "label": "Copy Raw", "selected": self.active_tab_id == "copy"}
         ]
-        return create_tab_navigation(tabs_config)
+        return self.build_tab_navigation(tabs_config)
 
     def render(self):
         """Render the outline results page."""
@@ -238,10 +243,12 @@ class OutlineResultsHandler(BaseResultsHandler):
             H1(f"{self.tool.name} Results", cls="text-3xl font-bold text-gray-800 mb-2 text-center"),
             P("Here is your generated outline:", cls="text-xl text-gray-600 mb-8 text-center"),
             Div(
+                self.create_warnings_section(),
                 self.create_metadata_section(),
                 self.create_tabs(),
                 self.create_views(),
                 self.create_navigation_buttons(),
+                self.create_results_data(), # Source of the outline copies
                 create_tab_switching_script(), # Link the main JS file
                 # Script for zero-md needs to be loaded for the preview
                 Script(type="module", src="https://cdn.jsdelivr.net/npm/zero-md@3?register"),
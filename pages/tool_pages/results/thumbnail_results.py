@@ -1,7 +1,7 @@
 # pages/tool_pages/results/thumbnail_results.py
 from fasthtml.common import *
 from .base_results import BaseResultsHandler
-from .components import create_tab_navigation, create_copy_button, create_tab_switching_script
+from .components import create_copy_button, copy_text_attrs, create_tab_switching_script
 
 class ThumbnailResultsHandler(BaseResultsHandler):
     """Handler for YouTube Thumbnail Ideas results using structured data."""
@@ -9,12 +9,37 @@ class ThumbnailResultsHandler(BaseResultsHandler):
     def __init__(self, tool_id, tool, results):
         """Initialize using structured results."""
         super().__init__(tool_id, tool, results)
-        # The factory should place the list of idea dicts into 'ideas'
-        self.ideas_list = results.get("ideas", [])
-        # 'titles' created by factory is a formatted string list for display/copy-all
-        self.all_content_text = "\n".join(self.titles)
+        # Only structured results (a validated ThumbnailIdeas model) are routed here
+        self.ideas_list = self.structured.ideas
         self.active_tab_id = "list" # Default active tab
 
+    def get_results_data(self):
+        """Return the ideas; tool-results.js formats each copied idea and the copy-all text."""
+        return {
+            "kind": "thumbnails",
+            "ideas": [
+                {
+                    "background": idea.background,
+                    "main_image": idea.main_image,
+                    "text": idea.text,
+                    "additional_elements": idea.additional_elements,
+                }
+                for idea in self.ideas_list
+            ],
+        }
+
+    @staticmethod
+    def create_stream_item(index, item):
+        """Render one streamed thumbnail idea while the rest are still being generated."""
+        return Div(
+            H4(f"Thumbnail Idea {index+1}", cls="text-lg font-bold mb-2 text-blue-700"),
+            P(Span("Background: ", cls="font-semibold"), f"{item.background or 'N/A'}", cls="mb-1 text-sm"),
+            P(Span("Main Image: ", cls="font-semibold"), f"{item.main_image or 'N/A'}", cls="mb-1 text-sm"),
+            P(Span("Text: ", cls="font-semibold"), f"{item.text or 'N/A'}", cls="mb-1 text-sm"),
+            P(Span("Elements: ", cls="font-semibold"), f"{item.additional_elements or 'N/A'}", cls="mb-1 text-sm"),
+            cls="p-4 bg-white rounded shadow border border-gray-200"
+        )
+
     def create_list_view(self):
         """Create the list view for thumbnail ideas."""
         view_id = "list-view"
@@ -27,32 +52,19 @@ class ThumbnailResultsHandler(BaseResultsHandler):
 
         list_items = []
         for i, idea in enumerate(self.ideas_list):
-            idea_id_target = f"list-idea-content-{i}"
-            # Ensure idea is a dict, fallback if it's somehow a string
-            if not isinstance(idea, dict): idea = {"text": str(idea)}
-
             # Prepare content lines for display
             content_lines = [
-                P(Span("Background: ", cls="font-semibold"), f"{idea.get('background', 'N/A')}", cls="mb-1 text-sm"),
-                P(Span("Main Image: ", cls="font-semibold"), f"{idea.get('main_image', 'N/A')}", cls="mb-1 text-sm"),
-                P(Span("Text: ", cls="font-semibold"), f"{idea.get('text', 'N/A')}", cls="mb-1 text-sm"),
-                P(Span("Elements: ", cls="font-semibold"), f"{idea.get('additional_elements', 'N/A')}", cls="mb-1 text-sm"),
+                P(Span("Background: ", cls="font-semibold"), f"{idea.background or 'N/A'}", cls="mb-1 text-sm"),
+                P(Span("Main Image: ", cls="font-semibold"), f"{idea.main_image or 'N/A'}", cls="mb-1 text-sm"),
+                P(Span("Text: ", cls="font-semibold"), f"{idea.text or 'N/A'}", cls="mb-1 text-sm"),
+                P(Span("Elements: ", cls="font-semibold"), f"{idea.additional_elements or 'N/A'}", cls="mb-1 text-sm"),
             ]
-            # Prepare text for the copy button
-            copy_text = "\n".join([
-                f"Background: {idea.get('background', 'N/A')}",
-                f"Main Image: {idea.get('main_image', 'N/A')}",
-                f"Text: {idea.get('text', 'N/A')}",
-                f"Elements: {idea.get('additional_elements', 'N/A')}"
-            ])
-
             list_items.append(
                 Div(
                     H4(f"Thumbnail Idea {i+1}", cls="text-lg font-bold mb-2 text-blue-700"),
                     *content_lines,
-                    # Copy button and status (using component)
-                    create_copy_button(text_id=idea_id_target),
-                    Div(copy_text, id=idea_id_target, cls="hidden"), # Hidden content for copy
+                    # Copy button and status (using component); the text is built from the results data
+                    create_copy_button(copy_text=copy_text_attrs("item", i)),
                     cls="p-4 bg-white rounded shadow border border-gray-200"
                 )
             )
@@ -71,24 +83,13 @@ class ThumbnailResultsHandler(BaseResultsHandler):
 
         card_items = []
         for i, idea in enumerate(self.ideas_list):
-             idea_id_target = f"card-idea-content-{i}"
-             if not isinstance(idea, dict): idea = {"text": str(idea)}
-
-             copy_text = "\n".join([
-                f"Background: {idea.get('background', 'N/A')}",
-                f"Main Image: {idea.get('main_image', 'N/A')}",
-                f"Text: {idea.get('text', 'N/A')}",
-                f"Elements: {idea.get('additional_elements', 'N/A')}"
-             ])
-
              card_items.append(
                 Div(
                     H4(f"Idea {i+1}", cls="text-md font-bold mb-2 text-center text-blue-700"),
-                    P(f"{idea.get('text', 'N/A')}", cls="text-center text-sm mb-1 font-semibold max-h-24 overflow-auto whitespace-pre-wrap"), # Scrollable with max height
-                    P(f"Image: {idea.get('main_image', 'N/A')}", cls="text-center text-xs text-gray-600 mb-3 max-h-24 overflow-auto whitespace-pre-wrap"), # Scrollable with max height
+                    P(f"{idea.text or 'N/A'}", cls="text-center text-sm mb-1 font-semibold max-h-24 overflow-auto whitespace-pre-wrap"), # Scrollable with max height
+                    P(f"Image: {idea.main_image or 'N/A'}", cls="text-center text-xs text-gray-600 mb-3 max-h-24 overflow-auto whitespace-pre-wrap"), # Scrollable with max height
                     # Copy button and status (using component)
-                    create_copy_button(text_id=idea_id_target),
-                    Div(copy_text, id=idea_id_target, cls="hidden"), # Hidden content for copy
+                    create_copy_button(copy_text=copy_text_attrs("item", i)),
                     cls="p-4 bg-white rounded shadow border border-gray-200 flex flex-col justify-between"
                 )
              )
@@ -100,7 +101,7 @@ class ThumbnailResultsHandler(BaseResultsHandler):
         )
 
     def create_copy_all_view(self):
-        """Create the copy-all view using formatted 'titles'."""
+        """Create the copy-all view (the ideas formatted as by the tool)."""
         view_id = "copy-view"
         classes = "mb-6"
         if self.active_tab_id != "copy":
@@ -108,30 +109,32 @@ class ThumbnailResultsHandler(BaseResultsHandler):
 
         return Div(
             H3("All Ideas (Formatted Text)", cls="text-lg font-semibold mb-3"),
+            # Filled in by tool-results.js from the results data
             Textarea(
-                self.all_content_text, # Use pre-formatted text from 'titles'
+                "",
                 id="copy-all-ideas-textarea", # Unique ID
                 rows=15,
                 readonly=True,
-                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50"
+                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50",
+                **copy_text_attrs("all")
             ),
              Button(
                 "Copy All Formatted Text", type="button",
                 cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mt-2 mr-2",
-                **{'data-copy-target': 'copy-all-ideas-textarea', 'data-copy-type': 'textarea'}
+                **copy_text_attrs("all")
             ),
             P("", cls="copy-status text-green-600 inline-block"),
             id=view_id,
             cls=classes
         )
 
-    def create_views(self):
-        """Create all views for the thumbnail results."""
-        return Div(
-            self.create_list_view(),
-            self.create_card_view(),
-            self.create_copy_all_view()
-        )
+    def get_tab_views(self):
+        """Map each tab of the thumbnail results to its view."""
+        return {
+            "list": self.create_list_view,
+            "card": self.create_card_view,
+            "copy": self.create_copy_all_view,
+        }
 
     def create_tabs(self):
         """Create tabs for the thumbnail results."""
@@ -140,7 +143,7 @@ class ThumbnailResultsHandler(BaseResultsHandler):
             {"id": "card", "label": "Card View", "selected": self.active_tab_id == "card"},
             {"id": "copy", "label": "Copy Formatted", "selected": self.active_tab_id == "copy"}
         ]
-        return create_tab_navigation(tabs_config)
+        return self.build_tab_navigation(tabs_config)
 
 
     def render(self):
@@ -149,10 +152,12 @@ class ThumbnailResultsHandler(BaseResultsHandler):
             H1(f"{self.tool.name} Results", cls="text-3xl font-bold text-gray-800 mb-2 text-center"),
             P("Here are your generated thumbnail ideas:", cls="text-xl text-gray-600 mb-8 text-center"),
             Div(
+                self.create_warnings_section(),
                 self.create_metadata_section(),
                 self.create_tabs(),
                 self.create_views(),
                 self.create_navigation_buttons(),
+                self.create_results_data(), # Source of every copied text
                 create_tab_switching_script(), # Link the main JS file
                 cls="max-w-4xl mx-auto bg-white p-6 rounded-lg shadow-md border border-gray-200", # Increased width
                 id="results-container" # Crucial ID for JS targeting
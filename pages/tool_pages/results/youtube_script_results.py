@@ -2,7 +2,7 @@
 from fasthtml.common import *
 import re
 from .base_results import BaseResultsHandler
-from .components import create_tab_navigation, create_copy_button, create_tab_switching_script
+from .components import create_copy_button, copy_text_attrs, create_tab_switching_script
 
 class YoutubeScriptResultsHandler(BaseResultsHandler):
     """Handler for YouTube script tool results using structured data."""
@@ -10,30 +10,37 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
     def __init__(self, tool_id, tool, results):
         """Initialize using structured results."""
         super().__init__(tool_id, tool, results)
-        # Extract structured data provided by the factory
-        self.script_content = results.get("script", "Script not generated.")
-        self.hooks_list = results.get("hooks", [])
-        self.bias_list = results.get("input_bias", [])
-        self.questions_list = results.get("open_loop_questions", [])
-        # 'titles' is the formatted string list for copy-all
-        self.all_content_text = "\n".join(self.titles)
+        # Read straight from the validated YoutubeScriptOutput model provided by the factory
+        script = self.structured
+        self.script_content = script.script or "Script not generated."
+        self.hooks_list = script.hooks
+        self.bias_list = script.input_bias
+        self.questions_list = script.open_loop_questions
         self.active_tab_id = "script" # Default active tab
 
-    def _create_list_section(self, title, items, item_prefix, section_id_prefix):
-        """Helper to create a list section with copy buttons."""
+    def get_results_data(self):
+        """Return the script and its lists; tool-results.js builds the item and copy-all texts."""
+        return {
+            "kind": "script",
+            "script": self.structured.script,
+            "hooks": self.hooks_list,
+            "bias": self.bias_list,
+            "questions": self.questions_list,
+        }
+
+    def _create_list_section(self, title, items, item_prefix, source):
+        """Helper to create a list section with copy buttons ('source' names the list in the results data)."""
         if not items:
             return P(f"No {title.lower()} generated.", cls="text-gray-500")
 
         item_elements = []
         for i, item in enumerate(items):
             item_text = re.sub(r'^\d+\.\s*', '', item).strip() # Clean numbering
-            item_id_target = f"{section_id_prefix}-content-{i}"
             item_elements.append(
                 Div(
                     P(f"{item_prefix}{item_text}", cls="mb-2 whitespace-pre-wrap text-sm"),
-                    # Copy button component
-                    create_copy_button(text_id=item_id_target),
-                    Div(item_text, id=item_id_target, cls="hidden"), # Hidden source
+                    # Copy button component (copies the cleaned item, built from the results data)
+                    create_copy_button(copy_text=copy_text_attrs("item", i, source)),
                     cls="p-3 bg-white rounded shadow-sm border border-gray-200"
                 )
             )
@@ -62,12 +69,10 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
             Button(
                 "Copy Script", type="button",
                 cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mr-2",
-                # Target the hidden div containing the raw script text
-                **{'data-copy-target': 'script-content-source'}
+                # The script text comes from the results data
+                **copy_text_attrs("script")
             ),
             P("", cls="copy-status text-green-600 inline-block"),
-            # Hidden div containing the raw script text for copying
-            Div(self.script_content, id="script-content-source", cls="hidden"),
             id=view_id,
             cls=classes
         )
@@ -80,7 +85,7 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
              classes += " hidden"
 
         return Div(
-            self._create_list_section("Compelling Hooks", self.hooks_list, "Hook: ", "hook"),
+            self._create_list_section("Compelling Hooks", self.hooks_list, "Hook: ", "hooks"),
             id=view_id,
             cls=classes
         )
@@ -106,13 +111,13 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
              classes += " hidden"
 
         return Div(
-            self._create_list_section("Open Loop Questions", self.questions_list, "Q: ", "question"),
+            self._create_list_section("Open Loop Questions", self.questions_list, "Q: ", "questions"),
             id=view_id,
             cls=classes
         )
 
     def create_copy_all_view(self):
-        """Create the copy-all view using formatted 'titles'."""
+        """Create the copy-all view (the output formatted as by the tool)."""
         view_id = "copy-view"
         classes = "mb-6"
         if self.active_tab_id != "copy":
@@ -120,32 +125,34 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
 
         return Div(
             H3("Complete Output (Formatted Text)", cls="text-lg font-semibold mb-3"),
+            # Filled in by tool-results.js from the results data
             Textarea(
-                self.all_content_text,
+                "",
                 id="copy-all-script-textarea", # Unique ID
                 rows=20, # Make it taller for scripts
                 readonly=True,
-                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50"
+                cls="w-full p-3 border rounded font-mono text-sm bg-gray-50",
+                **copy_text_attrs("all")
             ),
             Button(
                 "Copy All Formatted Text", type="button",
                 cls="copy-button bg-blue-600 hover:bg-blue-700 text-white font-bold py-2 px-4 rounded mt-2 mr-2",
-                **{'data-copy-target': 'copy-all-script-textarea', 'data-copy-type': 'textarea'}
+                **copy_text_attrs("all")
             ),
             P("", cls="copy-status text-green-600 inline-block"),
             id=view_id,
             cls=classes
         )
 
-    def create_views(self):
-        """Create all views for the YouTube script results."""
-        return Div(
-            self.create_script_view(),
-            self.create_hooks_view(),
-            self.create_bias_view(),
-            self.create_questions_view(),
-            self.create_copy_all_view()
-        )
+    def get_tab_views(self):
+        """Map each tab of the YouTube script results to its view."""
+        return {
+            "script": self.create_script_view,
+            "hooks": self.create_hooks_view,
+            "bias": self.create_bias_view,
+            "questions": self.create_questions_view,
+            "copy": self.create_copy_all_view,
+        }
 
     def create_tabs(self):
         """Create tabs for the YouTube script results."""
@@ -156,7 +163,7 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
             {"id": "questions", "label": "Questions", "selected": self.active_tab_id == "questions"},
             {"id": "copy", "label": "Copy Formatted", "selected": self.active_tab_id == "copy"}
         ]
-        return create_tab_navigation(tabs_config)
+        return self.build_tab_navigation(tabs_config)
 
     def render(self):
         """Render the YouTube script results page."""
@@ -164,10 +171,12 @@ class YoutubeScriptResultsHandler(BaseResultsHandler):
             H1(f"{self.tool.name} Results", cls="text-3xl font-bold text-gray-800 mb-2 text-center"),
             P("Here is your generated YouTube script content:", cls="text-xl text-gray-600 mb-8 text-center"),
             Div(
+                self.create_warnings_section(),
                 self.create_metadata_section(),
                 self.create_tabs(),
                 self.create_views(),
                 self.create_navigation_buttons(),
+                self.create_results_data(), # Source of every copied text
                 create_tab_switching_script(), # Link the main JS file
                 cls="max-w-4xl mx-auto bg-white p-6 rounded-lg shadow-md border border-gray-200", # Wider
                 id="results-container" # Crucial ID for JS targeting
@@ -1,6 +1,7 @@
 from fasthtml.common import *
 from fasthtml.components import NotStr
 from tools import get_tool_by_id
+from config import STREAMING_ENABLED
 
 def create_form_field(field_id, field_config):
     """Create a form field based on configuration."""
@@ -141,6 +142,11 @@ def tool_page(tool_id):
         )
     )
 
+    # Let tool-stream.js post the form to the SSE endpoint when the tool can stream
+    form_attrs = {}
+    if STREAMING_ENABLED and tool.supports_streaming:
+        form_attrs["data-stream-url"] = f"/tools/{tool_id}/stream"
+
     return Div(
         # Page header with icon
         Div(
@@ -161,7 +167,24 @@ def tool_page(tool_id):
                 method="post",
                 id="tool-form",
                 onsubmit="return showLoading();",
-                cls="bg-white p-6 rounded-lg shadow-md"
+                cls="bg-white p-6 rounded-lg shadow-md",
+                **form_attrs
+            ),
+            # Live output shown while a streamed generation is running
+            Div(
+                Div(
+                    Div(cls="w-5 h-5 rounded-full border-2 border-blue-600 border-t-transparent animate-spin mr-3"),
+                    P("Generating...", cls="text-blue-600 font-semibold"),
+                    id="stream-status",
+                    cls="flex items-center mb-3"
+                ),
+                # Shown when the stream fails after output arrived; the partial output stays
+                Div(id="stream-error", cls="hidden mb-3 p-3 bg-red-50 border border-red-300 text-red-800 rounded", role="alert"),
+                Pre(id="stream-output", cls="whitespace-pre-wrap font-mono text-sm text-gray-700 max-h-96 overflow-y-auto"),
+                # Completed items replace the raw output as soon as the first one arrives
+                Div(id="stream-items", cls="hidden space-y-3"),
+                id="stream-preview",
+                cls="hidden mt-6 bg-white p-6 rounded-lg shadow-md border border-gray-200"
             ),
             # Loading overlay
             Div(
@@ -182,6 +205,9 @@ def tool_page(tool_id):
         # Tool benefits section
         get_tool_benefits_section(tool),
 
+        # Streams results over SSE when the form has a data-stream-url
+        Script(src="/static/js/tool-stream.js", defer=True),
+
         # JavaScript for loading state
         Script("""
             function showLoading() {
@@ -39,44 +39,193 @@ function switchTab(targetTabId) {
     if (targetButton) {
         targetButton.classList.remove('bg-gray-200', 'text-gray-700');
         targetButton.classList.add('bg-white', 'text-blue-600', 'font-bold');
+        // Lazy tabs load their view the first time they are opened
+        if (targetButton.dataset.tabUrl) loadTabView(targetButton, targetTabId);
     } else {
         console.warn(`Tab button with ID 'tab-${targetTabId}' not found.`);
     }
 }
 
 /**
- * Copies text to the clipboard and provides feedback.
- * @param {HTMLElement} copyButton - The button element that was clicked.
+ * Replaces a lazy tab's placeholder with its view, fetched from the tab's URL.
+ * The fragment also carries the results data when the page was rendered without it.
+ * @param {HTMLButtonElement} button - The tab button, with its data-tab-url.
+ * @param {string} tabId - The tab's ID (its view is '<tabId>-view').
  */
-async function copyToClipboard(copyButton) {
-    const targetId = copyButton.dataset.copyTarget;
-    const copyType = copyButton.dataset.copyType || 'element'; // Default to 'element' if type not specified
-    const statusElement = copyButton.nextElementSibling; // Assumes status <p> is the immediate next sibling
+async function loadTabView(button, tabId) {
+    const url = button.dataset.tabUrl;
+    // Load once; restored below if the request fails, so another click retries
+    delete button.dataset.tabUrl;
+    try {
+        const response = await fetch(url);
+        if (!response.ok) throw new Error(`Loading the tab failed with status ${response.status}`);
+        const fragment = document.createElement('template');
+        fragment.innerHTML = await response.text();
 
-    if (!targetId) {
-        console.error("Copy target ID not found in button's data-copy-target attribute.");
-        if (statusElement) statusElement.textContent = "Error: No target!";
-        return;
+        const data = fragment.content.getElementById('results-data');
+        const pageData = document.getElementById('results-data');
+        if (data && pageData) pageData.replaceWith(data);
+
+        const view = fragment.content.getElementById(`${tabId}-view`);
+        const placeholder = document.getElementById(`${tabId}-view`);
+        if (!view || !placeholder) return;
+        placeholder.replaceWith(view);
+        fillCopyTextareas(view);
+        // The view arrives visible; keep it hidden if the user has moved on to another tab
+        const activeButton = document.querySelector('#results-container button[id^="tab-"].bg-white');
+        if (activeButton && activeButton !== button) view.classList.add('hidden');
+    } catch (err) {
+        console.error('Could not load the tab:', err);
+        button.dataset.tabUrl = url;
     }
+}
 
-    const targetElement = document.getElementById(targetId);
+// --- Copied texts, built from the results data ---
+// Results pages embed the result once as JSON (<script id="results-data">);
+// copy buttons and copy-all textareas name the text they need with
+// data-copy-text (plus data-copy-index / data-copy-source for single items).
 
-    if (!targetElement) {
-        console.error(`Target element with ID '${targetId}' not found.`);
-        if (statusElement) statusElement.textContent = "Error: Target missing!";
-        return;
+const orNA = value => value || 'N/A';
+
+// Items are shown and copied without leading numbering ("1. ")
+const stripNumbering = text => text.replace(/^\d+\.\s*/, '').trim();
+
+/**
+ * Formats one thumbnail idea for copying.
+ * @param {Object} idea - An idea from the results data.
+ * @returns {string}
+ */
+function formatThumbnailIdea(idea) {
+    return [
+        `Background: ${orNA(idea.background)}`,
+        `Main Image: ${orNA(idea.main_image)}`,
+        `Text: ${orNA(idea.text)}`,
+        `Elements: ${orNA(idea.additional_elements)}`
+    ].join('\n');
+}
+
+/**
+ * Text builders per kind of results data (see get_results_data in the results
+ * handlers). Copy-all texts match the tool's formatted output
+ * (_format_structured_titles in tools/core/factory.py), without empty lines.
+ */
+const COPY_TEXT_BUILDERS = {
+    lines: {
+        all: data => data.lines.join('\n'),
+        item: (data, index) => data.lines[index],
+    },
+    thumbnails: {
+        // The tool's formatted output covers the first 5 ideas
+        all: data => data.ideas.slice(0, 5).flatMap((idea, i) => [
+            `**Thumbnail Idea ${i + 1}:**`,
+            `- **Background:** ${orNA(idea.background)}`,
+            `- **Main Image:** ${orNA(idea.main_image)}`,
+            `- **Text:** ${orNA(idea.text)}`,
+            `- **Elements:** ${orNA(idea.additional_elements)}`,
+            '---'
+        ]).join('\n'),
+        item: (data, index) => formatThumbnailIdea(data.ideas[index]),
+    },
+    script: {
+        all: data => [
+            '### SCRIPT:', data.script, '---',
+            '### HOOKS:', ...data.hooks.map(hook => `- ${hook}`), '---',
+            '### INPUT BIAS:', ...data.bias.map(bias => `- ${bias}`), '---',
+            '### OPEN LOOP QUESTIONS:', ...data.questions.map(question => `- ${question}`)
+        ].filter(line => line && line.trim()).join('\n'),
+        script: data => data.script || 'Script not generated.',
+        item: (data, index, source) => stripNumbering(data[source][index]),
+    },
+    transformation: {
+        all: data => data.transformed_text,
+    },
+};
+
+/**
+ * Parses the page's embedded results data.
+ * @returns {Object|null} The data, or null if the page has none.
+ */
+function readResultsData() {
+    const dataElement = document.getElementById('results-data');
+    // Empty until a lazily loaded tab brings the data
+    if (!dataElement || !dataElement.textContent.trim()) return null;
+    try {
+        return JSON.parse(dataElement.textContent);
+    } catch (err) {
+        console.error('Could not parse the results data:', err);
+        return null;
+    }
+}
+
+/**
+ * Builds the text an element's data-copy-* attributes ask for.
+ * @param {HTMLElement} element - A copy button or copy-all textarea.
+ * @param {Object|null} data - The results data (read from the page if omitted).
+ * @returns {string}
+ */
+function buildCopyText(element, data = readResultsData()) {
+    const builders = data ? COPY_TEXT_BUILDERS[data.kind] : null;
+    const build = builders ? builders[element.dataset.copyText] : null;
+    if (!build) {
+        console.warn(`No copy text '${element.dataset.copyText}' for these results.`);
+        return '';
     }
+    const index = element.dataset.copyIndex === undefined ? undefined : Number(element.dataset.copyIndex);
+    return build(data, index, element.dataset.copySource) || '';
+}
 
+/**
+ * Fills the copy-all textareas under an element from the results data.
+ * @param {HTMLElement} root - The results container (or a freshly loaded tab).
+ */
+function fillCopyTextareas(root) {
+    const textareas = root.querySelectorAll('textarea[data-copy-text]');
+    if (!textareas.length) return;
+    const data = readResultsData();
+    textareas.forEach(textarea => {
+        textarea.value = buildCopyText(textarea, data);
+    });
+}
+
+/**
+ * Copies text to the clipboard and provides feedback.
+ * @param {HTMLElement} copyButton - The button element that was clicked.
+ */
+async function copyToClipboard(copyButton) {
+    const statusElement = copyButton.nextElementSibling; // Assumes status <p> is the immediate next sibling
     let textToCopy = '';
-    if (copyType === 'textarea' || targetElement.tagName === 'TEXTAREA' || targetElement.tagName === 'INPUT') {
-        textToCopy = targetElement.value;
+
+    if (copyButton.dataset.copyText) {
+        // Built from the results data
+        textToCopy = buildCopyText(copyButton);
     } else {
-        // Use textContent for divs/paragraphs to get raw text without HTML
-        textToCopy = targetElement.textContent;
+        const targetId = copyButton.dataset.copyTarget;
+        const copyType = copyButton.dataset.copyType || 'element'; // Default to 'element' if type not specified
+
+        if (!targetId) {
+            console.error("Copy target ID not found in button's data-copy-target attribute.");
+            if (statusElement) statusElement.textContent = "Error: No target!";
+            return;
+        }
+
+        const targetElement = document.getElementById(targetId);
+
+        if (!targetElement) {
+            console.error(`Target element with ID '${targetId}' not found.`);
+            if (statusElement) statusElement.textContent = "Error: Target missing!";
+            return;
+        }
+
+        if (copyType === 'textarea' || targetElement.tagName === 'TEXTAREA' || targetElement.tagName === 'INPUT') {
+            textToCopy = targetElement.value;
+        } else {
+            // Use textContent for divs/paragraphs to get raw text without HTML
+            textToCopy = targetElement.textContent;
+        }
     }
 
     if (!textToCopy) {
-        console.warn(`No text found to copy from target '${targetId}'.`);
+        console.warn('No text found to copy.');
         if (statusElement) statusElement.textContent = "Nothing to copy!";
         setTimeout(() => {
             if (statusElement) statusElement.textContent = "";
@@ -100,7 +249,10 @@ async function copyToClipboard(copyButton) {
 }
 
 // --- Event Listener Setup ---
-document.addEventListener('DOMContentLoaded', () => {
+/**
+ * Wires up copy buttons and the initial tab for the results container.
+ */
+function initResultsPage() {
     const resultsContainer = document.getElementById('results-container');
 
     if (resultsContainer) {
@@ -114,6 +266,9 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         });
 
+        // Copy-all textareas are rendered empty and filled from the results data
+        fillCopyTextareas(resultsContainer);
+
         // Add delegated event listener for tab buttons (alternative to inline onclick)
         // Note: This assumes your tab buttons have a common class like 'tab-button'
         // If using inline onclick="switchTab(...)", this part is not strictly necessary
@@ -169,7 +324,14 @@ document.addEventListener('DOMContentLoaded', () => {
     if (submitButton) {
         submitButton.disabled = false;
     }
-});
+}
+
+// Results streamed into an already-loaded page load this script after DOMContentLoaded
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initResultsPage);
+} else {
+    initResultsPage();
+}
 
 // Additional handling for browser back/forward navigation
 window.addEventListener('popstate', function() {
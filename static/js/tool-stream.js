@@ -0,0 +1,181 @@
+// static/js/tool-stream.js
+
+/**
+ * Parses Server-Sent Event frames out of a growing text buffer.
+ * @param {string} buffer - Text received so far that has not been parsed yet.
+ * @returns {{events: Array<{event: string, data: string}>, rest: string}}
+ */
+function parseSseFrames(buffer) {
+    const events = [];
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let eventName = 'message';
+        const dataLines = [];
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                eventName = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trimStart());
+            }
+        });
+        events.push({ event: eventName, data: dataLines.join('\n') });
+        boundary = buffer.indexOf('\n\n');
+    }
+    return { events, rest: buffer };
+}
+
+/**
+ * Replaces the page content with server-rendered HTML, running any scripts it contains.
+ * @param {string} html - The rendered results (or error) content.
+ * @param {string} title - The new document title.
+ */
+function swapPageContent(html, title) {
+    const pageContent = document.getElementById('page-content');
+    if (!pageContent) return false;
+
+    pageContent.innerHTML = html;
+    // Scripts inserted through innerHTML do not run, so re-create them
+    pageContent.querySelectorAll('script').forEach(oldScript => {
+        const newScript = document.createElement('script');
+        Array.from(oldScript.attributes).forEach(attr => newScript.setAttribute(attr.name, attr.value));
+        newScript.textContent = oldScript.textContent;
+        oldScript.replaceWith(newScript);
+    });
+    if (title) document.title = title;
+    window.scrollTo(0, 0);
+    return true;
+}
+
+/**
+ * Builds the text shown for an "error" event.
+ * @param {{code: ?string, status: ?number, retry_after: ?number, message: string}} payload - The event data.
+ * @returns {string}
+ */
+function streamErrorMessage(payload) {
+    let message = `An error occurred: ${payload.message}`;
+    if (payload.retry_after != null) {
+        message += ` Please try again in ${payload.retry_after} seconds.`;
+    }
+    return message;
+}
+
+/**
+ * Stops the live preview and shows an error above the output received so far.
+ * @param {string} message - What went wrong, for the user.
+ */
+function showStreamError(message) {
+    const status = document.getElementById('stream-status');
+    const error = document.getElementById('stream-error');
+    const submitButton = document.getElementById('submit-button');
+
+    if (status) status.classList.add('hidden');
+    if (error) {
+        error.textContent = message;
+        error.classList.remove('hidden');
+    }
+    if (submitButton) submitButton.disabled = false;
+}
+
+/**
+ * Streams a tool form submission and renders tokens as they arrive.
+ * Falls back to the regular form POST if the stream fails before any event
+ * arrives; after that, the error is shown and the partial output kept, so a
+ * dropped connection never pays for a second generation.
+ * @param {HTMLFormElement} form - The tool form.
+ */
+async function streamToolForm(form) {
+    const preview = document.getElementById('stream-preview');
+    const output = document.getElementById('stream-output');
+    const items = document.getElementById('stream-items');
+    const loadingOverlay = document.getElementById('loading-overlay');
+    const status = document.getElementById('stream-status');
+    const error = document.getElementById('stream-error');
+    let received = false;
+    let hasOutput = false;
+
+    // Show the live preview instead of the blocking overlay
+    if (loadingOverlay) loadingOverlay.classList.add('hidden');
+    if (preview) preview.classList.remove('hidden');
+    if (output) output.textContent = '';
+    if (items) items.innerHTML = '';
+    if (status) status.classList.remove('hidden');
+    if (error) error.classList.add('hidden');
+
+    try {
+        const response = await fetch(form.dataset.streamUrl, {
+            method: 'POST',
+            body: new FormData(form),
+            headers: { 'Accept': 'text/event-stream' }
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Streaming request failed with status ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            const parsed = parseSseFrames(buffer);
+            buffer = parsed.rest;
+            for (const message of parsed.events) {
+                received = true;
+                const payload = JSON.parse(message.data);
+                if (message.event === 'token') {
+                    hasOutput = true;
+                    if (output) {
+                        output.textContent += payload;
+                        output.scrollTop = output.scrollHeight;
+                    }
+                } else if (message.event === 'item') {
+                    hasOutput = true;
+                    // Show rendered items in place of the raw output
+                    if (items) {
+                        if (output) output.classList.add('hidden');
+                        items.classList.remove('hidden');
+                        items.insertAdjacentHTML('beforeend', payload.html);
+                    }
+                } else if (message.event === 'done') {
+                    if (swapPageContent(payload.html, payload.title)) return;
+                } else if (message.event === 'error') {
+                    // Keep any partial output; otherwise show the error page the POST route would
+                    if (hasOutput || !swapPageContent(payload.html, payload.title)) {
+                        showStreamError(streamErrorMessage(payload));
+                    }
+                    return;
+                }
+            }
+        }
+        throw new Error('Stream ended without a result');
+    } catch (err) {
+        if (received) {
+            console.error('Streaming failed after output arrived:', err);
+            showStreamError('The connection was interrupted before the results were complete. The output so far is shown below.');
+            return;
+        }
+        console.error('Streaming failed, falling back to a regular submit:', err);
+        if (preview) preview.classList.add('hidden');
+        if (loadingOverlay) loadingOverlay.classList.remove('hidden');
+        // form.submit() skips the submit handlers, so this is a plain POST
+        form.submit();
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const form = document.getElementById('tool-form');
+    const canStream = window.fetch && window.ReadableStream && window.TextDecoder;
+
+    if (form && form.dataset.streamUrl && canStream) {
+        form.addEventListener('submit', (event) => {
+            event.preventDefault();
+            streamToolForm(form);
+        });
+    }
+});
@@ -0,0 +1,25 @@
+"""
+Point the app at the stub LLM server (benchmarks/stub_llm.py) for every test.
+
+config.py reads the environment once, on first import, and test modules import
+the app while they are collected, so this runs before any of them.
+"""
+import os
+import socket
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# Port the stub server is started on by the tests that need it
+STUB_PORT = _free_port()
+
+# The cache would otherwise answer repeated requests without calling the stub
+os.environ.update(
+    OPENROUTER_BASE_URL=f"http://127.0.0.1:{STUB_PORT}/v1",
+    OPENROUTER_API_KEY="stub",
+    DEFAULT_MODEL="stub/model",
+    MODEL_QUALITY_TIERS="stub/model=premium",
+    GENERATION_CACHE_ENABLED="false",
+)
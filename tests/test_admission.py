@@ -0,0 +1,126 @@
+"""Admission control: concurrency caps, the FIFO queue, its limits, and the 503 clients get when rejected."""
+import asyncio
+
+import pytest
+
+import main
+from tools.core.admission import AdmissionController
+from tools.core.base import BaseTool
+from tools.core.deadline import deadline_after
+from tools.errors import ErrorCode, ToolError
+
+async def _hold(controller, tool_id, release, admitted):
+    """Take a slot for tool_id, note the admission, and keep the slot until released."""
+    async with controller.admit(tool_id):
+        admitted.append(tool_id)
+        await release.wait()
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+def test_global_cap_queues_the_rest():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_in_flight_per_tool=0)
+        release, admitted = asyncio.Event(), []
+        tasks = [asyncio.create_task(_hold(controller, f"tool{n}", release, admitted)) for n in range(3)]
+        await _settle()
+        stats = controller.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        return controller, admitted, stats
+
+    controller, admitted, stats = asyncio.run(scenario())
+
+    assert (stats["in_flight"], stats["queue_depth"]) == (2, 1)
+    assert admitted == ["tool0", "tool1", "tool2"]
+    assert controller.in_flight == 0
+
+def test_per_tool_cap_does_not_hold_up_other_tools():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=0, max_in_flight_per_tool=1)
+        release, admitted = asyncio.Event(), []
+        tasks = [asyncio.create_task(_hold(controller, tool_id, release, admitted)) for tool_id in ("a", "a", "b")]
+        await _settle()
+        early = list(admitted)
+        release.set()
+        await asyncio.gather(*tasks)
+        return early, admitted
+
+    early, admitted = asyncio.run(scenario())
+
+    # The second "a" waits behind the first; "b" gets its own slot
+    assert early == ["a", "b"]
+    assert admitted == ["a", "b", "a"]
+
+def test_queue_is_served_in_arrival_order():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_in_flight_per_tool=0)
+        gates = [asyncio.Event() for _ in range(4)]
+        admitted = []
+        tasks = []
+        for n, gate in enumerate(gates):
+            tasks.append(asyncio.create_task(_hold(controller, f"tool{n}", gate, admitted)))
+            await _settle()
+        # Free the slots one at a time
+        for gate in gates:
+            gate.set()
+            await _settle()
+        await asyncio.gather(*tasks)
+        return admitted
+
+    assert asyncio.run(scenario()) == ["tool0", "tool1", "tool2", "tool3"]
+
+def test_full_queue_rejects_at_once():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, retry_after=9)
+        release, admitted = asyncio.Event(), []
+        tasks = [asyncio.create_task(_hold(controller, "tool", release, admitted)) for _ in range(2)]
+        await _settle()
+        try:
+            async with controller.admit("tool"):
+                pass
+        finally:
+            release.set()
+            await asyncio.gather(*tasks)
+
+    with pytest.raises(ToolError) as excinfo:
+        asyncio.run(scenario())
+
+    assert excinfo.value.code is ErrorCode.OVERLOADED
+    assert excinfo.value.details == {"reason": "queue_full", "retry_after": 9}
+
+def test_queue_timeout_rejects_as_overloaded():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, queue_timeout=0.01)
+        controller.in_flight = 1
+        try:
+            async with controller.admit("tool"):
+                pass
+        finally:
+            assert controller.stats()["queue_depth"] == 0
+            assert controller.rejected_timeout == 1
+
+    with pytest.raises(ToolError) as excinfo:
+        asyncio.run(scenario())
+
+    assert excinfo.value.code is ErrorCode.OVERLOADED
+    assert excinfo.value.details["reason"] == "queue_timeout"
+
+def test_request_deadline_while_queued_is_a_timeout():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, queue_timeout=10)
+        controller.in_flight = 1
+        async with controller.admit("tool", deadline_after(0.01)):
+            pass
+
+    with pytest.raises(ToolError) as excinfo:
+        asyncio.run(scenario())
+
+    assert excinfo.value.code is ErrorCode.TIMEOUT
+
+def test_overloaded_maps_to_503_with_retry_after():
+    controller = AdmissionController(retry_after=7)
+    result = BaseTool.error_result(controller._overloaded("queue_full"))
+
+    assert main.error_status(result) == (503, {"Retry-After": "7"})
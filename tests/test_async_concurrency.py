@@ -0,0 +1,64 @@
+"""
+Concurrent /tools/{id}/process requests run on the async agent path.
+
+The app is pointed at the stub LLM server (benchmarks/stub_llm.py) with a
+fixed response delay. If anything on the request path blocked the event
+loop, N simultaneous requests would take about N times the delay; on the
+async path they finish in about one delay.
+"""
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+
+from conftest import STUB_PORT
+
+# Fixed upstream delay per request (no jitter, instant token output)
+STUB_DELAY_MS = 500
+CONCURRENT_REQUESTS = 8
+
+@pytest.fixture(scope="module")
+def app():
+    # conftest.py has already pointed config.py at STUB_PORT
+    from benchmarks.stub_llm import LatencyProfile, StubLLM, create_app
+    import main
+
+    profile = LatencyProfile(ttfb_ms=STUB_DELAY_MS, ttfb_jitter=0.0, tokens_per_second=0.0, error_rate=0.0, truncate_rate=0.0)
+    server = uvicorn.Server(uvicorn.Config(create_app(StubLLM(profile)), host="127.0.0.1", port=STUB_PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    yield main.app
+
+    server.should_exit = True
+    thread.join(timeout=5)
+
+async def _process(client: httpx.AsyncClient, topic: str) -> httpx.Response:
+    return await client.post(
+        "/tools/ai-title-generator/process",
+        data={"topic": topic, "platform": "YouTube", "style": "Funny"},
+    )
+
+async def _timed_requests(app, count: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+        started = time.perf_counter()
+        # Distinct topics, so single-flight doesn't merge them into one upstream call
+        responses = await asyncio.gather(*(_process(client, f"topic {time.time_ns()} {n}") for n in range(count)))
+        elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    assert all("Surprising Truths" in response.text for response in responses)
+    return elapsed
+
+def test_concurrent_process_requests_overlap(app):
+    single = asyncio.run(_timed_requests(app, 1))
+    concurrent = asyncio.run(_timed_requests(app, CONCURRENT_REQUESTS))
+
+    assert single >= STUB_DELAY_MS / 1000
+    # About one request's time (serial handling would take CONCURRENT_REQUESTS times as long)
+    assert concurrent < 2 * single
@@ -0,0 +1,93 @@
+"""Generation cache: LRU eviction, TTL expiry, key normalization and the SQLite tier."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from tools.core import cache as cache_module
+from tools.core.cache import GenerationCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's clock with one the test moves forward."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(time=lambda: now.value))
+    return now
+
+def test_evicts_least_recently_used():
+    async def scenario():
+        cache = GenerationCache(max_entries=2)
+        await cache.set("a", {"n": 1})
+        await cache.set("b", {"n": 2})
+        # Reading "a" makes "b" the least recently used
+        await cache.get("a")
+        await cache.set("c", {"n": 3})
+        return cache, [await cache.get(key) for key in ("a", "b", "c")]
+
+    cache, values = asyncio.run(scenario())
+
+    assert values == [{"n": 1}, None, {"n": 3}]
+    assert cache.evictions == 1
+
+def test_entries_expire_after_ttl(clock):
+    async def scenario():
+        cache = GenerationCache(ttl=60)
+        await cache.set("a", {"n": 1})
+        clock.value += 59
+        fresh = await cache.get("a")
+        clock.value += 2
+        return cache, fresh, await cache.get("a")
+
+    cache, fresh, expired = asyncio.run(scenario())
+
+    assert fresh == {"n": 1}
+    assert expired is None
+    assert cache.expirations == 1
+    assert cache.stats()["entries"] == 0
+
+def test_get_returns_a_fresh_copy():
+    async def scenario():
+        cache = GenerationCache()
+        await cache.set("a", {"items": [1]})
+        (await cache.get("a"))["items"].append(2)
+        return await cache.get("a")
+
+    assert asyncio.run(scenario()) == {"items": [1]}
+
+def test_make_key_ignores_whitespace_and_key_order():
+    parts = {"tool": "outline", "model": "stub/model"}
+    key = GenerationCache.make_key(parts, {"topic": "  remote   work ", "count": 5})
+
+    assert GenerationCache.make_key(dict(reversed(parts.items())), {"count": 5, "topic": "remote work"}) == key
+    assert GenerationCache.make_key(parts, {"topic": "remote work\n", "count": 5}) == key
+
+def test_make_key_changes_with_what_determines_the_output():
+    parts = {"tool": "outline", "model": "stub/model"}
+    key = GenerationCache.make_key(parts, {"topic": "remote work"})
+
+    assert GenerationCache.make_key(parts, {"topic": "Remote work"}) != key
+    assert GenerationCache.make_key({**parts, "model": "other/model"}, {"topic": "remote work"}) != key
+
+def test_sqlite_tier_survives_a_new_cache(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+
+    async def scenario():
+        await GenerationCache(db_path=db_path).set("a", {"n": 1})
+        # A new instance starts with an empty memory tier, like after a restart
+        restarted = GenerationCache(db_path=db_path)
+        return restarted, await restarted.get("a"), await restarted.get("a")
+
+    restarted, from_disk, from_memory = asyncio.run(scenario())
+
+    assert from_disk == from_memory == {"n": 1}
+    assert (restarted.disk_hits, restarted.hits, restarted.misses) == (1, 1, 0)
+
+def test_sqlite_tier_drops_expired_rows(tmp_path, clock):
+    db_path = str(tmp_path / "cache.db")
+
+    async def scenario():
+        await GenerationCache(ttl=60, db_path=db_path).set("a", {"n": 1})
+        clock.value += 61
+        return await GenerationCache(ttl=60, db_path=db_path).get("a")
+
+    assert asyncio.run(scenario()) is None
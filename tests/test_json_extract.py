@@ -0,0 +1,55 @@
+"""Finding the JSON in LLM output: fences, prose, brackets inside strings, and output that was cut off."""
+import json
+
+import pytest
+
+from tools.core.json_extract import extract_json, looks_truncated
+
+def test_fenced_output():
+    text = 'Here you go:\n```json\n{"titles": ["One", "Two"]}\n```\n'
+
+    assert extract_json(text) == '{"titles": ["One", "Two"]}'
+
+def test_prose_before_and_after():
+    text = 'Sure! {"ideas": [{"text": "a"}]} Let me know if you need more {ideas}.'
+
+    assert json.loads(extract_json(text)) == {"ideas": [{"text": "a"}]}
+
+def test_bracketed_prose_before_the_json_is_skipped():
+    assert extract_json('Fill in {name} and {topic}: {"a": 1}') == '{"a": 1}'
+    # "[1]" is a valid array, so only an objects-only search passes over it
+    assert extract_json('See note [1]: {"a": 1}', "{") == '{"a": 1}'
+
+def test_objects_only_skips_a_leading_array():
+    text = '["x"] then {"a": 1}'
+
+    assert extract_json(text, "[") == '["x"]'
+    assert extract_json(text, "{") == '{"a": 1}'
+
+def test_brackets_and_escaped_quotes_inside_strings():
+    value = {"title": 'He said "close }] now" \\', "points": ["[a]", "{b}", "\"{\""]}
+    text = "Result: " + json.dumps(value) + " done"
+
+    assert json.loads(extract_json(text)) == value
+
+def test_multiline_strings_and_nesting():
+    text = '{\n  "intro": "line one\\nline two",\n  "sections": [{"points": [[1, 2], []]}]\n}\ntrailing'
+
+    assert json.loads(extract_json(text)) == {"intro": "line one\nline two", "sections": [{"points": [[1, 2], []]}]}
+
+def test_first_of_several_values():
+    assert extract_json('{"a": 1} {"b": 2}') == '{"a": 1}'
+
+@pytest.mark.parametrize("text", [
+    '{"titles": ["One", "Tw',
+    '```json\n{"titles": ["One"',
+    '{"text": "ends with an escaped quote \\"',
+    '[{"a": 1}, {"b": ',
+])
+def test_unterminated_input_looks_truncated(text):
+    assert extract_json(text) is None
+    assert looks_truncated(text)
+
+@pytest.mark.parametrize("text", ["", "No JSON here.", "Pick [1] or {name}.", '{"a": 1}'])
+def test_complete_or_absent_json_is_not_truncated(text):
+    assert not looks_truncated(text)
@@ -0,0 +1,44 @@
+"""
+Response models accept the alternative field names LLMs use and merge them
+into the one list (or title) that is stored, dumped and shown in the prompt.
+"""
+import json
+
+from tools.implementations.models import BlogOutline, ThumbnailIdeas
+
+def test_outline_merges_every_section_list():
+    outline = BlogOutline.model_validate_json(json.dumps({
+        "main_sections": [{"title": "A"}],
+        "sections": [{"title": "B"}],
+        "outline_sections": [{"title": "C"}],
+    }))
+
+    assert [section.title for section in outline.main_sections] == ["A", "B", "C"]
+    assert set(outline.model_dump()) == {"introduction", "main_sections", "conclusion"}
+
+def test_outline_section_alternative_fields():
+    outline = BlogOutline.model_validate_json(json.dumps({"main_sections": [{
+        "title": "",
+        "heading": "Setup",
+        "points": ["Install"],
+        "subpoints": ["Configure", {"heading": "Advanced", "subpoints": ["Tune"]}, {"note": "no title"}],
+    }]}))
+
+    section = outline.main_sections[0]
+    assert section.title == "Setup"
+    assert section.points == ["Install", "Configure"]
+    assert [(sub.title, sub.points) for sub in section.subsections] == [("Advanced", ["Tune"])]
+    assert set(section.model_dump()) == {"title", "points", "subsections"}
+
+def test_thumbnail_ideas_merges_alternative_list():
+    ideas = ThumbnailIdeas.model_validate({"ideas": [{"text": "one"}], "thumbnail_ideas": [{"text": "two"}]})
+
+    assert [idea.text for idea in ideas.ideas] == ["one", "two"]
+    assert set(ideas.model_dump()) == {"ideas"}
+
+def test_alternative_names_stay_out_of_the_prompt_schema():
+    schema = BlogOutline.model_json_schema()
+
+    assert set(schema["properties"]) == {"introduction", "main_sections", "conclusion"}
+    assert set(schema["$defs"]["OutlineSection"]["properties"]) == {"title", "points", "subsections"}
+    assert set(ThumbnailIdeas.model_json_schema()["properties"]) == {"ideas"}
@@ -0,0 +1,38 @@
+"""Pre-rendered pages served through the compression middleware keep one validator."""
+from fasthtml.common import Div, P
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from pages.compression import CompressionMiddleware, ResponseCompressor
+from pages.prerender import PrerenderedPages
+
+def _client() -> TestClient:
+    # Big enough to be compressed
+    pages = PrerenderedPages(lambda: {"/": Div(*[P(f"Paragraph {n} of the page.") for n in range(200)])})
+    app = Starlette(routes=[Route("/", lambda request: pages.response(request, "/"))])
+    app.add_middleware(CompressionMiddleware, compressor=ResponseCompressor())
+    return TestClient(app)
+
+def test_conditional_get_returns_the_etag_of_the_compressed_page():
+    client = _client()
+
+    page = client.get("/", headers={"Accept-Encoding": "gzip"})
+    revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": page.headers["etag"]})
+
+    assert page.status_code == 200
+    assert page.headers["content-encoding"] == "gzip"
+    assert page.headers["etag"].startswith("W/")
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == page.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+def test_uncompressed_page_keeps_its_strong_etag():
+    client = _client()
+
+    page = client.get("/", headers={"Accept-Encoding": "identity"})
+    revalidated = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": page.headers["etag"]})
+
+    assert not page.headers["etag"].startswith("W/")
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == page.headers["etag"]
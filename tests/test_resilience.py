@@ -0,0 +1,179 @@
+"""Retries and hedging: which upstream errors are retried, the backoff, and how calls are retried and hedged."""
+import asyncio
+
+import httpx
+import openai
+import pytest
+from agno.exceptions import ModelProviderError
+
+from config import HEDGE_MIN_SAMPLES
+from tools.core.resilience import ResilientCaller, backoff_delay, classify_error
+from tools.errors import ErrorCode, ToolError
+
+def _status_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://openrouter.test/api/v1/chat/completions")
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return openai.APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+def _provider_error(cause=None):
+    """A ModelProviderError as Agno raises it, chained to the provider's exception."""
+    error = ModelProviderError("upstream failed")
+    error.__cause__ = cause
+    return error
+
+def _caller(**kwargs):
+    """A caller that retries without sleeping."""
+    return ResilientCaller(**{"base_delay": 0, "max_delay": 0, **kwargs})
+
+class FakeUpstream:
+    """Fails with the queued errors in turn, then answers with the model name."""
+
+    def __init__(self, *errors, delays=None):
+        self.errors = list(errors)
+        self.delays = delays or {}
+        self.calls = []
+
+    async def __call__(self, model_name):
+        self.calls.append(model_name)
+        await asyncio.sleep(self.delays.get(model_name, 0))
+        if self.errors:
+            raise self.errors.pop(0)
+        return f"answer from {model_name}"
+
+@pytest.mark.parametrize("status_code, expected", [
+    (429, ErrorCode.RATE_LIMIT),
+    (500, ErrorCode.API_ERROR),
+    (503, ErrorCode.API_ERROR),
+    (408, ErrorCode.API_ERROR),
+    (400, None),
+    (401, None),
+])
+def test_classifies_provider_status_errors(status_code, expected):
+    assert classify_error(_provider_error(_status_error(status_code))) == expected
+
+def test_classifies_connection_errors_as_retryable():
+    request = httpx.Request("POST", "https://openrouter.test")
+
+    assert classify_error(_provider_error(openai.APIConnectionError(request=request))) == ErrorCode.API_ERROR
+    assert classify_error(httpx.ConnectError("refused")) == ErrorCode.API_ERROR
+
+def test_provider_error_without_http_cause_is_final():
+    # Agno's default status of 502 is not a reason to retry
+    assert classify_error(_provider_error()) is None
+    assert classify_error(_provider_error(ValueError("bad schema"))) is None
+
+def test_non_http_errors_are_final():
+    assert classify_error(ValueError("bad input")) is None
+    assert classify_error(KeyError("missing")) is None
+    assert classify_error(ToolError(ErrorCode.TIMEOUT, "too slow")) is None
+    assert classify_error(ToolError(ErrorCode.RATE_LIMIT, "busy")) == ErrorCode.RATE_LIMIT
+
+def test_backoff_delay_grows_and_is_capped(monkeypatch):
+    # Full jitter draws from [0, cap]; take the top of the range
+    monkeypatch.setattr("tools.core.resilience.random.uniform", lambda low, high: high)
+
+    assert [backoff_delay(attempt, 0.5, 3.0) for attempt in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+def test_backoff_delay_is_jittered():
+    delays = {backoff_delay(3, 0.5, 8.0) for _ in range(50)}
+
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(delays) > 1
+
+def test_retries_retryable_errors_until_success():
+    caller = _caller(max_attempts=3)
+    upstream = FakeUpstream(_provider_error(_status_error(429)), _provider_error(_status_error(502)))
+
+    assert asyncio.run(caller.call(upstream, "stub/model")) == "answer from stub/model"
+    assert len(upstream.calls) == 3
+    assert caller.retries == 2
+
+def test_does_not_retry_final_errors():
+    caller = _caller(max_attempts=3)
+    upstream = FakeUpstream(_provider_error(_status_error(400)))
+
+    with pytest.raises(ModelProviderError):
+        asyncio.run(caller.call(upstream, "stub/model"))
+    assert len(upstream.calls) == 1
+
+def test_exhausted_rate_limit_carries_retry_after():
+    caller = _caller(max_attempts=2)
+    upstream = FakeUpstream(*(_provider_error(_status_error(429, {"Retry-After": "0"})) for _ in range(2)))
+
+    with pytest.raises(ToolError) as excinfo:
+        asyncio.run(caller.call(upstream, "stub/model"))
+
+    assert excinfo.value.code is ErrorCode.RATE_LIMIT
+    assert excinfo.value.details["retry_after"] == 0
+    assert excinfo.value.details["attempts"] == 2
+    assert caller.retry_exhausted == 1
+
+def test_exhausted_server_errors_become_api_error():
+    caller = _caller(max_attempts=2)
+    upstream = FakeUpstream(*(_provider_error(_status_error(500)) for _ in range(2)))
+
+    with pytest.raises(ToolError) as excinfo:
+        asyncio.run(caller.call(upstream, "stub/model"))
+
+    assert excinfo.value.code is ErrorCode.API_ERROR
+    assert "retry_after" not in excinfo.value.details
+
+def _hedging_caller(**kwargs):
+    """A hedging caller whose primary model has a recent p95 of 10ms."""
+    caller = _caller(hedge_enabled=True, hedge_min_delay=0.01, **kwargs)
+    for _ in range(HEDGE_MIN_SAMPLES):
+        caller.latency.record("slow/model", 0.01)
+    return caller
+
+def test_slow_call_is_hedged_to_the_fallback_model():
+    caller = _hedging_caller()
+    upstream = FakeUpstream(delays={"slow/model": 1.0})
+
+    result = asyncio.run(caller.call(upstream, "slow/model", fallback_model="fast/model"))
+
+    assert result == "answer from fast/model"
+    assert upstream.calls == ["slow/model", "fast/model"]
+    assert (caller.hedges, caller.hedge_wins) == (1, 1)
+
+def test_fast_call_is_not_hedged():
+    caller = _hedging_caller()
+    upstream = FakeUpstream()
+
+    assert asyncio.run(caller.call(upstream, "slow/model", fallback_model="fast/model")) == "answer from slow/model"
+    assert upstream.calls == ["slow/model"]
+    assert caller.hedges == 0
+
+def test_hedge_failure_waits_for_the_primary():
+    caller = _hedging_caller()
+    upstream = FakeUpstream(delays={"slow/model": 0.05})
+
+    async def fn(model_name):
+        # The primary is still running when the hedge fails
+        if model_name == "fast/model":
+            raise ValueError("hedge failed")
+        return await upstream(model_name)
+
+    assert asyncio.run(caller.call(fn, "slow/model", fallback_model="fast/model")) == "answer from slow/model"
+    assert (caller.hedges, caller.hedge_wins) == (1, 0)
+
+def test_stream_retries_only_before_the_first_chunk():
+    caller = _caller(max_attempts=3)
+    opened = []
+
+    async def open_stream(model_name):
+        opened.append(model_name)
+        if len(opened) == 1:
+            raise _provider_error(_status_error(503))
+        yield "a"
+        raise _provider_error(_status_error(503))
+
+    async def consume():
+        chunks = []
+        with pytest.raises(ModelProviderError):
+            async for chunk in caller.stream(open_stream, "stub/model"):
+                chunks.append(chunk)
+        return chunks
+
+    # The failure after "a" has reached the caller is not retried
+    assert asyncio.run(consume()) == ["a"]
+    assert len(opened) == 2
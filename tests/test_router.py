@@ -0,0 +1,43 @@
+"""Model routing: quality tiers and ranking of the candidate models."""
+import pytest
+
+from tools.core.router import ModelRouter
+
+def _router(models, tiers=None, **kwargs):
+    router = ModelRouter(default_models=models, model_tiers=tiers or {}, explore_rate=0.0, **kwargs)
+    router.configure_tool("script", quality_tier="premium")
+    return router
+
+def test_unmet_tier_warns_and_uses_all_candidates(caplog):
+    router = _router(["cheap/model"])
+
+    router.check()
+
+    assert "wants a 'premium' model" in caplog.text
+    assert router.eligible("script") == ["cheap/model"]
+
+def test_tier_filters_candidates_when_one_meets_it():
+    router = _router(["cheap/model", "good/model"], {"good/model": "premium"})
+
+    router.check()
+
+    assert router.eligible("script") == ["good/model"]
+
+@pytest.mark.parametrize("models, tiers", [([], {}), (["a/model"], {"a/model": "gold"})])
+def test_check_raises_without_models_or_on_unknown_tier(models, tiers):
+    with pytest.raises(RuntimeError):
+        _router(models, tiers).check()
+
+def test_ranks_by_throughput_not_latency():
+    router = _router(["short/model", "fast/model"], {"short/model": "premium", "fast/model": "premium"})
+    # Quicker calls, but only because the answers were short
+    router.record_success("short/model", 1.0, 50)
+    router.record_success("fast/model", 4.0, 2000)
+
+    assert router.ranked("script") == ["fast/model", "short/model"]
+
+def test_unmeasured_models_are_tried_first():
+    router = _router(["a/model", "b/model"], {"a/model": "premium", "b/model": "premium"})
+    router.record_success("a/model", 1.0, 1000)
+
+    assert router.ranked("script") == ["b/model", "a/model"]
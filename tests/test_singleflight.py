@@ -0,0 +1,126 @@
+"""Single-flight: identical concurrent calls share one upstream call, and leaving callers don't cancel it."""
+import asyncio
+
+import pytest
+
+from tools.core.singleflight import SingleFlight
+
+def _upstream(release: asyncio.Event):
+    """A coroutine function that counts its invocations and waits for release."""
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await release.wait()
+        return {"value": len(calls)}
+
+    return fn, calls
+
+def test_concurrent_calls_share_one_invocation():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        fn, calls = _upstream(release)
+        tasks = [asyncio.create_task(flight.do("key", fn)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        return flight, calls, await asyncio.gather(*tasks)
+
+    flight, calls, results = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()["upstream_calls"] == 1
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+def test_different_keys_do_not_share():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        release.set()
+        fn, calls = _upstream(release)
+        await asyncio.gather(flight.do("a", fn), flight.do("b", fn))
+        return calls
+
+    assert len(asyncio.run(scenario())) == 2
+
+def test_cancelled_subscriber_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        fn, calls = _upstream(release)
+        leaving, staying = (asyncio.create_task(flight.do("key", fn)) for _ in range(2))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return flight, calls, leaving, await staying
+
+    flight, calls, leaving, result = asyncio.run(scenario())
+
+    assert leaving.cancelled()
+    assert result == {"value": 1}
+    assert len(calls) == 1
+    assert flight.stats()["abandoned"] == 0
+
+def test_last_subscriber_leaving_cancels_the_call():
+    async def scenario():
+        flight = SingleFlight()
+        started, cancelled = asyncio.Event(), asyncio.Event()
+
+        async def fn():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        task = asyncio.create_task(flight.do("key", fn))
+        await started.wait()
+        task.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return flight
+
+    flight = asyncio.run(scenario())
+
+    assert flight.stats()["abandoned"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+def test_error_reaches_every_subscriber():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0)
+            raise ValueError("upstream failed")
+
+        return await asyncio.gather(*(flight.do("key", fn) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert [type(result) for result in results] == [ValueError] * 3
+
+@pytest.mark.parametrize("joiners", [1, 3])
+def test_stream_replays_earlier_events_to_late_joiners(joiners):
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def producer():
+            yield "token", "a"
+            await release.wait()
+            yield "token", "b"
+
+        async def collect():
+            return [payload async for _, payload in flight.stream("key", producer)]
+
+        leader = asyncio.create_task(collect())
+        await asyncio.sleep(0.01)
+        late = [asyncio.create_task(collect()) for _ in range(joiners)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(leader, *late)
+
+    assert asyncio.run(scenario()) == [["a", "b"]] * (joiners + 1)
@@ -0,0 +1,46 @@
+"""
+Errors on the streamed /tools/{id}/stream route.
+
+The stream is already a 200 when the tool fails, so the status and
+Retry-After the POST route would send travel in an "error" event.
+"""
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+import main
+from tools.core import base
+from tools.core.admission import AdmissionController
+
+FORM = {"topic": "streamed errors", "platform": "YouTube", "style": "Funny"}
+
+def _events(body: str):
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.split("\n"))
+        yield lines["event"], json.loads(lines["data"])
+
+@pytest.fixture
+def overloaded(monkeypatch):
+    # Every slot is taken and queued requests give up at once
+    controller = AdmissionController(max_in_flight=1, queue_timeout=0.01, retry_after=7)
+    controller.in_flight = 1
+    monkeypatch.setattr(base, "admission", controller)
+
+def test_overloaded_stream_sends_error_event(overloaded):
+    response = TestClient(main.app).post("/tools/ai-title-generator/stream", data=FORM)
+
+    assert response.status_code == 200
+    events = list(_events(response.text))
+    assert [event for event, _ in events] == ["error"]
+    payload = events[0][1]
+    assert payload["code"] == "overloaded"
+    assert payload["status"] == 503
+    assert payload["retry_after"] == 7
+    assert "busy" in payload["message"]
+
+def test_overloaded_post_sends_status_and_retry_after(overloaded):
+    response = TestClient(main.app).post("/tools/ai-title-generator/process", data=FORM)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "7"
@@ -1,6 +1,16 @@
 # Import core components for easy access
 from .base import BaseTool
 from .base_types import TextGenerationTool, TextTransformationTool
+from .results import ToolResult, GenerationResult, TransformationResult
 from .factory import create_text_generation_tool, create_text_transformation_tool
 from .registry import registry
 from .utils import create_agno_agent
+from .agent_pool import agent_pool
+from .metrics import collect_stats, register_stats
+from .cache import generation_cache
+from .singleflight import single_flight
+from .admission import admission
+from .resilience import resilient_caller
+from .budget import budget_tracker
+from .response_models import response_models
+from .result_store import result_store
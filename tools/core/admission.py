@@ -0,0 +1,195 @@
+# tools/core/admission.py
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from config import (
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_MAX_IN_FLIGHT_PER_TOOL,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT,
+    ADMISSION_RETRY_AFTER,
+)
+from ..errors import ErrorCode, ToolError
+from .deadline import remaining, timeout_error
+from .metrics import register_stats
+
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """
+    Caps concurrent upstream LLM calls, globally and per tool.
+
+    Requests over a cap wait in a bounded FIFO queue. A request is rejected
+    straight away with an OVERLOADED ToolError when the queue is full, and
+    after `queue_timeout` seconds if no slot frees up. A queued request for a
+    tool that is at its own cap does not hold up requests for other tools.
+    A cap, queue size or queue timeout of 0 means unlimited.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 32,
+        max_in_flight_per_tool: int = 8,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+        retry_after: int = 5
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            max_in_flight: Maximum concurrent calls across all tools
+            max_in_flight_per_tool: Maximum concurrent calls for any one tool
+            max_queue: Maximum number of requests waiting for a slot (0 = unbounded)
+            queue_timeout: Seconds a request may wait before it is rejected (0 = no limit)
+            retry_after: Seconds clients are told to wait after a rejection
+        """
+        self.max_in_flight = max_in_flight
+        self.max_in_flight_per_tool = max_in_flight_per_tool
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self._in_flight_by_tool: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _has_slot(self, tool_id: str) -> bool:
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return False
+        if self.max_in_flight_per_tool and self._in_flight_by_tool.get(tool_id, 0) >= self.max_in_flight_per_tool:
+            return False
+        return True
+
+    def _take(self, tool_id: str):
+        self.in_flight += 1
+        self._in_flight_by_tool[tool_id] = self._in_flight_by_tool.get(tool_id, 0) + 1
+        self.admitted += 1
+
+    def _release(self, tool_id: str):
+        self.in_flight -= 1
+        remaining = self._in_flight_by_tool.get(tool_id, 1) - 1
+        if remaining:
+            self._in_flight_by_tool[tool_id] = remaining
+        else:
+            self._in_flight_by_tool.pop(tool_id, None)
+        self._wake()
+
+    def _wake(self):
+        """Hand freed slots to queued requests, oldest first."""
+        for entry in list(self._waiters):
+            tool_id, future = entry
+            if self._has_slot(tool_id):
+                self._waiters.remove(entry)
+                self._take(tool_id)
+                future.set_result(None)
+            elif self.max_in_flight and self.in_flight >= self.max_in_flight:
+                break
+
+    def _overloaded(self, reason: str) -> ToolError:
+        return ToolError(
+            ErrorCode.OVERLOADED,
+            "The service is busy right now. Please try again in a few seconds.",
+            {"reason": reason, "retry_after": self.retry_after}
+        )
+
+    @asynccontextmanager
+    async def admit(self, tool_id: str, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold an upstream call slot for the duration of the `async with` block.
+
+        Args:
+            tool_id: The tool making the call
+            deadline: Optional request deadline; time spent queued counts against it
+
+        Raises:
+            ToolError: With ErrorCode.OVERLOADED if the request cannot be admitted,
+                or ErrorCode.TIMEOUT if the deadline passes while it is queued
+        """
+        # Queued requests never have a free slot (releases hand slots over
+        # immediately), so a newcomer with a slot isn't jumping the queue
+        if self._has_slot(tool_id):
+            self._take(tool_id)
+        else:
+            if self.max_queue and len(self._waiters) >= self.max_queue:
+                self.rejected_queue_full += 1
+                logger.warning(f"Admission queue full ({self.max_queue}); rejecting {tool_id} request.")
+                raise self._overloaded("queue_full")
+
+            future = asyncio.get_running_loop().create_future()
+            entry = (tool_id, future)
+            self._waiters.append(entry)
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            started = time.perf_counter()
+            wait = self.queue_timeout or None
+            time_left = remaining(deadline)
+            hits_deadline = time_left is not None and (wait is None or time_left < wait)
+            if hits_deadline:
+                wait = time_left
+            try:
+                await asyncio.wait_for(asyncio.shield(future), wait)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if future.done():
+                    # The slot was handed over just as we gave up; pass it on
+                    self._release(tool_id)
+                else:
+                    future.cancel()
+                    self._waiters.remove(entry)
+                if isinstance(e, asyncio.TimeoutError) and hits_deadline:
+                    raise timeout_error(tool_id) from None
+                if isinstance(e, asyncio.TimeoutError):
+                    self.rejected_timeout += 1
+                    logger.warning(f"Request for {tool_id} waited {self.queue_timeout}s for a slot; rejecting.")
+                    raise self._overloaded("queue_timeout") from None
+                raise
+            finally:
+                waited = time.perf_counter() - started
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+        try:
+            yield
+        finally:
+            self._release(tool_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return in-flight, queue depth and wait time metrics."""
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_by_tool": dict(self._in_flight_by_tool),
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.queued, 4) if self.queued else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4),
+            "limits": {
+                "max_in_flight": self.max_in_flight,
+                "max_in_flight_per_tool": self.max_in_flight_per_tool,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+            },
+        }
+
+# Create a singleton instance
+admission = AdmissionController(
+    max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+    max_in_flight_per_tool=ADMISSION_MAX_IN_FLIGHT_PER_TOOL,
+    max_queue=ADMISSION_MAX_QUEUE,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    retry_after=ADMISSION_RETRY_AFTER
+)
+register_stats("admission", admission.stats)
@@ -0,0 +1,126 @@
+# tools/core/agent_pool.py
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel
+import logging
+
+from config import AGENT_POOL_MAX_IDLE, OPENROUTER_API_KEY, OPENROUTER_BASE_URL
+from .metrics import register_stats
+from .utils import create_agno_agent
+
+logger = logging.getLogger(__name__)
+
+class AgentPool:
+    """
+    Keyed pool of pre-built Agno agents.
+
+    Building an agent means building an OpenRouter model, its OpenAI client and
+    the Agent itself, so agents are kept per (model, response_model, system
+    message) key and reused. An Agno Agent keeps per-run state (memory, run
+    response), so each agent is checked out by exactly one request at a time;
+    concurrent requests for the same key get separate agents.
+    """
+
+    def __init__(self, max_idle_per_key: int = 8):
+        """
+        Initialize the pool.
+
+        Args:
+            max_idle_per_key: How many idle agents to keep for each key
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Tuple, List[Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.in_use = 0
+
+    @staticmethod
+    def _make_key(model_name, response_model, system_message, options) -> Tuple:
+        return (model_name, response_model, system_message, tuple(sorted(options.items())))
+
+    def _create_agent(self, model_name, response_model, system_message, options):
+        """Build a new agent for a key."""
+        agent = create_agno_agent(
+            model_name,
+            OPENROUTER_API_KEY,
+            OPENROUTER_BASE_URL,
+            response_model=response_model,
+            system_message=system_message,
+            **options
+        )
+        # Pin the async client so every run of this agent reuses it instead of
+        # Agno building a fresh OpenAI client (and HTTP client) per call
+        agent.model.async_client = agent.model.get_async_client()
+        return agent
+
+    @staticmethod
+    def _reset_agent(agent):
+        """Clear per-run state so the next request starts from a clean agent."""
+        agent.memory.clear()
+        agent.run_response = None
+        agent.stream = None
+        agent.stream_intermediate_steps = False
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        model_name: str,
+        response_model: Optional[Type[BaseModel]] = None,
+        system_message: Optional[str] = None,
+        **options
+    ) -> AsyncIterator[Any]:
+        """
+        Check out an agent for the duration of the `async with` block.
+
+        Args:
+            model_name: The model to use
+            response_model: Optional Pydantic model for structured output
+            system_message: Optional system prompt for the agent
+            **options: Extra keyword arguments for create_agno_agent (part of the key)
+
+        Yields:
+            An Agno Agent reserved for the caller
+        """
+        key = self._make_key(model_name, response_model, system_message, options)
+        idle = self._idle.get(key)
+        if idle:
+            agent = idle.pop()
+            self.hits += 1
+        else:
+            agent = self._create_agent(model_name, response_model, system_message, options)
+            self.misses += 1
+
+        self.in_use += 1
+        failed = False
+        try:
+            yield agent
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.in_use -= 1
+            idle = self._idle.setdefault(key, [])
+            # Agents whose run failed or was cancelled may hold half-finished state
+            if failed or len(idle) >= self.max_idle_per_key:
+                self.discarded += 1
+            else:
+                self._reset_agent(agent)
+                idle.append(agent)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "discarded": self.discarded,
+            "in_use": self.in_use,
+            "keys": len(self._idle),
+            "idle": sum(len(agents) for agents in self._idle.values()),
+        }
+
+# Create a singleton instance
+agent_pool = AgentPool(max_idle_per_key=AGENT_POOL_MAX_IDLE)
+register_stats("agent_pool", agent_pool.stats)
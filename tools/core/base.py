@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable, Tuple, Type, Union
+from pydantic import BaseModel
+from config import GENERATION_CACHE_ENABLED, SINGLE_FLIGHT_ENABLED, TOOL_TIMEOUT
+from ..errors import ToolError
+from .admission import admission
+from .cache import generation_cache
+from .deadline import enforce_deadline, iterate_until
+from .results import ToolResult
+from .singleflight import single_flight
 
 class BaseTool(ABC):
     """
@@ -12,6 +20,12 @@ class BaseTool(ABC):
     # Tool-specific tips and benefits
     tips = []
     benefits = []
+
+    # Set to False for tools whose output should never be served from the result cache
+    cache_enabled = True
+
+    # Seconds a request may take before it is stopped (None for no limit)
+    timeout: Optional[float] = TOOL_TIMEOUT
     
     @property
     @abstractmethod
@@ -43,8 +57,104 @@ class BaseTool(ABC):
         """Return the URL route for the tool."""
         return f"/tools/{self.id}"
     
+    def cache_key_parts(self) -> Dict[str, Any]:
+        """
+        Return everything besides the form inputs that determines the tool's output.
+
+        Used to key the result cache; subclasses add their model and prompts.
+        """
+        return {"tool": self.id}
+
+    def request_key(self, inputs: Dict[str, Any]) -> str:
+        """Return a key shared by all submissions that would produce the same output."""
+        fields = self.input_form_fields
+        relevant = {k: v for k, v in inputs.items() if k in fields} if fields else inputs
+        return generation_cache.make_key(self.cache_key_parts(), relevant)
+
+    def result_cache_key(self, inputs: Dict[str, Any]) -> Optional[str]:
+        """Return the result cache key for these inputs, or None when caching is off for this tool."""
+        if not (GENERATION_CACHE_ENABLED and self.cache_enabled):
+            return None
+        return self.request_key(inputs)
+
+    def should_cache_result(self, results: Union[ToolResult, Dict[str, Any]]) -> bool:
+        """Whether a finished result is good enough to serve again (error dictionaries never are)."""
+        return isinstance(results, ToolResult)
+
+    @abstractmethod
+    def restore_cached_result(self, data: Dict[str, Any]) -> ToolResult:
+        """Rebuild a result from the plain JSON data the cache stores (see ToolResult.to_json_data)."""
+        pass
+
+    @staticmethod
+    def error_result(error: ToolError) -> Dict[str, Any]:
+        """Turn a ToolError into the error dictionary process() returns."""
+        return {"error": error.message, "error_code": error.code.value, "details": error.details}
+
+    async def run_shared(
+        self,
+        inputs: Dict[str, Any],
+        compute: Callable[[], Awaitable[Union[ToolResult, Dict[str, Any]]]],
+        deadline: Optional[float] = None
+    ) -> Union[ToolResult, Dict[str, Any]]:
+        """
+        Produce results for validated inputs without repeating upstream work.
+
+        Serves a cached result if there is one, otherwise joins an identical
+        call already in flight, otherwise runs `compute` and caches its result.
+        The upstream call is cancelled if `deadline` (event loop time) passes.
+        """
+        cache_key = self.result_cache_key(inputs)
+        if cache_key:
+            cached = await generation_cache.get(cache_key)
+            if cached is not None:
+                return self.restore_cached_result(cached)
+
+        async def compute_and_store():
+            # Only requests that actually reach the LLM take an admission slot
+            async with admission.admit(self.id, deadline):
+                async with enforce_deadline(deadline, self.id):
+                    results = await compute()
+            if cache_key and self.should_cache_result(results):
+                await generation_cache.set(cache_key, results)
+            return results
+
+        if SINGLE_FLIGHT_ENABLED:
+            return await single_flight.do(self.request_key(inputs), compute_and_store)
+        return await compute_and_store()
+
+    async def stream_shared(
+        self,
+        inputs: Dict[str, Any],
+        produce: Callable[[], AsyncIterator[Tuple[str, Any]]],
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming counterpart of run_shared.
+
+        A cached result is sent as the only event; joining an in-flight call
+        replays the events it has produced so far.
+        """
+        cache_key = self.result_cache_key(inputs)
+        if cache_key:
+            cached = await generation_cache.get(cache_key)
+            if cached is not None:
+                yield "result", self.restore_cached_result(cached)
+                return
+
+        async def produce_and_store():
+            async with admission.admit(self.id, deadline):
+                async for event, payload in iterate_until(produce(), deadline, self.id):
+                    if event == "result" and cache_key and self.should_cache_result(payload):
+                        await generation_cache.set(cache_key, payload)
+                    yield event, payload
+
+        events = single_flight.stream(self.request_key(inputs), produce_and_store) if SINGLE_FLIGHT_ENABLED else produce_and_store()
+        async for event, payload in events:
+            yield event, payload
+
     @abstractmethod
-    async def process(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(self, inputs: Dict[str, Any]) -> Union[ToolResult, Dict[str, Any]]:
         """
         Process the inputs and return the results.
         
@@ -52,10 +162,35 @@ class BaseTool(ABC):
             inputs: Dictionary of input parameters from the form
             
         Returns:
-            Dictionary of results to be passed to the results page
+            A ToolResult to be passed to the results page, or an error
+            dictionary ({"error": ..., "error_code": ...}) on failure
         """
         pass
     
+    @property
+    def response_model(self) -> Optional[Type[BaseModel]]:
+        """The Pydantic model the tool's output is parsed into, or None for unstructured tools."""
+        return None
+
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether the tool emits partial output while processing."""
+        return False
+
+    async def stream(self, inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Process the inputs, yielding events as output becomes available.
+
+        Args:
+            inputs: Dictionary of input parameters from the form
+
+        Yields:
+            ("token", text) tuples for partial output and ("item", {"field", "index",
+            "item"}) tuples for validated list elements as they complete, followed by
+            exactly one ("result", results) tuple with what process() returns
+        """
+        yield "result", await self.process(inputs)
+    
     @property
     @abstractmethod
     def input_form_fields(self) -> Dict[str, Dict[str, Any]]:
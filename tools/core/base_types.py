@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple, Union
+import time
 from .base import BaseTool
+from ..errors import ToolError
+from .deadline import deadline_after
+from .router import model_router
+from .results import GenerationResult, TransformationResult
 
 class TextGenerationTool(BaseTool, ABC):
     """Base class for text generation tools."""
@@ -20,59 +25,69 @@ class TextGenerationTool(BaseTool, ABC):
     def get_system_prompt(self) -> str:
         """Get the system prompt, allowing for customization."""
         return self.default_system_prompt
+
+    def cache_key_parts(self) -> Dict[str, Any]:
+        return {
+            **super().cache_key_parts(),
+            "models": model_router.eligible(self.id),
+            "system_prompt": self.get_system_prompt(),
+        }
     
     @abstractmethod
-    async def generate_text(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate text based on inputs and return a dictionary with results."""
+    async def generate_text(self, inputs: Dict[str, Any]) -> Union[GenerationResult, Dict[str, Any]]:
+        """Generate text based on inputs and return a GenerationResult (or an error dictionary)."""
         pass
     
-    async def process(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_text_stream(self, inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate text, yielding ("token", text) and ("item", ...) events and finally ("result", results).
+
+        Tools that cannot stream fall back to a single result event.
+        """
+        yield "result", await self.generate_text(inputs)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return True
+    
+    async def process(self, inputs: Dict[str, Any]) -> Union[GenerationResult, Dict[str, Any]]:
         """Process inputs and generate text."""
+        deadline = deadline_after(self.timeout)
         try:
             # Validate inputs
             validation_errors = self.validate_inputs(inputs)
             if validation_errors:
                 return {"error": "Validation failed", "validation_errors": validation_errors}
             
-            # Generate text and get results
-            results = await self.generate_text(inputs)
-            
-            # If there's an error in the results, return it directly
-            if "error" in results:
-                return results
-            
-            # Make sure metadata is included
-            if "metadata" not in results:
-                results["metadata"] = {
-                    **{k: v for k, v in inputs.items() if k in self.input_form_fields}
-                }
-                
-            # Make sure titles is included for backward compatibility
-            if "titles" not in results and "error" not in results:
-                # Try to find some content to use as titles
-                if "content" in results:
-                    results["titles"] = [results["content"]]
-                else:
-                    # Look for any list in the results to use
-                    for key, value in results.items():
-                        if isinstance(value, list) and value and key != "metadata":
-                            results["titles"] = value
-                            break
-                    
-                    # If still no titles, use a default
-                    if "titles" not in results:
-                        results["titles"] = ["Content generated successfully"]
-            
-            # Add count to metadata if not present
-            if "metadata" in results and "count" not in results["metadata"]:
-                if "titles" in results and isinstance(results["titles"], list):
-                    results["metadata"]["count"] = len(results["titles"])
-            
-            return results
+            # Generate text and get results (served from the cache or a shared call when possible)
+            return await self.run_shared(inputs, lambda: self.generate_text(inputs), deadline)
             
+        except ToolError as e:
+            return self.error_result(e)
         except Exception as e:
             return {"error": f"Failed to generate text: {str(e)}"}
 
+    async def stream(self, inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """Process inputs, streaming tokens as they are generated."""
+        deadline = deadline_after(self.timeout)
+        try:
+            # Validate inputs
+            validation_errors = self.validate_inputs(inputs)
+            if validation_errors:
+                yield "result", {"error": "Validation failed", "validation_errors": validation_errors}
+                return
+
+            async for event, payload in self.stream_shared(inputs, lambda: self.generate_text_stream(inputs), deadline):
+                yield event, payload
+
+        except ToolError as e:
+            yield "result", self.error_result(e)
+        except Exception as e:
+            yield "result", {"error": f"Failed to generate text: {str(e)}"}
+
+    def restore_cached_result(self, data: Dict[str, Any]) -> GenerationResult:
+        return GenerationResult.from_json_data(data)
+
 class TextTransformationTool(BaseTool, ABC):
     """Base class for text transformation tools."""
     
@@ -85,8 +100,9 @@ class TextTransformationTool(BaseTool, ABC):
         """Transform the input text based on options."""
         pass
     
-    async def process(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(self, inputs: Dict[str, Any]) -> Union[TransformationResult, Dict[str, Any]]:
         """Process inputs and transform text."""
+        deadline = deadline_after(self.timeout)
         try:
             # Validate inputs
             validation_errors = self.validate_inputs(inputs)
@@ -98,19 +114,27 @@ class TextTransformationTool(BaseTool, ABC):
             if not text:
                 return {"error": "Please provide text to transform."}
             
-            # Transform text
-            transformed_text = await self.transform_text(
-                text, 
-                {k: v for k, v in inputs.items() if k != "text"}
-            )
-            
-            # Return results
-            return {
-                "metadata": {
-                    **{k: v for k, v in inputs.items() if k in self.input_form_fields},
-                },
-                "original_text": text,
-                "transformed_text": transformed_text
-            }
+            async def transform():
+                started = time.perf_counter()
+                # Transform text
+                transformed_text = await self.transform_text(
+                    text, 
+                    {k: v for k, v in inputs.items() if k != "text"}
+                )
+                
+                # Return results
+                return TransformationResult(
+                    metadata={k: v for k, v in inputs.items() if k in self.input_form_fields},
+                    original_text=text,
+                    transformed_text=transformed_text,
+                    elapsed=time.perf_counter() - started,
+                )
+
+            return await self.run_shared(inputs, transform, deadline)
+        except ToolError as e:
+            return self.error_result(e)
         except Exception as e:
             return {"error": f"Failed to transform text: {str(e)}"}
+
+    def restore_cached_result(self, data: Dict[str, Any]) -> TransformationResult:
+        return TransformationResult.from_json_data(data)
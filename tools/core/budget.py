@@ -0,0 +1,115 @@
+# tools/core/budget.py
+from typing import Any, Dict, Optional, Type, Union, get_args, get_origin
+import math
+
+from pydantic import BaseModel
+
+from config import (
+    OUTPUT_BUDGET_DEFAULT_LIST_ITEMS,
+    OUTPUT_BUDGET_DEFAULT_TEXT_TOKENS,
+    OUTPUT_BUDGET_MAX_TOKENS,
+    OUTPUT_BUDGET_MIN_TOKENS,
+)
+from .metrics import register_stats
+
+# Headroom for markdown fences, whitespace and models that write a little more than asked
+BUDGET_SAFETY_FACTOR = 1.5
+BUDGET_OVERHEAD_TOKENS = 256
+# How deep self-referencing models (outline subsections) are expanded
+MAX_NESTING_DEPTH = 3
+
+def _estimate(
+    annotation: Any,
+    field_name: Optional[str],
+    item_counts: Dict[str, int],
+    text_tokens: Dict[str, int],
+    depth: int
+) -> int:
+    """Estimate the JSON output tokens for one value of the given type."""
+    origin = get_origin(annotation)
+
+    if origin is Union:
+        return max(_estimate(arg, field_name, item_counts, text_tokens, depth) for arg in get_args(annotation) if arg is not type(None))
+
+    if origin is list:
+        count = item_counts.get(field_name, OUTPUT_BUDGET_DEFAULT_LIST_ITEMS)
+        item_args = get_args(annotation)
+        if not count:
+            return 2
+        per_item = _estimate(item_args[0] if item_args else str, field_name, item_counts, text_tokens, depth)
+        return 2 + count * (per_item + 1)
+
+    if origin is dict:
+        return text_tokens.get(field_name, OUTPUT_BUDGET_DEFAULT_TEXT_TOKENS)
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if depth >= MAX_NESTING_DEPTH:
+            return 2
+        total = 2
+        for name, field in annotation.model_fields.items():
+            # Input-only fields (alternative names) are never written out
+            if field.exclude:
+                continue
+            # Key, quotes, colon and comma
+            total += 3 + math.ceil(len(name) / 4)
+            total += _estimate(field.annotation, name, item_counts, text_tokens, depth + 1)
+        return total
+
+    if annotation is str or annotation is Any:
+        return text_tokens.get(field_name, OUTPUT_BUDGET_DEFAULT_TEXT_TOKENS)
+
+    # Numbers, booleans, null
+    return 3
+
+def estimate_output_budget(
+    response_model: Type[BaseModel],
+    item_counts: Optional[Dict[str, int]] = None,
+    text_tokens: Optional[Dict[str, int]] = None
+) -> int:
+    """
+    Derive a max output token budget from a response model's shape.
+
+    Args:
+        response_model: The Pydantic model the output is parsed into
+        item_counts: Field name -> how many items that list field should hold.
+            Use 0 for alternative fields the model is not expected to fill.
+        text_tokens: Field name -> tokens allowed for a long text field
+
+    Returns:
+        Token budget, rounded up to a multiple of 256 and clamped to the configured bounds
+    """
+    tokens = _estimate(response_model, None, item_counts or {}, text_tokens or {}, 0)
+    budget = tokens * BUDGET_SAFETY_FACTOR + BUDGET_OVERHEAD_TOKENS
+    budget = math.ceil(budget / 256) * 256
+    return int(min(max(budget, OUTPUT_BUDGET_MIN_TOKENS), OUTPUT_BUDGET_MAX_TOKENS))
+
+class BudgetTracker:
+    """Counts runs per tool and how many of them hit their output budget."""
+
+    def __init__(self):
+        self._budgets: Dict[str, int] = {}
+        self._runs: Dict[str, int] = {}
+        self._truncated: Dict[str, int] = {}
+
+    def set_budget(self, tool_id: str, max_tokens: int):
+        self._budgets[tool_id] = max_tokens
+
+    def record(self, tool_id: str, truncated: bool):
+        self._runs[tool_id] = self._runs.get(tool_id, 0) + 1
+        if truncated:
+            self._truncated[tool_id] = self._truncated.get(tool_id, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return each tool's budget and truncation counts."""
+        return {
+            tool_id: {
+                "max_output_tokens": budget,
+                "runs": self._runs.get(tool_id, 0),
+                "truncated": self._truncated.get(tool_id, 0),
+            }
+            for tool_id, budget in self._budgets.items()
+        }
+
+# Create a singleton instance
+budget_tracker = BudgetTracker()
+register_stats("output_budgets", budget_tracker.stats)
@@ -0,0 +1,223 @@
+# tools/core/cache.py
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from config import (
+    GENERATION_CACHE_DB,
+    GENERATION_CACHE_ENABLED,
+    GENERATION_CACHE_MAX_ENTRIES,
+    GENERATION_CACHE_TTL,
+)
+from .metrics import register_stats
+from .results import ToolResult
+
+logger = logging.getLogger(__name__)
+
+def normalize_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize form inputs so equivalent submissions share a cache entry.
+
+    Strings are stripped and runs of whitespace collapsed; keys are sorted
+    when the key is serialized.
+    """
+    normalized = {}
+    for key, value in inputs.items():
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        normalized[key] = value
+    return normalized
+
+class SQLiteCacheTier:
+    """
+    On-disk second cache tier so generations survive restarts.
+
+    Calls are blocking; GenerationCache runs them in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite file
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] <= time.time():
+                self._conn.execute("DELETE FROM generations WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM generations")
+            self._conn.commit()
+
+class GenerationCache:
+    """
+    Cache of tool results keyed on everything that determines the output.
+
+    The first tier is an in-memory LRU bounded by entry count, with a TTL per
+    entry. The optional second tier is a SQLite file; a hit there is promoted
+    back into memory. Values are stored as JSON text, so callers always get a
+    fresh copy they are free to mutate.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600, db_path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            ttl: Seconds an entry stays valid
+            db_path: Optional SQLite file for the on-disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._disk: Optional[SQLiteCacheTier] = None
+        if db_path:
+            try:
+                self._disk = SQLiteCacheTier(db_path)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not open generation cache database {db_path}: {e}. Using memory only.")
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stores = 0
+
+    @staticmethod
+    def make_key(parts: Dict[str, Any], inputs: Dict[str, Any]) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            parts: Tool id, model, system prompt, response model, etc.
+            inputs: The form inputs (normalized here)
+
+        Returns:
+            Hex digest identifying the generation
+        """
+        payload = json.dumps(
+            {"parts": parts, "inputs": normalize_inputs(inputs)},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(value)
+            del self._entries[key]
+            self.expirations += 1
+
+        if self._disk is not None:
+            try:
+                row = await asyncio.to_thread(self._disk.get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"Generation cache read failed: {e}")
+                row = None
+            if row is not None:
+                value, expires_at = row
+                self._put_memory(key, value, expires_at)
+                self.disk_hits += 1
+                return json.loads(value)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, result: Union[ToolResult, Dict[str, Any]]):
+        """
+        Store a result under a key.
+
+        Tool results are serialized here, once; get() returns their JSON data,
+        which tools rebuild with BaseTool.restore_cached_result.
+        """
+        try:
+            value = json.dumps(result.to_json_data() if isinstance(result, ToolResult) else result)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching result that is not JSON-serializable: {e}")
+            return
+        expires_at = time.time() + self.ttl
+        self._put_memory(key, value, expires_at)
+        self.stores += 1
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Generation cache write failed: {e}")
+
+    def _put_memory(self, key: str, value: str, expires_at: float):
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": GENERATION_CACHE_ENABLED,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "stores": self.stores,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "disk_tier": self._disk is not None,
+        }
+
+# Create a singleton instance
+generation_cache = GenerationCache(
+    max_entries=GENERATION_CACHE_MAX_ENTRIES,
+    ttl=GENERATION_CACHE_TTL,
+    db_path=GENERATION_CACHE_DB
+)
+register_stats("generation_cache", generation_cache.stats)
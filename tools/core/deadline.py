@@ -0,0 +1,77 @@
+# tools/core/deadline.py
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+import asyncio
+
+from ..errors import ErrorCode, ToolError
+
+def deadline_after(seconds: Optional[float]) -> Optional[float]:
+    """
+    Turn a timeout into an absolute deadline on the event loop clock.
+
+    Args:
+        seconds: Time budget for the request (None or 0 means no deadline)
+
+    Returns:
+        The deadline, or None when there is no limit
+    """
+    if not seconds:
+        return None
+    return asyncio.get_running_loop().time() + seconds
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before a deadline (None when there is no deadline)."""
+    if deadline is None:
+        return None
+    return max(deadline - asyncio.get_running_loop().time(), 0.0)
+
+def timeout_error(tool_id: str) -> ToolError:
+    return ToolError(
+        ErrorCode.TIMEOUT,
+        "The AI took too long to respond and the request was stopped. Please try again.",
+        {"tool": tool_id}
+    )
+
+@asynccontextmanager
+async def enforce_deadline(deadline: Optional[float], tool_id: str) -> AsyncIterator[None]:
+    """
+    Cancel the block when the deadline passes.
+
+    Cancelling the block cancels the upstream HTTP request it is awaiting, so
+    the provider stops generating. Must not wrap a `yield` of an async
+    generator; use iterate_until for those.
+
+    Raises:
+        ToolError: With ErrorCode.TIMEOUT if the deadline passed
+    """
+    if deadline is None:
+        yield
+        return
+    try:
+        async with asyncio.timeout_at(deadline):
+            yield
+    except TimeoutError:
+        raise timeout_error(tool_id) from None
+
+async def iterate_until(events: AsyncIterator[Any], deadline: Optional[float], tool_id: str) -> AsyncIterator[Any]:
+    """
+    Re-yield an async iterator's items, stopping it when the deadline passes.
+
+    Only the wait for each next item is timed, so time spent by the consumer
+    between items is not interrupted from inside this generator.
+
+    Raises:
+        ToolError: With ErrorCode.TIMEOUT if the deadline passed
+    """
+    iterator = events.__aiter__()
+    try:
+        while True:
+            try:
+                async with enforce_deadline(deadline, tool_id):
+                    item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
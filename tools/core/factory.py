@@ -1,11 +1,23 @@
 # tools/core/factory.py
-from typing import Dict, Any, List, Type, Callable, Optional
+from typing import Dict, Any, List, Type, Callable, Optional, AsyncIterator, Tuple, Union
+from dataclasses import replace
 from .base import BaseTool
 from .base_types import TextGenerationTool, TextTransformationTool
+from .agent_pool import agent_pool
+from .budget import budget_tracker, estimate_output_budget
+from .json_extract import extract_json, looks_truncated
+from .resilience import resilient_caller
+from .response_models import response_models
+from .results import GenerationResult
+from .router import estimate_tokens, finish_reason, model_router, output_tokens
+from ..errors import ToolError
+from .streaming import IncrementalListParser
+from agno.run.response import RunEvent
+from config import OUTPUT_BUDGET_MAX_TOKENS
 from pydantic import BaseModel, ValidationError
 import json
 import logging
-import re # Import re for cleaning
+import time
 
 # Set up logging for debugging
 logging.basicConfig(level=logging.INFO)
@@ -19,13 +31,25 @@ def create_text_transformation_tool(
     icon: Optional[str] = None,
     system_prompt: Optional[str] = None,
     user_prompt_template: Optional[str] = None,
-    input_form_fields: Optional[Dict[str, Dict[str, Any]]] = None
+    input_form_fields: Optional[Dict[str, Dict[str, Any]]] = None,
+    cache_results: bool = True,
+    timeout: Optional[float] = None,
+    max_output_tokens: Optional[int] = None
 ) -> Type[TextTransformationTool]:
     """
     Factory function to create a text transformation tool class.
     (Implementation remains the same as in fasthtml-agno2.txt)
+
+    max_output_tokens caps the model's output (defaults to OUTPUT_BUDGET_MAX_TOKENS).
     """
     class CustomTextTransformationTool(TextTransformationTool):
+        cache_enabled = cache_results
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._max_output_tokens = max_output_tokens or OUTPUT_BUDGET_MAX_TOKENS
+            budget_tracker.set_budget(self.id, self._max_output_tokens)
+
         @property
         def name(self) -> str: return name
         @property
@@ -37,25 +61,71 @@ def create_text_transformation_tool(
             if input_form_fields: return input_form_fields
             return { "text": { "type": "textarea", "label": "Text to transform", "placeholder": "Enter the text...", "required": True, "rows": 5 } }
 
+        def cache_key_parts(self) -> Dict[str, Any]:
+            return {
+                **super().cache_key_parts(),
+                "models": model_router.eligible(self.id),
+                "system_prompt": system_prompt,
+                "user_prompt_template": user_prompt_template,
+            }
+
         async def transform_text(self, text: str, options: Dict[str, Any]) -> str:
-            from ..utils import create_agno_agent
-            from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, DEFAULT_MODEL
-            agent = create_agno_agent(DEFAULT_MODEL, OPENROUTER_API_KEY, OPENROUTER_BASE_URL)
             prompt_vars = {"text": text, **options}
             formatted_user_prompt = user_prompt_template.format(**prompt_vars) if user_prompt_template else f"Transform: {text}"
-            agent.system_message = system_prompt if system_prompt else "You are a text transformation assistant."
+            stop_reason = None
             try:
                 logger.info(f"Sending transformation prompt: {formatted_user_prompt[:100]}...")
-                response = agent.run(formatted_user_prompt)
+                async def run(model_name):
+                    nonlocal stop_reason
+                    async with model_router.track(model_name) as call, agent_pool.acquire(
+                        model_name,
+                        system_message=system_prompt if system_prompt else "You are a text transformation assistant.",
+                        max_tokens=self._max_output_tokens
+                    ) as agent:
+                        # Use the native async run so the event loop stays free while waiting on the LLM
+                        response = await agent.arun(formatted_user_prompt)
+                        call.tokens = output_tokens(response) or estimate_tokens(str(getattr(response, 'content', '') or ''))
+                        stop_reason = finish_reason(agent)
+                        return response
+
+                # Routed to the fastest healthy model; retried on rate limits / upstream errors, hedged when slow
+                model_name = model_router.choose(self.id)
+                response = await resilient_caller.call(
+                    run, model_name, label=self.id, fallback_model=model_router.runner_up(self.id, model_name)
+                )
                 if hasattr(response, 'content'): result_text = response.content
                 elif hasattr(response, 'message'): result_text = response.message
                 elif hasattr(response, 'text'): result_text = response.text
                 elif hasattr(response, 'answer'): result_text = response.answer
                 else: result_text = str(response)
+                self._record_truncation(result_text, output_tokens(response), stop_reason)
                 return result_text
             except Exception as e:
                 logger.error(f"Error transforming text: {str(e)}", exc_info=True)
                 raise
+
+        def _record_truncation(self, text: str, tokens: Optional[int], stop_reason: Optional[str]) -> bool:
+            """
+            Count the run against the tool's output budget (see BudgetTracker).
+
+            Trusts the provider's finish_reason when it sent one ("length" means
+            cut off), then its output token count, then the text's size.
+
+            Returns:
+                Whether the output was cut off by the budget
+            """
+            if stop_reason is not None:
+                truncated = stop_reason == "length"
+            elif tokens is not None:
+                truncated = tokens >= self._max_output_tokens
+            else:
+                truncated = estimate_tokens(text or "") >= self._max_output_tokens * 0.95
+            budget_tracker.record(self.id, truncated)
+            if truncated:
+                logger.warning(f"{self.id}: output hit the {self._max_output_tokens} token budget and was truncated")
+            return truncated
+    if timeout is not None:
+        CustomTextTransformationTool.timeout = timeout
     return CustomTextTransformationTool
 
 
@@ -66,17 +136,39 @@ def create_text_generation_tool(
     system_prompt: Optional[str] = None,
     user_prompt_template: Optional[str] = None,
     input_form_fields: Optional[Dict[str, Dict[str, Any]]] = None,
-    response_model: Optional[Type[BaseModel]] = None
+    response_model: Optional[Type[BaseModel]] = None,
+    cache_results: bool = True,
+    timeout: Optional[float] = None,
+    max_output_tokens: Optional[int] = None,
+    item_counts: Optional[Dict[str, int]] = None,
+    text_tokens: Optional[Dict[str, int]] = None
 ) -> Type[TextGenerationTool]:
     """
     Factory function to create a text generation tool class.
     (Refined version)
+
+    The output token budget is derived from response_model, using item_counts
+    (list field -> expected items, 0 for unused alternatives) and text_tokens
+    (long text field -> tokens). Pass max_output_tokens to set it explicitly.
     """
+    if max_output_tokens is None:
+        max_output_tokens = (
+            estimate_output_budget(response_model, item_counts, text_tokens)
+            if response_model else OUTPUT_BUDGET_MAX_TOKENS
+        )
+    # Schema, prompt and validators for the response model, built once for every request
+    response_spec = response_models.compile(response_model) if response_model else None
+
     class CustomTextGenerationTool(TextGenerationTool):
+        cache_enabled = cache_results
+
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             # Store the response model for structured output
             self._response_model = response_model # Use internal var to avoid pydantic conflict
+            self._response_spec = response_spec
+            self._max_output_tokens = max_output_tokens
+            budget_tracker.set_budget(self.id, self._max_output_tokens)
 
         @property
         def name(self) -> str: return name
@@ -85,92 +177,245 @@ def create_text_generation_tool(
         @property
         def icon(self) -> str: return icon if icon else super().icon
         @property
+        def response_model(self) -> Optional[Type[BaseModel]]: return self._response_model
+        @property
         def default_system_prompt(self) -> str: return system_prompt if system_prompt else super().default_system_prompt
         @property
         def input_form_fields(self) -> Dict[str, Dict[str, Any]]:
             if input_form_fields: return input_form_fields
             return { "topic": { "type": "textarea", "label": "Topic", "placeholder": "Describe...", "required": True, "rows": 3 } }
 
-        async def generate_text(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-            from ..utils import create_agno_agent
-            from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, DEFAULT_MODEL
+        def cache_key_parts(self) -> Dict[str, Any]:
+            parts = {**super().cache_key_parts(), "user_prompt_template": user_prompt_template}
+            if self._response_model:
+                # Include the schema so a changed model never serves results cached for the old one
+                parts["response_model"] = f"{self._response_model.__module__}.{self._response_model.__qualname__}"
+                parts["response_schema"] = self._response_spec.fingerprint
+            return parts
 
-            agent = create_agno_agent(
-                DEFAULT_MODEL,
-                OPENROUTER_API_KEY,
-                OPENROUTER_BASE_URL,
-                response_model=self._response_model
-            )
+        def should_cache_result(self, results: Union[GenerationResult, Dict[str, Any]]) -> bool:
+            if not super().should_cache_result(results):
+                return False
+            # Don't keep unstructured fallbacks around when structured output was expected
+            if self._response_model and not results.is_structured:
+                return False
+            # A retry may well finish within the budget
+            return not results.truncated
 
-            formatted_user_prompt = user_prompt_template.format(**inputs) if user_prompt_template else f"Generate content about: {inputs.get('topic', '')}"
+        def restore_cached_result(self, data: Dict[str, Any]) -> GenerationResult:
+            return GenerationResult.from_json_data(data, self._response_model)
 
-            if system_prompt:
-                agent.system_message = system_prompt
+        async def generate_text(self, inputs: Dict[str, Any]) -> Union[GenerationResult, Dict[str, Any]]:
+            formatted_user_prompt = user_prompt_template.format(**inputs) if user_prompt_template else f"Generate content about: {inputs.get('topic', '')}"
 
+            started = time.perf_counter()
+            used_model = None
+            stop_reason = None
             try:
                 logger.info(f"Sending generation prompt: {formatted_user_prompt[:100]}...")
-                response = agent.run(formatted_user_prompt)
+                async def run(model_name):
+                    nonlocal used_model, stop_reason
+                    # The raw output is parsed below with the precompiled validator, not by Agno
+                    async with model_router.track(model_name) as call, agent_pool.acquire(
+                        model_name,
+                        response_model=self._response_model,
+                        system_message=system_prompt,
+                        parse_response=False,
+                        max_tokens=self._max_output_tokens
+                    ) as agent:
+                        # Use the native async run so the event loop stays free while waiting on the LLM
+                        response = await agent.arun(formatted_user_prompt)
+                        call.tokens = output_tokens(response) or estimate_tokens(self._extract_raw_content(response))
+                        used_model = model_name
+                        stop_reason = finish_reason(agent)
+                        return response
+
+                # Routed to the fastest healthy model; retried on rate limits / upstream errors, hedged when slow
+                model_name = model_router.choose(self.id)
+                response = await resilient_caller.call(
+                    run, model_name, label=self.id, fallback_model=model_router.runner_up(self.id, model_name)
+                )
 
                 # --- Process the response ---
-                return self._process_response(response, inputs)
+                tokens = output_tokens(response)
+                result = self._process_response(
+                    response, inputs, model=used_model, output_tokens=tokens, elapsed=time.perf_counter() - started
+                )
+                return self._check_truncation(result, response, tokens, stop_reason)
 
+            except ToolError:
+                # Already carries an error code for the caller
+                raise
             except Exception as e:
                 logger.error(f"Error generating text: {str(e)}", exc_info=True)
                 return {"error": f"Error generating content: {str(e)}", "metadata": inputs}
 
-        def _process_response(self, response, inputs: Dict[str, Any]) -> Dict[str, Any]:
-            """Process the model response, handling structured or unstructured output."""
-            base_result = {"metadata": inputs} # Start with metadata
+        async def generate_text_stream(self, inputs: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+            formatted_user_prompt = user_prompt_template.format(**inputs) if user_prompt_template else f"Generate content about: {inputs.get('topic', '')}"
+
+            chunks = []
+            # Emit list items (titles, posts, ideas...) as soon as each one is complete
+            item_parser = IncrementalListParser(self._response_spec.item_adapters) if self._response_spec else None
+            item_count = 0
+            reported_tokens = None
+            used_model = None
+            stop_reason = None
+            started = time.perf_counter()
+            try:
+                logger.info(f"Streaming generation prompt: {formatted_user_prompt[:100]}...")
+                async def open_stream(model_name):
+                    # With parse_response off Agno yields raw deltas; the full text is parsed once complete
+                    async with model_router.track(model_name) as call, agent_pool.acquire(
+                        model_name,
+                        response_model=self._response_model,
+                        system_message=system_prompt,
+                        parse_response=False,
+                        max_tokens=self._max_output_tokens
+                    ) as agent:
+                        streamed_chars = 0
+                        async for chunk in await agent.arun(formatted_user_prompt, stream=True):
+                            if chunk.event == RunEvent.run_response.value and isinstance(chunk.content, str) and chunk.content:
+                                streamed_chars += len(chunk.content)
+                                yield chunk.content
+                        nonlocal reported_tokens, used_model, stop_reason
+                        reported_tokens = output_tokens(getattr(agent, "run_response", None))
+                        used_model = model_name
+                        stop_reason = finish_reason(agent)
+                        call.tokens = reported_tokens or max(streamed_chars // 4, 1)
+
+                # Routed like generate_text; retried until the first token arrives, hedged when it is slow
+                model_name = model_router.choose(self.id)
+                async for text in resilient_caller.stream(
+                    open_stream, model_name, label=self.id, fallback_model=model_router.runner_up(self.id, model_name)
+                ):
+                    chunks.append(text)
+                    yield "token", text
+                    if item_parser:
+                        for field, item in item_parser.feed(text):
+                            yield "item", {"field": field, "index": item_count, "item": item}
+                            item_count += 1
+
+            except ToolError:
+                raise
+            except Exception as e:
+                logger.error(f"Error streaming text: {str(e)}", exc_info=True)
+                yield "result", {"error": f"Error generating content: {str(e)}", "metadata": inputs}
+                return
+
+            text = "".join(chunks)
+            result = self._process_response(
+                text, inputs, model=used_model, output_tokens=reported_tokens, elapsed=time.perf_counter() - started
+            )
+            yield "result", self._check_truncation(result, text, reported_tokens, stop_reason)
+
+        def _process_response(self, response, inputs: Dict[str, Any], **usage) -> Union[GenerationResult, Dict[str, Any]]:
+            """
+            Process the model response, handling structured or unstructured output.
+
+            A validated model is kept as is in the result; it is only serialized
+            if something needs JSON (e.g. a cache write).
+
+            Args:
+                response: Agno RunResponse, or the streamed text
+                inputs: The form inputs
+                **usage: model, output_tokens and elapsed, recorded on the result
+
+            Returns:
+                A GenerationResult, or an error dictionary for an empty response
+            """
+            metadata = {k: v for k, v in inputs.items() if k in self.input_form_fields}
+
+            # Agno hands back the validated object when it parsed the response itself
+            content = getattr(response, 'content', None)
+            if self._response_model and isinstance(content, self._response_model):
+                logger.info(f"Received validated Pydantic object: {type(content).__name__}")
+                return self._structured_result(metadata, content, usage)
 
             raw_content_str = self._extract_raw_content(response)
 
             if not raw_content_str:
                  logger.warning("Received empty content from LLM.")
-                 base_result["error"] = "Received empty response from AI."
-                 base_result["titles"] = ["AI failed to generate content."]
-                 return base_result
+                 return {"error": "Received empty response from AI.", "metadata": metadata}
 
             # If a response model is expected, try to parse structured output
             if self._response_model:
                 try:
-                    # Attempt validation directly using Pydantic
-                    # Agno should ideally return the validated object in response.content
-                    if hasattr(response, 'content') and isinstance(response.content, self._response_model):
-                         structured_content = response.content
-                         logger.info(f"Received validated Pydantic object: {type(structured_content).__name__}")
-                    else:
-                        # Fallback: Try parsing the raw string
-                        logger.info(f"Attempting to parse raw content into {self._response_model.__name__}")
-                        cleaned_content = self._clean_llm_output(raw_content_str)
-                        # Use model_validate_json for robustness
-                        structured_content = self._response_model.model_validate_json(cleaned_content)
-                        logger.info(f"Successfully parsed raw content into Pydantic object: {type(structured_content).__name__}")
-
-                    # Convert Pydantic model to dict and merge with base_result
-                    content_dict = structured_content.model_dump(mode='json') # Use mode='json' for better serialization
-                    base_result.update(content_dict)
-                    # Create a formatted 'titles' list for display compatibility
-                    base_result['titles'] = self._format_structured_titles(structured_content)
-                    base_result['is_structured'] = True # Flag for results handlers
-                    logger.info("Successfully processed structured output.")
-                    return base_result
+                    logger.info(f"Attempting to parse raw content into {self._response_model.__name__}")
+                    cleaned_content = self._clean_llm_output(raw_content_str)
+                    # Validate with the precompiled adapter (same checks as model_validate_json)
+                    structured_content = self._response_spec.adapter.validate_json(cleaned_content)
+                    logger.info(f"Successfully parsed raw content into Pydantic object: {type(structured_content).__name__}")
+                    return self._structured_result(metadata, structured_content, usage)
 
                 except (ValidationError, json.JSONDecodeError, Exception) as e:
                     logger.warning(f"Failed to parse/validate structured output ({type(e).__name__}): {str(e)}. Falling back to unstructured.", exc_info=False) # Log less verbosely on fallback
-                    # Fallback to processing the raw string if structured parsing fails
-                    base_result['titles'] = self._process_unstructured_text(raw_content_str)
-                    base_result['raw_text'] = raw_content_str # Include raw text for debugging
-                    base_result['is_structured'] = False
-                    return base_result
+
+            # No response model expected, or parsing failed: process as unstructured text
+            return GenerationResult(
+                metadata=metadata,
+                lines=tuple(self._process_unstructured_text(raw_content_str)),
+                raw_text=raw_content_str, # Include raw text for debugging
+                **usage
+            )
+
+        def _structured_result(self, metadata: Dict[str, Any], structured_content: BaseModel, usage: Dict[str, Any]) -> GenerationResult:
+            """Wrap a validated model in a result, with the formatted lines for display."""
+            logger.info("Successfully processed structured output.")
+            return GenerationResult(
+                metadata=metadata,
+                lines=tuple(self._format_structured_titles(structured_content)),
+                structured=structured_content,
+                **usage
+            )
+
+        def _check_truncation(
+            self,
+            result: Union[GenerationResult, Dict[str, Any]],
+            response,
+            tokens: Optional[int],
+            stop_reason: Optional[str] = None
+        ):
+            """
+            Flag a result whose output was cut off by the token budget.
+
+            Trusts the provider's finish_reason when it sent one ("length" means
+            cut off). Otherwise uses its output token count, or text close to the
+            budget in size. JSON that stops part-way counts as cut off either way.
+
+            Returns:
+                The result, replaced by a copy marked truncated if it was cut off
+            """
+            if not isinstance(result, GenerationResult):
+                return result
+            # Only text that failed to parse can be cut-off JSON; a validated model is never read back as text
+            if stop_reason == "length" or (
+                self._response_model and not result.is_structured and looks_truncated(result.raw_text, "{")
+            ):
+                # Cut-off JSON counts too (the provider may stop short of the budget)
+                truncated = True
+            elif stop_reason is not None:
+                truncated = False
+            elif tokens is not None:
+                truncated = tokens >= self._max_output_tokens
             else:
-                # No response model expected, process as unstructured text
-                base_result['titles'] = self._process_unstructured_text(raw_content_str)
-                base_result['raw_text'] = raw_content_str
-                base_result['is_structured'] = False
-                return base_result
+                truncated = estimate_tokens(self._extract_raw_content(response)) >= self._max_output_tokens * 0.95
+            budget_tracker.record(self.id, truncated)
+            if not truncated:
+                return result
+            logger.warning(f"{self.id}: output hit the {self._max_output_tokens} token budget and was truncated")
+            return replace(
+                result,
+                truncated=True,
+                warnings=result.warnings + ("The AI response reached its length limit and may be incomplete. Try again or narrow the request.",)
+            )
 
         def _extract_raw_content(self, response) -> str:
-            """Extracts the primary text content from various Agno response formats."""
+            """
+            Extracts the primary text content from various Agno response formats.
+
+            Serializes a validated model, so only call it when the text is really
+            needed (e.g. estimating tokens the provider did not report).
+            """
             if hasattr(response, 'content'):
                 content = response.content
                 # If content is a Pydantic model, serialize it; otherwise, convert to string
@@ -181,11 +426,9 @@ def create_text_generation_tool(
             else: return str(response or "")
 
         def _clean_llm_output(self, text: str) -> str:
-            """Basic cleaning of LLM output, removing markdown fences."""
-            # Remove markdown code block fences (json, etc.)
-            cleaned = re.sub(r'^```[a-zA-Z]*\s*', '', text.strip(), flags=re.MULTILINE)
-            cleaned = re.sub(r'\s*```$', '', cleaned.strip(), flags=re.MULTILINE)
-            return cleaned.strip()
+            """Extract the JSON from LLM output, skipping code fences, leading prose and trailing commentary."""
+            # Response models are objects; falls back to the text so validation reports what was wrong
+            return extract_json(text, "{") or text
 
         def _process_unstructured_text(self, text: str) -> List[str]:
             """Processes unstructured text into a list of lines."""
@@ -195,7 +438,7 @@ def create_text_generation_tool(
             """Creates a list of strings for display from various Pydantic models."""
             # Import models locally to avoid circular dependency issues if needed
             from ..implementations.models import (
-                GeneratedTitles, SocialPostList, ThumbnailIdeas, BlogOutline, YoutubeScriptOutput
+                GeneratedTitles, SocialPostList, ThumbnailIdeas, BlogOutline, OutlineSection, YoutubeScriptOutput
             )
 
             if isinstance(structured_content, GeneratedTitles):
@@ -210,8 +453,7 @@ def create_text_generation_tool(
 
             elif isinstance(structured_content, ThumbnailIdeas):
                 formatted_ideas = []
-                ideas_to_format = structured_content.ideas or structured_content.thumbnail_ideas or []
-                for i, idea in enumerate(ideas_to_format[:5]): # Limit to 5
+                for i, idea in enumerate(structured_content.ideas[:5]): # Limit to 5
                     formatted_ideas.append(f"**Thumbnail Idea {i+1}:**")
                     formatted_ideas.append(f"- **Background:** {idea.background or 'N/A'}")
                     formatted_ideas.append(f"- **Main Image:** {idea.main_image or 'N/A'}")
@@ -261,4 +503,6 @@ def create_text_generation_tool(
                 except:
                     return [str(structured_content)]
 
+    if timeout is not None:
+        CustomTextGenerationTool.timeout = timeout
     return CustomTextGenerationTool
\ No newline at end of file
@@ -0,0 +1,114 @@
+# tools/core/http_client.py
+from importlib.util import find_spec
+from typing import Any, Dict, Optional
+import httpx
+import logging
+import time
+
+from config import (
+    OPENROUTER_HTTP2,
+    OPENROUTER_KEEPALIVE_EXPIRY,
+    OPENROUTER_MAX_CONNECTIONS,
+    OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+)
+from .metrics import register_stats
+
+logger = logging.getLogger(__name__)
+
+class TracingTransport(httpx.AsyncHTTPTransport):
+    """
+    Async transport that counts requests against new connections and TLS handshakes.
+
+    Uses httpcore's `trace` request extension, so the numbers reflect what the
+    connection pool actually did rather than what we expect it to do.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.http2_requests = 0
+        self.connect_seconds = 0.0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        started: Dict[str, float] = {}
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+                started[event_name] = time.perf_counter()
+                if event_name == "connection.connect_tcp.started":
+                    self.new_connections += 1
+                else:
+                    self.tls_handshakes += 1
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                began = started.pop(event_name.replace(".complete", ".started"), None)
+                if began is not None:
+                    self.connect_seconds += time.perf_counter() - began
+            elif event_name == "http2.send_request_headers.started":
+                self.http2_requests += 1
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        return await super().handle_async_request(request)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection reuse counters."""
+        reused = max(self.requests - self.new_connections, 0)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_rate": round(reused / self.requests, 4) if self.requests else 0.0,
+            "tls_handshakes": self.tls_handshakes,
+            "http2_requests": self.http2_requests,
+            "connect_seconds": round(self.connect_seconds, 4),
+        }
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[TracingTransport] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide async HTTP client used for all upstream LLM traffic.
+
+    The client is created on first use with keep-alive limits from config and
+    HTTP/2 when the optional `h2` package is installed.
+    """
+    global _client, _transport
+    if _client is None or _client.is_closed:
+        http2 = OPENROUTER_HTTP2
+        if http2 and find_spec("h2") is None:
+            logger.warning("OPENROUTER_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1.")
+            http2 = False
+
+        limits = httpx.Limits(
+            max_connections=OPENROUTER_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=OPENROUTER_KEEPALIVE_EXPIRY,
+        )
+        _transport = TracingTransport(http2=http2, limits=limits)
+        _client = httpx.AsyncClient(transport=_transport)
+        logger.info(
+            f"Created shared HTTP client (http2={http2}, max_connections={OPENROUTER_MAX_CONNECTIONS}, "
+            f"keepalive_expiry={OPENROUTER_KEEPALIVE_EXPIRY}s)"
+        )
+    return _client
+
+async def close_http_client():
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+def http_client_stats() -> Dict[str, Any]:
+    """Return connection reuse counters for the shared client."""
+    if _transport is None:
+        return TracingTransport().stats()
+    return _transport.stats()
+
+register_stats("http_client", http_client_stats)
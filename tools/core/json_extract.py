@@ -0,0 +1,76 @@
+# tools/core/json_extract.py
+from typing import Optional, Tuple
+import re
+
+# Everything up to the next bracket outside a string: plain characters and whole
+# string literals (escapes included) are consumed by the regex engine, so the
+# Python loop below only runs once per bracket. Possessive quantifiers keep the
+# engine from saving backtracking state for every string it passes.
+_SKIP = re.compile(r'(?:[^"{}\[\]]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+', re.DOTALL)
+# What may follow an opening bracket in real JSON (rules out prose like "[1]" or "{name}")
+_OBJECT_START = re.compile(r'\{\s*["}]')
+_ARRAY_START = re.compile(r'\[\s*[\[{"\-0-9tfn\]]')
+_OPENERS = {
+    "{[": re.compile(r'[{\[]'),
+    "{": re.compile(r'\{'),
+    "[": re.compile(r'\['),
+}
+
+def find_json_span(text: str, kinds: str = "{[") -> Tuple[Optional[int], Optional[int]]:
+    """
+    Locate the first balanced top-level JSON object or array in text.
+
+    Leading prose, code fences and trailing commentary are skipped. The text
+    is scanned once; brackets inside string literals are ignored.
+
+    Args:
+        text: Raw model output
+        kinds: Which top-level values to look for: "{[" for both, "{" for
+            objects only (skips bracketed prose like "[1]"), "[" for arrays only
+
+    Returns:
+        (start, end) of the JSON value, (start, None) if it starts but is never
+        closed (cut-off output), or (None, None) if there is no JSON at all
+    """
+    search_from = 0
+    while True:
+        opener = _OPENERS[kinds].search(text, search_from)
+        if opener is None:
+            return None, None
+        start = opener.start()
+        check = _OBJECT_START if text[start] == "{" else _ARRAY_START
+        if check.match(text, start):
+            break
+        search_from = start + 1
+
+    depth = 0
+    pos = start
+    end = len(text)
+    while True:
+        pos = _SKIP.match(text, pos).end()
+        # Stopped at the end of the text or at an unterminated string: the JSON was cut off
+        if pos >= end or text[pos] == '"':
+            return start, None
+        if text[pos] in "{[":
+            depth += 1
+        else:
+            depth -= 1
+        pos += 1
+        if depth == 0:
+            return start, pos
+
+def extract_json(text: str, kinds: str = "{[") -> Optional[str]:
+    """
+    Return the first complete JSON value of the given kinds in text, or None.
+
+    The result is a single slice of the input, ready for model_validate_json.
+    """
+    start, end = find_json_span(text, kinds)
+    if end is None:
+        return None
+    return text[start:end]
+
+def looks_truncated(text: str, kinds: str = "{[") -> bool:
+    """Whether JSON output stops part-way through (unclosed string, object or array)."""
+    start, end = find_json_span(text, kinds)
+    return start is not None and end is None
@@ -0,0 +1,19 @@
+# tools/core/metrics.py
+from typing import Any, Callable, Dict
+
+# Named providers that each return a snapshot of their subsystem's counters
+_stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+def register_stats(name: str, provider: Callable[[], Dict[str, Any]]):
+    """
+    Register a stats provider under a name.
+
+    Args:
+        name: Section name used in the collected stats (e.g. "agent_pool")
+        provider: Zero-argument callable returning a JSON-serializable dict
+    """
+    _stats_providers[name] = provider
+
+def collect_stats() -> Dict[str, Dict[str, Any]]:
+    """Collect a snapshot from every registered stats provider."""
+    return {name: provider() for name, provider in _stats_providers.items()}
@@ -1,5 +1,6 @@
 from typing import Dict, List, Optional
 from .base import BaseTool
+from .router import model_router
 
 class ToolRegistry:
     """Registry for managing AI tools."""
@@ -7,11 +8,26 @@ class ToolRegistry:
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
         self._categories: Dict[str, List[str]] = {}
+        # Bumped on every change, so anything built from the registry knows when to rebuild
+        self.version = 0
     
-    def register(self, tool: BaseTool, categories: Optional[List[str]] = None):
-        """Register a tool with optional categories."""
+    def register(
+        self,
+        tool: BaseTool,
+        categories: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        quality_tier: Optional[str] = None
+    ):
+        """
+        Register a tool with optional categories.
+
+        `models` lists the candidate models the router may pick from (defaults
+        to ROUTER_CANDIDATE_MODELS) and `quality_tier` is the minimum tier the
+        tool accepts ("basic", "standard" or "premium").
+        """
         tool_id = tool.id
         self._tools[tool_id] = tool
+        model_router.configure_tool(tool_id, models=models, quality_tier=quality_tier)
         
         # Register categories
         if categories:
@@ -19,6 +35,7 @@ class ToolRegistry:
                 if category not in self._categories:
                     self._categories[category] = []
                 self._categories[category].append(tool_id)
+        self.version += 1
     
     def get_tool(self, tool_id: str) -> Optional[BaseTool]:
         """Get a tool by ID."""
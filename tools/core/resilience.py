@@ -0,0 +1,335 @@
+# tools/core/resilience.py
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import asyncio
+import logging
+import math
+import random
+import time
+
+from agno.exceptions import ModelProviderError
+import httpx
+import openai
+
+from config import (
+    HEDGE_ENABLED,
+    HEDGE_FALLBACK_MODEL,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_DELAY,
+)
+from ..errors import ErrorCode, ToolError
+from .metrics import register_stats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+def classify_error(error: BaseException) -> Optional[ErrorCode]:
+    """
+    Map an upstream failure to a retryable ErrorCode.
+
+    Returns:
+        ErrorCode.RATE_LIMIT or ErrorCode.API_ERROR if retrying may help,
+        None for errors that will fail the same way again (bad request, auth...)
+    """
+    if isinstance(error, ToolError):
+        return error.code if error.code in (ErrorCode.RATE_LIMIT, ErrorCode.API_ERROR) else None
+    if isinstance(error, ModelProviderError):
+        # Agno wraps every failure in ModelProviderError with a default status of 502;
+        # only a status read from the provider's HTTP response says the upstream failed
+        cause = error.__cause__
+        if isinstance(cause, (openai.APIStatusError, httpx.HTTPStatusError)):
+            return _classify_status(cause.response.status_code)
+        if isinstance(cause, (openai.APIConnectionError, httpx.TransportError, ConnectionError)):
+            return ErrorCode.API_ERROR
+        return None
+    if isinstance(error, httpx.HTTPStatusError):
+        return _classify_status(error.response.status_code)
+    if isinstance(error, (httpx.TransportError, ConnectionError)):
+        return ErrorCode.API_ERROR
+    return None
+
+def _classify_status(status_code: int) -> Optional[ErrorCode]:
+    if status_code == 429:
+        return ErrorCode.RATE_LIMIT
+    if status_code in (408, 409) or status_code >= 500:
+        return ErrorCode.API_ERROR
+    return None
+
+def _retry_after_hint(error: BaseException) -> Optional[float]:
+    """Read a Retry-After header from the provider response behind an error, if any."""
+    response = getattr(error.__cause__, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry number."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+class LatencyTracker:
+    """Rolling window of recent upstream latencies, per model."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model_name: str, seconds: float):
+        self._samples.setdefault(model_name, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model_name: str, pct: float) -> Optional[float]:
+        """Return the pct-th percentile latency, or None if there are too few samples."""
+        samples = self._samples.get(model_name)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+        return ordered[index]
+
+class ResilientCaller:
+    """
+    Retries and hedging around upstream LLM calls.
+
+    Calls that fail with a retryable error (rate limit, 5xx, connection
+    problems) are retried with exponential backoff and full jitter. With
+    hedging on, a call that has not answered (or, when streaming, produced its
+    first token) within the model's recent `HEDGE_PERCENTILE` latency gets a
+    duplicate request, optionally to a fallback model; the first to respond
+    wins and the other is cancelled.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 95,
+        hedge_min_delay: float = 1.0,
+        hedge_fallback_model: Optional[str] = None
+    ):
+        """
+        Initialize the caller.
+
+        Args:
+            max_attempts: Total attempts per call, including the first
+            base_delay: Backoff base in seconds
+            max_delay: Upper bound for a single backoff sleep
+            hedge_enabled: Whether to send hedged duplicate requests
+            hedge_percentile: Latency percentile after which to hedge
+            hedge_min_delay: Never hedge sooner than this many seconds
+            hedge_fallback_model: Model for hedged requests (defaults to the same model)
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_fallback_model = hedge_fallback_model or None
+        self.latency = LatencyTracker()
+        self.first_token_latency = LatencyTracker()
+        self.retries = 0
+        self.retry_exhausted = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _hedge_threshold(self, tracker: LatencyTracker, model_name: str) -> Optional[float]:
+        if not self.hedge_enabled:
+            return None
+        observed = tracker.percentile(model_name, self.hedge_percentile)
+        return max(observed, self.hedge_min_delay) if observed is not None else None
+
+    async def _backoff_or_raise(self, error: Exception, attempt: int, label: str):
+        """Sleep before the next attempt, or raise if the error is final."""
+        code = classify_error(error)
+        if code is None:
+            raise error
+        hint = _retry_after_hint(error)
+        if attempt + 1 >= self.max_attempts:
+            self.retry_exhausted += 1
+            details = {"attempts": attempt + 1, "cause": str(error)}
+            if code == ErrorCode.RATE_LIMIT:
+                details["retry_after"] = math.ceil(hint if hint is not None else self.max_delay)
+            raise ToolError(
+                code,
+                "The AI service is busy or unavailable. Please try again shortly."
+                if code == ErrorCode.RATE_LIMIT else
+                "The AI service returned an error. Please try again.",
+                details
+            ) from error
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+        if hint is not None:
+            delay = min(max(delay, hint), self.max_delay)
+        self.retries += 1
+        logger.warning(f"{label}: {code.value} on attempt {attempt + 1} ({error}); retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def call(
+        self,
+        fn: Callable[[str], Awaitable[T]],
+        model_name: str,
+        label: str = "llm",
+        fallback_model: Optional[str] = None
+    ) -> T:
+        """
+        Run `fn(model_name)` with retries and optional hedging.
+
+        Args:
+            fn: Makes one upstream call for the given model
+            model_name: Primary model
+            label: Name used in logs (usually the tool id)
+            fallback_model: Model for hedged requests when HEDGE_FALLBACK_MODEL is not set
+
+        Returns:
+            The first successful result
+
+        Raises:
+            ToolError: With RATE_LIMIT or API_ERROR once retries are exhausted
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                return await self._hedged(fn, model_name, label, fallback_model)
+            except Exception as e:
+                await self._backoff_or_raise(e, attempt, label)
+
+    async def _timed(self, fn: Callable[[str], Awaitable[T]], model_name: str) -> T:
+        started = time.perf_counter()
+        result = await fn(model_name)
+        self.latency.record(model_name, time.perf_counter() - started)
+        return result
+
+    async def _hedged(self, fn: Callable[[str], Awaitable[T]], model_name: str, label: str, fallback_model: Optional[str]) -> T:
+        threshold = self._hedge_threshold(self.latency, model_name)
+        primary = asyncio.ensure_future(self._timed(fn, model_name))
+        if threshold is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if not done:
+                hedge_model = self.hedge_fallback_model or fallback_model or model_name
+                logger.info(f"{label}: no response after {threshold:.2f}s; hedging with {hedge_model}")
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(self._timed(fn, hedge_model)))
+            # Take the first success; only fail once every request has failed
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                if not tasks:
+                    raise next(iter(done)).exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(
+        self,
+        open_stream: Callable[[str], AsyncIterator[T]],
+        model_name: str,
+        label: str = "llm",
+        fallback_model: Optional[str] = None
+    ) -> AsyncIterator[T]:
+        """
+        Stream from `open_stream(model_name)` with retries and hedging on the first token.
+
+        Retries only happen before the first chunk is yielded; once output has
+        reached the caller a failure is raised as-is.
+        """
+        for attempt in range(self.max_attempts):
+            try:
+                chunks, first = await self._first_chunk(open_stream, model_name, label, fallback_model)
+            except Exception as e:
+                await self._backoff_or_raise(e, attempt, label)
+                continue
+            try:
+                if first is not None:
+                    yield first
+                    async for chunk in chunks:
+                        yield chunk
+            finally:
+                await chunks.aclose()
+            return
+
+    async def _first_chunk(self, open_stream, model_name: str, label: str, fallback_model: Optional[str]):
+        """Open a stream and wait for its first chunk, hedging if it is slow."""
+        async def start(model):
+            started = time.perf_counter()
+            chunks = open_stream(model)
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+            except BaseException:
+                await chunks.aclose()
+                raise
+            self.first_token_latency.record(model, time.perf_counter() - started)
+            return chunks, first
+
+        threshold = self._hedge_threshold(self.first_token_latency, model_name)
+        primary = asyncio.ensure_future(start(model_name))
+        if threshold is None:
+            return await primary
+
+        tasks = {primary}
+        done = set()
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if not done:
+                hedge_model = self.hedge_fallback_model or fallback_model or model_name
+                logger.info(f"{label}: no first token after {threshold:.2f}s; hedging with {hedge_model}")
+                self.hedges += 1
+                tasks.add(asyncio.ensure_future(start(hedge_model)))
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        winner = task
+                        break
+                if winner is not None:
+                    return winner.result()
+                if not tasks:
+                    raise next(iter(done)).exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            # A loser that got its first chunk at the same moment still holds an open stream
+            for task in done:
+                if task is not winner and not task.cancelled() and task.exception() is None:
+                    await task.result()[0].aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return retry and hedging counters."""
+        return {
+            "retries": self.retries,
+            "retry_exhausted": self.retry_exhausted,
+            "hedging_enabled": self.hedge_enabled,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_fallback_model": self.hedge_fallback_model,
+        }
+
+# Create a singleton instance
+resilient_caller = ResilientCaller(
+    max_attempts=RETRY_MAX_ATTEMPTS,
+    base_delay=RETRY_BASE_DELAY,
+    max_delay=RETRY_MAX_DELAY,
+    hedge_enabled=HEDGE_ENABLED,
+    hedge_percentile=HEDGE_PERCENTILE,
+    hedge_min_delay=HEDGE_MIN_DELAY,
+    hedge_fallback_model=HEDGE_FALLBACK_MODEL
+)
+register_stats("resilience", resilient_caller.stats)
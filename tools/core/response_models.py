@@ -0,0 +1,94 @@
+# tools/core/response_models.py
+from dataclasses import dataclass
+from typing import Any, Dict, Type
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from agno.agent import Agent
+from pydantic import BaseModel, TypeAdapter
+
+from .metrics import register_stats
+from .streaming import list_item_adapters
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True, slots=True)
+class ResponseModelSpec:
+    """Everything structured output needs from a response model, built once."""
+    model: Type[BaseModel]
+    # JSON schema of the model (as used for the prompt)
+    schema: Dict[str, Any]
+    # Short digest of the schema, for cache keys
+    fingerprint: str
+    # The JSON instructions added to the system message (Agno's format)
+    json_prompt: str
+    # Validator for the whole response
+    adapter: TypeAdapter
+    # Validators for single list elements, for streaming (see list_item_adapters)
+    item_adapters: Dict[str, TypeAdapter]
+
+class ResponseModelRegistry:
+    """
+    Compiled ResponseModelSpecs, one per response model.
+
+    Agno rebuilds a model's JSON schema and prompt on every run; tools compile
+    their response model here once, when the tool class is created, and every
+    request reuses the result.
+    """
+
+    def __init__(self):
+        self._specs: Dict[Type[BaseModel], ResponseModelSpec] = {}
+        self._lock = threading.Lock()
+        self._build_ms: Dict[str, float] = {}
+        self.hits = 0
+
+    def compile(self, model: Type[BaseModel]) -> ResponseModelSpec:
+        """
+        Return the spec for a response model, building it on first use.
+
+        Args:
+            model: The Pydantic model the LLM output is parsed into
+
+        Returns:
+            The model's ResponseModelSpec (the same object on every call)
+        """
+        spec = self._specs.get(model)
+        if spec is not None:
+            self.hits += 1
+            return spec
+        with self._lock:
+            spec = self._specs.get(model)
+            if spec is None:
+                started = time.perf_counter()
+                spec = self._build(model)
+                self._build_ms[model.__name__] = round((time.perf_counter() - started) * 1000, 3)
+                self._specs[model] = spec
+                logger.debug(f"Compiled response model {model.__name__} in {self._build_ms[model.__name__]} ms")
+        return spec
+
+    @staticmethod
+    def _build(model: Type[BaseModel]) -> ResponseModelSpec:
+        schema = model.model_json_schema()
+        return ResponseModelSpec(
+            model=model,
+            schema=schema,
+            fingerprint=hashlib.sha256(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()[:16],
+            json_prompt=Agent(response_model=model).get_json_output_prompt(),
+            adapter=TypeAdapter(model),
+            item_adapters=list_item_adapters(model),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the compiled models, how long each took to build and how often one was reused."""
+        return {
+            "models": len(self._specs),
+            "hits": self.hits,
+            "build_ms": dict(self._build_ms),
+        }
+
+# Create a singleton instance
+response_models = ResponseModelRegistry()
+register_stats("response_models", response_models.stats)
@@ -0,0 +1,89 @@
+# tools/core/result_store.py
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import secrets
+import threading
+import time
+
+from config import RESULT_STORE_MAX_ENTRIES, RESULT_STORE_TTL
+from .metrics import register_stats
+from .results import ToolResult
+
+class ResultStore:
+    """
+    Recently shown tool results, by an unguessable id.
+
+    Results pages that load their tabs on demand keep the result here, so the
+    tab fragments are rendered from the same result without generating it
+    again. Results are immutable and stored as they are. Entries live in
+    memory only (per process), in an LRU bounded by entry count with a TTL,
+    so they are not shared between workers and do not survive a restart
+    (hence LAZY_RESULT_TABS is off by default).
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 1800):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum number of results kept
+            ttl: Seconds a result stays available
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, ToolResult, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stores = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, tool_id: str, result: ToolResult) -> str:
+        """
+        Keep a result.
+
+        Args:
+            tool_id: The tool that produced the result
+            result: The result shown on the page
+
+        Returns:
+            The id to fetch the result with
+        """
+        result_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._entries[result_id] = (tool_id, result, time.time() + self.ttl)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result_id
+
+    def get(self, tool_id: str, result_id: str) -> Optional[ToolResult]:
+        """Return a stored result of a tool, or None if it is unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(result_id)
+            if entry is not None and entry[2] <= time.time():
+                del self._entries[result_id]
+                entry = None
+            if entry is None or entry[0] != tool_id:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(result_id)
+            self.hits += 1
+            return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store/hit/miss/eviction counters."""
+        return {
+            "stores": self.stores,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+        }
+
+# Create a singleton instance
+result_store = ResultStore(max_entries=RESULT_STORE_MAX_ENTRIES, ttl=RESULT_STORE_TTL)
+register_stats("result_store", result_store.stats)
@@ -0,0 +1,98 @@
+# tools/core/results.py
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Type
+from pydantic import BaseModel
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ToolResult:
+    """
+    Successful output of a tool, handed to the results pages.
+
+    Results are immutable, so a shared or cached result can go to any number
+    of callers without copying. Failures are still reported as error
+    dictionaries ({"error": ..., "error_code": ...}).
+    """
+    # The form inputs the result was produced from
+    metadata: Dict[str, Any]
+    # Notices shown above the results (e.g. truncated output)
+    warnings: Tuple[str, ...] = ()
+    # Seconds spent producing the result (None when served from the cache)
+    elapsed: Optional[float] = None
+
+    def to_json_data(self) -> Dict[str, Any]:
+        """Plain JSON data for the result cache; the inverse of from_json_data."""
+        return {"metadata": self.metadata, "warnings": list(self.warnings)}
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class GenerationResult(ToolResult):
+    """Output of a text generation tool."""
+    # Display lines: the formatted structured output, or the raw text split into lines
+    lines: Tuple[str, ...]
+    # The validated response model, or None when the output was not structured
+    structured: Optional[BaseModel] = None
+    # The model's text when it could not be parsed (kept for debugging)
+    raw_text: Optional[str] = None
+    truncated: bool = False
+    # Which model produced the output and how many tokens it wrote
+    model: Optional[str] = None
+    output_tokens: Optional[int] = None
+
+    @property
+    def is_structured(self) -> bool:
+        return self.structured is not None
+
+    def to_json_data(self) -> Dict[str, Any]:
+        return {
+            **ToolResult.to_json_data(self),
+            "lines": list(self.lines),
+            # Serialized here, once, only because the result is being cached
+            "structured": self.structured.model_dump(mode="json") if self.structured is not None else None,
+            "raw_text": self.raw_text,
+            "truncated": self.truncated,
+            "model": self.model,
+            "output_tokens": self.output_tokens,
+        }
+
+    @classmethod
+    def from_json_data(cls, data: Dict[str, Any], response_model: Optional[Type[BaseModel]] = None) -> "GenerationResult":
+        """
+        Rebuild a cached result.
+
+        Args:
+            data: What to_json_data returned
+            response_model: The tool's response model, to rebuild the structured output with
+        """
+        structured = data.get("structured")
+        return cls(
+            metadata=data["metadata"],
+            warnings=tuple(data.get("warnings", ())),
+            lines=tuple(data["lines"]),
+            structured=response_model.model_validate(structured) if response_model and structured is not None else None,
+            raw_text=data.get("raw_text"),
+            truncated=data.get("truncated", False),
+            model=data.get("model"),
+            output_tokens=data.get("output_tokens"),
+        )
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TransformationResult(ToolResult):
+    """Output of a text transformation tool."""
+    original_text: str
+    transformed_text: str
+
+    def to_json_data(self) -> Dict[str, Any]:
+        return {
+            **ToolResult.to_json_data(self),
+            "original_text": self.original_text,
+            "transformed_text": self.transformed_text,
+        }
+
+    @classmethod
+    def from_json_data(cls, data: Dict[str, Any]) -> "TransformationResult":
+        """Rebuild a cached result from what to_json_data returned."""
+        return cls(
+            metadata=data["metadata"],
+            warnings=tuple(data.get("warnings", ())),
+            original_text=data["original_text"],
+            transformed_text=data["transformed_text"],
+        )
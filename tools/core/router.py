@@ -0,0 +1,304 @@
+# tools/core/router.py
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+import logging
+import random
+import time
+
+from config import (
+    DEFAULT_MODEL,
+    MODEL_QUALITY_TIERS,
+    ROUTER_CANDIDATE_MODELS,
+    ROUTER_EWMA_ALPHA,
+    ROUTER_EXPLORE_RATE,
+    ROUTER_MAX_ERROR_RATE,
+    ROUTER_UNHEALTHY_COOLDOWN,
+)
+from .metrics import register_stats
+from .resilience import classify_error
+
+logger = logging.getLogger(__name__)
+
+# Quality tiers in increasing order; a tool's tier is the minimum it accepts
+QUALITY_TIERS = ["basic", "standard", "premium"]
+DEFAULT_QUALITY_TIER = "standard"
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text when the provider did not report usage."""
+    return max(len(text) // 4, 1) if text else 0
+
+def output_tokens(response: Any) -> Optional[int]:
+    """Read the output token count from an Agno run response, if it has one."""
+    metrics = getattr(response, "metrics", None)
+    if not isinstance(metrics, dict):
+        return None
+    value = metrics.get("output_tokens")
+    if isinstance(value, list):
+        return sum(value) if value else None
+    return value
+
+def finish_reason(agent: Any) -> Optional[str]:
+    """Read why the provider ended an agent's last response ("stop", "length"...), if it said."""
+    return getattr(getattr(agent, "model", None), "finish_reason", None)
+
+class CallObservation:
+    """Output size of one tracked call, filled in by the caller."""
+
+    def __init__(self):
+        self.tokens: Optional[int] = None
+
+class ModelStats:
+    """Live EWMA latency, error rate and throughput for one model."""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.tokens_per_second: Optional[float] = None
+        self.successes = 0
+        self.errors = 0
+        self.last_error_at: Optional[float] = None
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else self.alpha * sample + (1 - self.alpha) * current
+
+    def record_success(self, seconds: float, tokens: Optional[int]):
+        self.successes += 1
+        self.latency = self._ewma(self.latency, seconds)
+        self.error_rate = self._ewma(self.error_rate, 0.0)
+        if tokens and seconds > 0:
+            self.tokens_per_second = self._ewma(self.tokens_per_second, tokens / seconds)
+
+    def record_error(self):
+        self.errors += 1
+        self.error_rate = self._ewma(self.error_rate, 1.0)
+        self.last_error_at = time.monotonic()
+
+    def healthy(self, max_error_rate: float, cooldown: float) -> bool:
+        """Unhealthy models get another chance once `cooldown` seconds pass without errors."""
+        if self.error_rate <= max_error_rate:
+            return True
+        return self.last_error_at is not None and time.monotonic() - self.last_error_at >= cooldown
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ewma_latency": round(self.latency, 4) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 4),
+            "tokens_per_second": round(self.tokens_per_second, 2) if self.tokens_per_second is not None else None,
+            "successes": self.successes,
+            "errors": self.errors,
+        }
+
+class ModelRouter:
+    """
+    Picks the upstream model for each tool call.
+
+    Each tool has a list of candidate models and a minimum quality tier (set
+    when it is registered). Among the candidates that meet the tier, the
+    router picks the healthy one with the highest EWMA throughput (output
+    tokens per second of the whole call). Throughput rather than latency, so
+    a model is not preferred just because its answers were shorter. Candidates
+    with no measurements yet are tried in declared order, and a small share
+    of calls goes to a random candidate so the others stay measured.
+    """
+
+    def __init__(
+        self,
+        default_models: List[str],
+        model_tiers: Dict[str, str],
+        alpha: float = 0.2,
+        max_error_rate: float = 0.5,
+        unhealthy_cooldown: float = 30.0,
+        explore_rate: float = 0.05
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            default_models: Candidates for tools that don't declare their own
+            model_tiers: Model name -> quality tier (unlisted models are "standard")
+            alpha: EWMA smoothing factor for new samples
+            max_error_rate: Error rate above which a model is skipped
+            unhealthy_cooldown: Seconds after its last error before a skipped model is retried
+            explore_rate: Share of calls routed to a random eligible candidate
+        """
+        self.default_models = default_models
+        self.model_tiers = model_tiers
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.unhealthy_cooldown = unhealthy_cooldown
+        self.explore_rate = explore_rate
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, ModelStats] = {}
+        self._last_choice: Dict[str, Dict[str, Any]] = {}
+        self._tier_warnings = set()
+
+    def configure_tool(self, tool_id: str, models: Optional[List[str]] = None, quality_tier: Optional[str] = None):
+        """
+        Set a tool's candidate models and minimum quality tier.
+
+        Args:
+            tool_id: The tool's id
+            models: Candidate models in order of preference (defaults to the global list)
+            quality_tier: One of QUALITY_TIERS (defaults to "standard")
+        """
+        tier = quality_tier or DEFAULT_QUALITY_TIER
+        if tier not in QUALITY_TIERS:
+            raise ValueError(f"Unknown quality tier '{tier}' for tool {tool_id}; expected one of {QUALITY_TIERS}")
+        self._tools[tool_id] = {"models": list(models) if models else None, "quality_tier": tier}
+
+    def tier_of(self, model_name: str) -> str:
+        return self.model_tiers.get(model_name, DEFAULT_QUALITY_TIER)
+
+    def candidates(self, tool_id: str) -> List[str]:
+        """Return the models a tool may use, in declared order."""
+        config = self._tools.get(tool_id, {})
+        return config.get("models") or self.default_models
+
+    def meeting_tier(self, tool_id: str) -> List[str]:
+        """Return the candidates whose tier is at least the tool's quality tier."""
+        required = QUALITY_TIERS.index(self._tools.get(tool_id, {}).get("quality_tier", DEFAULT_QUALITY_TIER))
+        return [m for m in self.candidates(tool_id) if QUALITY_TIERS.index(self.tier_of(m)) >= required]
+
+    def eligible(self, tool_id: str) -> List[str]:
+        """Return the candidates that meet the tool's quality tier."""
+        models = self.meeting_tier(tool_id)
+        if not models:
+            # Better to answer with what we have than not at all
+            if tool_id not in self._tier_warnings:
+                self._tier_warnings.add(tool_id)
+                logger.warning(f"No candidate model meets the quality tier for {tool_id}; using all candidates.")
+            models = self.candidates(tool_id)
+        return models
+
+    def check(self):
+        """
+        Fail fast on routing that cannot work, before the app serves requests.
+
+        A tool none of whose candidates meets its quality tier only gets a
+        warning: it uses all its candidates (see eligible), so single-model
+        deployments keep working.
+
+        Raises:
+            RuntimeError: If a model has an unknown tier or a tool has no candidate
+                models (neither DEFAULT_MODEL nor ROUTER_CANDIDATE_MODELS is set)
+        """
+        problems = [
+            f"{model}: unknown quality tier '{tier}' in MODEL_QUALITY_TIERS; expected one of {QUALITY_TIERS}"
+            for model, tier in self.model_tiers.items() if tier not in QUALITY_TIERS
+        ]
+        if problems:
+            raise RuntimeError("Model routing is misconfigured:\n  " + "\n  ".join(problems))
+        for tool_id, config in self._tools.items():
+            candidates = self.candidates(tool_id)
+            if not candidates:
+                problems.append(f"{tool_id}: no candidate models (set DEFAULT_MODEL or ROUTER_CANDIDATE_MODELS)")
+            elif not self.meeting_tier(tool_id):
+                tiers = ", ".join(f"{model}={self.tier_of(model)}" for model in candidates)
+                self._tier_warnings.add(tool_id)
+                logger.warning(
+                    f"{tool_id}: wants a '{config['quality_tier']}' model but has only {tiers}; "
+                    f"using all candidates (add a candidate or set its tier in MODEL_QUALITY_TIERS)"
+                )
+        if problems:
+            raise RuntimeError("Model routing is misconfigured:\n  " + "\n  ".join(problems))
+
+    def stats_for(self, model_name: str) -> ModelStats:
+        if model_name not in self._stats:
+            self._stats[model_name] = ModelStats(self.alpha)
+        return self._stats[model_name]
+
+    def ranked(self, tool_id: str) -> List[str]:
+        """Eligible models, best first: healthy before unhealthy, then measured by throughput, then declared order."""
+        models = self.eligible(tool_id)
+
+        def sort_key(item):
+            position, model = item
+            stats = self.stats_for(model)
+            healthy = stats.healthy(self.max_error_rate, self.unhealthy_cooldown)
+            # Unmeasured models go first, in declared order, so each gets measured
+            throughput = stats.tokens_per_second if stats.tokens_per_second is not None else 0.0
+            return (not healthy, stats.tokens_per_second is not None, -throughput, position)
+
+        return [model for _, model in sorted(enumerate(models), key=sort_key)]
+
+    def choose(self, tool_id: str) -> str:
+        """Return the model to use for one call of a tool."""
+        ranked = self.ranked(tool_id)
+        choice, reason = ranked[0], "best"
+        healthy = [m for m in ranked if self.stats_for(m).healthy(self.max_error_rate, self.unhealthy_cooldown)]
+        if len(healthy) > 1 and random.random() < self.explore_rate:
+            choice, reason = random.choice(healthy[1:]), "explore"
+        self._last_choice[tool_id] = {"model": choice, "reason": reason, "at": time.time()}
+        return choice
+
+    def runner_up(self, tool_id: str, model_name: str) -> Optional[str]:
+        """Return the next best eligible model after `model_name` (used for hedged requests)."""
+        for model in self.ranked(tool_id):
+            if model != model_name:
+                return model
+        return None
+
+    @asynccontextmanager
+    async def track(self, model_name: str) -> AsyncIterator[CallObservation]:
+        """
+        Time an upstream call and record its outcome for `model_name`.
+
+        Set `tokens` on the yielded observation once the output is known.
+        Only upstream failures (see classify_error) count against the model;
+        cancelled calls (hedge losers, client disconnects) are not recorded.
+        """
+        observation = CallObservation()
+        started = time.perf_counter()
+        try:
+            yield observation
+        except Exception as error:
+            if classify_error(error) is not None:
+                self.record_error(model_name)
+            raise
+        self.record_success(model_name, time.perf_counter() - started, observation.tokens)
+
+    def record_success(self, model_name: str, seconds: float, tokens: Optional[int] = None):
+        self.stats_for(model_name).record_success(seconds, tokens)
+
+    def record_error(self, model_name: str):
+        self.stats_for(model_name).record_error()
+
+    def routing_table(self) -> List[Dict[str, Any]]:
+        """Current routing state per tool, for the admin view."""
+        table = []
+        for tool_id, config in self._tools.items():
+            table.append({
+                "tool": tool_id,
+                "quality_tier": config["quality_tier"],
+                "candidates": self.candidates(tool_id),
+                "ranked": self.ranked(tool_id),
+                "last_choice": self._last_choice.get(tool_id),
+            })
+        return table
+
+    def model_table(self) -> Dict[str, Dict[str, Any]]:
+        """Live stats per model, for the admin view."""
+        models = set(self._stats) | {m for tool_id in self._tools for m in self.candidates(tool_id)}
+        return {
+            model: {
+                "tier": self.tier_of(model),
+                "healthy": self.stats_for(model).healthy(self.max_error_rate, self.unhealthy_cooldown),
+                **self.stats_for(model).snapshot(),
+            }
+            for model in sorted(models)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tools": self.routing_table(), "models": self.model_table()}
+
+# Create a singleton instance
+model_router = ModelRouter(
+    default_models=ROUTER_CANDIDATE_MODELS or ([DEFAULT_MODEL] if DEFAULT_MODEL else []),
+    model_tiers=MODEL_QUALITY_TIERS,
+    alpha=ROUTER_EWMA_ALPHA,
+    max_error_rate=ROUTER_MAX_ERROR_RATE,
+    unhealthy_cooldown=ROUTER_UNHEALTHY_COOLDOWN,
+    explore_rate=ROUTER_EXPLORE_RATE
+)
+register_stats("router", model_router.stats)
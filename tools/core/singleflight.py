@@ -0,0 +1,143 @@
+# tools/core/singleflight.py
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from .metrics import register_stats
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    """One shared upstream call and the events it has produced so far."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Any]] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Condition()
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical requests onto one upstream call.
+
+    The first caller for a key starts the call as a background task; callers
+    arriving while it runs subscribe to the same call and see every event it
+    has produced, replayed from the start. The task is only cancelled when the
+    last subscriber goes away, so one client disconnecting does not kill the
+    generation for the others. Once the call finishes the key is released.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.joined = 0
+        self.abandoned = 0
+
+    async def stream(
+        self,
+        key: str,
+        producer: Callable[[], AsyncIterator[Tuple[str, Any]]]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run or join the call for a key, yielding its (event, payload) tuples.
+
+        Args:
+            key: Identifies identical requests
+            producer: Starts the call; only invoked if no call for the key is running
+
+        Yields:
+            Every event the shared call produces. Payloads are shared between
+            subscribers, not copied; tool results are immutable ToolResults.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, producer))
+            self.leaders += 1
+        else:
+            self.joined += 1
+
+        flight.subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: index < len(flight.events) or flight.done)
+                while index < len(flight.events):
+                    event, payload = flight.events[index]
+                    index += 1
+                    yield event, payload
+                if flight.done and index >= len(flight.events):
+                    break
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # Nobody is waiting any more, so stop paying for the upstream call
+                logger.info("All waiters left an in-flight generation; cancelling it.")
+                self.abandoned += 1
+                self._release(key, flight)
+                flight.task.cancel()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run or join the call for a key and return its result.
+
+        Args:
+            key: Identifies identical requests
+            fn: Coroutine function making the call; only invoked if none is running
+
+        Returns:
+            The shared call's result (the same object for every caller)
+        """
+        async def producer():
+            yield "result", await fn()
+
+        result = None
+        async for event, payload in self.stream(key, producer):
+            if event == "result":
+                result = payload
+        return result
+
+    async def _run(self, key: str, flight: _Flight, producer: Callable[[], AsyncIterator[Tuple[str, Any]]]):
+        """Drive the producer and publish its events to every subscriber."""
+        try:
+            async for event in producer():
+                async with flight.changed:
+                    flight.events.append(event)
+                    flight.changed.notify_all()
+        except asyncio.CancelledError:
+            # Only happens once every subscriber has left
+            flight.done = True
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            self._release(key, flight)
+        async with flight.changed:
+            flight.done = True
+            flight.changed.notify_all()
+
+    def _release(self, key: str, flight: _Flight):
+        """Stop routing new callers to a flight that is finished or abandoned."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return coalescing counters."""
+        calls = self.leaders + self.joined
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced": self.joined,
+            "coalesce_rate": round(self.joined / calls, 4) if calls else 0.0,
+            "abandoned": self.abandoned,
+            "in_flight": len(self._flights),
+        }
+
+# Create a singleton instance
+single_flight = SingleFlight()
+register_stats("single_flight", single_flight.stats)
@@ -0,0 +1,178 @@
+# tools/core/streaming.py
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+from pydantic import AliasChoices, BaseModel, TypeAdapter, ValidationError
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def list_item_adapters(response_model: Type[BaseModel]) -> Dict[str, TypeAdapter]:
+    """
+    Map each top-level list field of a response model to a validator for its items.
+
+    Args:
+        response_model: The Pydantic model the LLM output is parsed into
+
+    Returns:
+        Dictionary of field name (and each input alias) -> TypeAdapter for one list element
+    """
+    adapters = {}
+    for name, field in response_model.model_fields.items():
+        annotation = field.annotation
+        # Unwrap Optional[List[X]]
+        if get_origin(annotation) is Union:
+            non_none = [arg for arg in get_args(annotation) if arg is not type(None)]
+            annotation = non_none[0] if len(non_none) == 1 else annotation
+        if get_origin(annotation) is list:
+            item_args = get_args(annotation)
+            adapter = TypeAdapter(item_args[0] if item_args else Any)
+            # Items may arrive under any name the field accepts on input
+            alias = field.validation_alias
+            names = alias.choices if isinstance(alias, AliasChoices) else [alias or name]
+            for key in names:
+                if isinstance(key, str):
+                    adapters[key] = adapter
+    return adapters
+
+class IncrementalListParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Feed it text as it arrives; it returns each element of the tracked top-level
+    array fields as soon as the element is complete (closing brace, bracket or
+    quote), validated against the field's item type. Each character is scanned
+    once, and text before the element being built is discarded. Anything before
+    the first '{' (e.g. a markdown code fence) is skipped.
+    """
+
+    def __init__(self, item_adapters: Dict[str, TypeAdapter]):
+        """
+        Initialize the parser.
+
+        Args:
+            item_adapters: Field name -> TypeAdapter for the arrays to watch
+        """
+        self._adapters = item_adapters
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_start: Optional[int] = None
+        self._last_key: Optional[str] = None
+        self._active_field: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._item_kind: Optional[str] = None  # "string", "container" or "scalar"
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Consume a chunk of streamed output.
+
+        Args:
+            text: The next piece of LLM output
+
+        Returns:
+            List of (field name, validated item) for elements completed by this chunk
+        """
+        completed: List[Tuple[str, Any]] = []
+        self._buffer += text
+        buf = self._buffer
+        i = self._pos
+
+        while i < len(buf):
+            ch = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._last_key = self._loads(buf[self._key_start:i + 1])
+                        self._key_start = None
+                    elif self._item_kind == "string" and self._depth == 2:
+                        self._emit(buf[self._item_start:i + 1], completed)
+                i += 1
+                continue
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                i += 1
+                continue
+
+            in_tracked_array = self._active_field is not None and self._depth == 2
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+                    self._expect_key = False
+                elif in_tracked_array and self._item_start is None:
+                    self._item_start, self._item_kind = i, "string"
+            elif ch in "{[":
+                if in_tracked_array and self._item_start is None:
+                    self._item_start, self._item_kind = i, "container"
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._last_key in self._adapters:
+                    self._active_field = self._last_key
+            elif ch in "}]":
+                if in_tracked_array and self._item_kind == "scalar":
+                    self._emit(buf[self._item_start:i], completed)
+                self._depth -= 1
+                if self._depth == 2 and self._active_field is not None and self._item_kind == "container":
+                    self._emit(buf[self._item_start:i + 1], completed)
+                elif self._depth == 1:
+                    self._active_field = None
+            elif ch == ",":
+                if self._depth == 1:
+                    self._expect_key = True
+                elif in_tracked_array and self._item_kind == "scalar":
+                    self._emit(buf[self._item_start:i], completed)
+            elif not ch.isspace() and ch != ":":
+                if in_tracked_array and self._item_start is None:
+                    self._item_start, self._item_kind = i, "scalar"
+            i += 1
+
+        self._compact(i)
+        return completed
+
+    def _compact(self, scanned_to: int):
+        """Drop buffered text that no pending key or element still needs."""
+        keep_from = min(
+            (pos for pos in (self._key_start, self._item_start) if pos is not None),
+            default=scanned_to
+        )
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            if self._key_start is not None:
+                self._key_start -= keep_from
+            if self._item_start is not None:
+                self._item_start -= keep_from
+        self._pos = scanned_to - keep_from
+
+    @staticmethod
+    def _loads(text: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def _emit(self, text: str, completed: List[Tuple[str, Any]]):
+        """Validate a completed element and queue it."""
+        field = self._active_field
+        self._item_start, self._item_kind = None, None
+        try:
+            item = self._adapters[field].validate_json(text)
+        except ValidationError as e:
+            logger.debug(f"Skipping streamed {field} item that failed validation: {e}")
+            return
+        completed.append((field, item))
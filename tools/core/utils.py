@@ -1,13 +1,42 @@
 # tools/core/utils.py
 from agno.agent import Agent
 from agno.models.openrouter import OpenRouter
-from typing import Optional, Type
+from typing import AsyncIterator, Optional, Type
 from pydantic import BaseModel
 import logging # Add logging
 
+from config import OUTPUT_BUDGET_MAX_TOKENS
+from .http_client import get_http_client
+from .response_models import response_models
+
 logger = logging.getLogger(__name__)
 
-def create_agno_agent(model_name, api_key=None, base_url=None, response_model: Optional[Type[BaseModel]] = None):
+class TrackedOpenRouter(OpenRouter):
+    """OpenRouter model that remembers why the provider ended its last response (Agno drops it)."""
+
+    # "stop", "length"... as reported by the provider; None if it did not say
+    finish_reason: Optional[str] = None
+
+    async def aresponse(self, messages):
+        self.finish_reason = None
+        return await super().aresponse(messages)
+
+    async def aresponse_stream(self, messages) -> AsyncIterator:
+        self.finish_reason = None
+        async for model_response in super().aresponse_stream(messages):
+            yield model_response
+
+    def parse_provider_response(self, response):
+        if response.choices:
+            self.finish_reason = response.choices[0].finish_reason
+        return super().parse_provider_response(response)
+
+    def parse_provider_response_delta(self, response_delta):
+        if response_delta.choices and response_delta.choices[0].finish_reason:
+            self.finish_reason = response_delta.choices[0].finish_reason
+        return super().parse_provider_response_delta(response_delta)
+
+def create_agno_agent(model_name, api_key=None, base_url=None, response_model: Optional[Type[BaseModel]] = None, system_message: Optional[str] = None, parse_response: bool = True, max_tokens: Optional[int] = None):
     """
     Create an Agno Agent connected to OpenRouter.
 
@@ -16,23 +45,24 @@ def create_agno_agent(model_name, api_key=None, base_url=None, response_model: O
         api_key: OpenRouter API key (optional, defaults to env var OPENROUTER_API_KEY)
         base_url: Base URL for OpenRouter API (optional)
         response_model: Optional Pydantic model for structured output
+        system_message: Optional system prompt for the agent
+        parse_response: Whether Agno parses output into the response_model. Tools turn
+            this off and parse the raw text themselves (Agno never streams an agent
+            that has a response_model, and rebuilds its JSON prompt on every run).
+        max_tokens: Output token budget for the tool (defaults to OUTPUT_BUDGET_MAX_TOKENS)
 
     Returns:
         An initialized Agno Agent
     """
-    # --- Define the desired max_tokens value ---
-    # Using the requested 32000, but be aware of model limits.
-    MAX_OUTPUT_TOKENS = 32000
-    # A safer default might be 4096 or 8192 if 32k causes issues.
+    # Each tool passes a budget sized to its output; the global cap is the fallback
+    max_tokens = max_tokens or OUTPUT_BUDGET_MAX_TOKENS
 
     # Set up model parameters
     model_kwargs = {
         "id": model_name,
-        # --- Add max_tokens parameter ---
-        "max_tokens": MAX_OUTPUT_TOKENS,
-        # --------------------------------
+        "max_tokens": max_tokens,
     }
-    logger.info(f"Initializing OpenRouter model '{model_name}' with max_tokens={MAX_OUTPUT_TOKENS}")
+    logger.info(f"Initializing OpenRouter model '{model_name}' with max_tokens={max_tokens}")
 
     # Add optional API key and base URL if provided
     if api_key:
@@ -40,9 +70,16 @@ def create_agno_agent(model_name, api_key=None, base_url=None, response_model: O
     if base_url:
         model_kwargs["base_url"] = base_url
 
+    # Share one keep-alive connection pool across every model we build
+    model_kwargs["http_client"] = get_http_client()
+
+    if response_model and not parse_response:
+        # Agno only asks for JSON mode itself when it parses the response
+        model_kwargs["request_params"] = {"response_format": {"type": "json_object"}}
+
     # Create the model instance
     try:
-        model = OpenRouter(**model_kwargs)
+        model = TrackedOpenRouter(**model_kwargs)
     except Exception as e:
         logger.error(f"Failed to initialize OpenRouter model: {e}", exc_info=True)
         # Handle error appropriately, maybe raise it or return a default/dummy agent
@@ -64,6 +101,18 @@ def create_agno_agent(model_name, api_key=None, base_url=None, response_model: O
         # agent_kwargs.pop("markdown", None)
         # logger.info("Agent markdown support disabled due to response_model.")
 
+    if response_model and not parse_response:
+        # The caller parses the output, so the agent gets the model's precompiled
+        # JSON instructions in its system message instead of the model itself
+        agent_kwargs.pop("response_model")
+        json_prompt = response_models.compile(response_model).json_prompt
+        system_message = f"{system_message}\n{json_prompt}" if system_message else json_prompt
+
+    if system_message:
+        agent_kwargs["system_message"] = system_message
+    if not parse_response:
+        agent_kwargs["parse_response"] = False
+
 
     # Create and return the agent
     try:
@@ -7,6 +7,8 @@ class ErrorCode(Enum):
     API_ERROR = "api_error"
     RATE_LIMIT = "rate_limit"
     INTERNAL_ERROR = "internal_error"
+    OVERLOADED = "overloaded"
+    TIMEOUT = "timeout"
 
 class ToolError(Exception):
     """Base exception for tool-related errors."""
@@ -117,7 +117,12 @@ BlogOutlineGeneratorClass = create_text_generation_tool(
             ]
         }
     },
-    response_model=BlogOutline
+    response_model=BlogOutline,
+    # Long structured outputs need more time than the default TOOL_TIMEOUT
+    timeout=180,
+    # Sizes the output token budget for the largest section count offered
+    item_counts={"main_sections": 10, "points": 5, "subsections": 1},
+    text_tokens={"title": 20, "points": 30}
 )
 
 # Add custom tips and benefits
@@ -128,4 +133,4 @@ BlogOutlineGeneratorClass.benefits = blog_outline_benefits
 blog_outline_generator_tool = BlogOutlineGeneratorClass()
 
 # Register the tool with the registry
-registry.register(blog_outline_generator_tool, categories=["Content Creation"])
+registry.register(blog_outline_generator_tool, categories=["Content Creation"], quality_tier="standard")
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field, validator, model_validator
+from pydantic.json_schema import SkipJsonSchema
 from typing import List, Optional, Dict, Any, Union
 
 
@@ -44,72 +45,63 @@ class ThumbnailIdea(BaseModel):
 
 class ThumbnailIdeas(BaseModel):
     ideas: List[ThumbnailIdea] = Field(default_factory=list, description="A list of unique thumbnail ideas for a YouTube video.")
-    thumbnail_ideas: Optional[List[ThumbnailIdea]] = Field(default_factory=list, description="Alternative field name for ideas.")
+    # Input-only alternative name, merged into ideas: left out of dumps and of the
+    # prompt schema. A field rather than a mode='before' validator, which would
+    # make pydantic build the whole input as Python objects before validating it.
+    thumbnail_ideas: SkipJsonSchema[List[ThumbnailIdea]] = Field(default_factory=list, exclude=True, repr=False)
 
     @model_validator(mode='after')
     def consolidate_ideas(self) -> 'ThumbnailIdeas':
-        """Consolidate ideas from both fields and ensure there's at least one idea"""
-        # Combine both fields if they exist
-        all_ideas = []
-        if self.ideas:
-            all_ideas.extend(self.ideas)
+        """Merge ideas given under the alternative name and ensure there's at least one idea"""
         if self.thumbnail_ideas:
-            all_ideas.extend(self.thumbnail_ideas)
-        
-        # Use the combined list for both fields
-        self.ideas = all_ideas
-        self.thumbnail_ideas = all_ideas
-        
-        # If still empty, create a default idea
-        if not all_ideas:
-            default_idea = ThumbnailIdea(
+            self.ideas = self.ideas + self.thumbnail_ideas
+            self.thumbnail_ideas = []
+        if not self.ideas:
+            self.ideas = [ThumbnailIdea(
                 background="Default blue gradient background",
                 main_image="Central image related to the topic",
                 text="YOUR TOPIC HERE",
                 additional_elements="Optional decorative elements"
-            )
-            self.ideas = [default_idea]
-            self.thumbnail_ideas = [default_idea]
-            
+            )]
         return self
 
 
 class OutlineSection(BaseModel):
     title: str = Field("", description="The title of this section or subsection.")
-    heading: Optional[str] = Field(None, description="Alternative field for title.")
     points: List[str] = Field(default_factory=list, description="Brief bullet points or notes on what to cover in this section.")
     subsections: List['OutlineSection'] = Field(default_factory=list, description="Nested subsections, if any.")
-    subpoints: List[Union[str, Dict[str, Any]]] = Field(default_factory=list, description="Alternative field for subsections.")
+    # Input-only alternatives for the title and for points and subsections (see
+    # ThumbnailIdeas.thumbnail_ideas); subpoint dicts are kept raw so each one is
+    # validated once, as a subsection, below
+    heading: SkipJsonSchema[Optional[str]] = Field(None, exclude=True, repr=False)
+    subpoints: SkipJsonSchema[List[Union[str, Dict[str, Any]]]] = Field(default_factory=list, exclude=True, repr=False)
 
     @model_validator(mode='after')
     def process_fields(self) -> 'OutlineSection':
         # Use heading as title if title is empty
-        if not self.title and self.heading:
-            self.title = self.heading
-            
-        # If no title is provided, use a default
-        if not self.title:
-            self.title = "Untitled Section"
-            
+        if self.heading is not None:
+            if not self.title:
+                self.title = self.heading
+            self.heading = None
+
         # Process subpoints as either strings or subsections
-        processed_subsections = []
         for item in self.subpoints:
             if isinstance(item, str):
                 # If it's a string, add it to points
                 self.points.append(item)
-            elif isinstance(item, dict):
+            elif isinstance(item, dict) and ('title' in item or 'heading' in item):
                 # If it's a dictionary, try to convert to OutlineSection
                 try:
-                    if 'title' in item or 'heading' in item:
-                        processed_subsections.append(OutlineSection(**item))
+                    self.subsections.append(OutlineSection.model_validate(item))
                 except Exception:
                     # If conversion fails, add as a point
                     self.points.append(str(item))
-                    
-        # Add any processed subsections from subpoints
-        if processed_subsections:
-            self.subsections.extend(processed_subsections)
-            
+        if self.subpoints:
+            self.subpoints = []
+
+        # If no title is provided, use a default
+        if not self.title:
+            self.title = "Untitled Section"
         return self
 
 
@@ -117,25 +109,18 @@ class BlogOutline(BaseModel):
     introduction: Optional[OutlineSection] = Field(default=None)
     main_sections: List[OutlineSection] = Field(default_factory=list)
     conclusion: Optional[OutlineSection] = Field(default=None)
-    sections: List[OutlineSection] = Field(default_factory=list, description="Alternative field for main_sections.")
-    outline_sections: List[OutlineSection] = Field(default_factory=list, description="Alternative field for sections.")
+    # Input-only alternative names, merged into main_sections (see ThumbnailIdeas.thumbnail_ideas)
+    sections: SkipJsonSchema[List[OutlineSection]] = Field(default_factory=list, exclude=True, repr=False)
+    outline_sections: SkipJsonSchema[List[OutlineSection]] = Field(default_factory=list, exclude=True, repr=False)
 
     @model_validator(mode='after')
     def process_outline(self) -> 'BlogOutline':
         # Consolidate sections from all fields
-        all_sections = []
-        if self.main_sections:
-            all_sections.extend(self.main_sections)
-        if self.sections:
-            all_sections.extend(self.sections)
-        if self.outline_sections:
-            all_sections.extend(self.outline_sections)
-            
-        # Set all section fields to the consolidated list
-        self.main_sections = all_sections
-        self.sections = all_sections
-        self.outline_sections = all_sections
-        
+        if self.sections or self.outline_sections:
+            self.main_sections = self.main_sections + self.sections + self.outline_sections
+            self.sections = []
+            self.outline_sections = []
+
         # Create a default introduction if none exists
         if not self.introduction:
             self.introduction = OutlineSection(
@@ -151,14 +136,11 @@ class BlogOutline(BaseModel):
             )
             
         # If no sections were found, create at least one default section
-        if not all_sections:
-            default_section = OutlineSection(
+        if not self.main_sections:
+            self.main_sections = [OutlineSection(
                 title="Main Content",
                 points=["First important point", "Second important point", "Third important point"]
-            )
-            self.main_sections = [default_section]
-            self.sections = [default_section]
-            self.outline_sections = [default_section]
+            )]
             
         return self
 
@@ -168,7 +168,10 @@ SocialPostGeneratorClass = create_text_generation_tool(
             ]
         }
     },
-    response_model=SocialPostList
+    response_model=SocialPostList,
+    # Sizes the output token budget; long-form platforms need room per post
+    item_counts={"posts": 10},
+    text_tokens={"content": 250}
 )
 
 # Add custom tips and benefits
@@ -179,4 +182,4 @@ SocialPostGeneratorClass.benefits = social_post_benefits
 social_post_generator_tool = SocialPostGeneratorClass()
 
 # Register the tool with the registry
-registry.register(social_post_generator_tool, categories=["Content Creation"])
+registry.register(social_post_generator_tool, categories=["Content Creation"], quality_tier="basic")
@@ -104,7 +104,9 @@ ThumbnailGeneratorClass = create_text_generation_tool(
             "rows": 3
         }
     },
-    response_model=ThumbnailIdeas
+    response_model=ThumbnailIdeas,
+    # Sizes the output token budget
+    item_counts={"ideas": 5}
 )
 
 # Add custom tips and benefits
@@ -115,4 +117,4 @@ ThumbnailGeneratorClass.benefits = thumbnail_benefits
 thumbnail_generator_tool = ThumbnailGeneratorClass()
 
 # Register the tool with the registry
-registry.register(thumbnail_generator_tool, categories=["Content Creation"])
+registry.register(thumbnail_generator_tool, categories=["Content Creation"], quality_tier="basic")
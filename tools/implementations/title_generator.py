@@ -115,7 +115,9 @@ TitleGeneratorClass = create_text_generation_tool(
             ]
         }
     },
-    response_model=GeneratedTitles
+    response_model=GeneratedTitles,
+    # Sizes the output token budget
+    item_counts={"titles": 10}
 )
 
 # Add custom tips and benefits
@@ -126,4 +128,4 @@ TitleGeneratorClass.benefits = title_benefits
 title_generator_tool = TitleGeneratorClass()
 
 # Register the tool with the registry
-registry.register(title_generator_tool, categories=["Content Creation"])
+registry.register(title_generator_tool, categories=["Content Creation"], quality_tier="basic")
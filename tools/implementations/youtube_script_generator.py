@@ -1,5 +1,6 @@
 import re
 from typing import List, Dict, Any
+from config import OUTPUT_BUDGET_SCRIPT_TOKENS
 from ..core.factory import create_text_generation_tool
 from ..core.registry import registry
 from .models import YoutubeScriptOutput
@@ -70,7 +71,12 @@ YoutubeScriptGeneratorClass = create_text_generation_tool(
             "rows": 3
         }
     },
-    response_model=YoutubeScriptOutput
+    response_model=YoutubeScriptOutput,
+    # Long structured outputs need more time than the default TOOL_TIMEOUT
+    timeout=180,
+    # Sizes the output token budget; the script itself is the bulk of the output
+    item_counts={"hooks": 12, "input_bias": 5, "open_loop_questions": 10, "sections": 0},
+    text_tokens={"script": OUTPUT_BUDGET_SCRIPT_TOKENS}
 )
 
 # Add custom tips and benefits
@@ -81,4 +87,4 @@ YoutubeScriptGeneratorClass.benefits = youtube_script_benefits
 youtube_script_generator_tool = YoutubeScriptGeneratorClass()
 
 # Register the tool with the registry
-registry.register(youtube_script_generator_tool, categories=["Content Creation"])
+registry.register(youtube_script_generator_tool, categories=["Content Creation"], quality_tier="premium")